@@ -1,13 +1,69 @@
+import functools
+import io
+import os
+import re
+import threading
+import time
+import uuid
+
 import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.patches import Patch
 from matplotlib.ticker import FuncFormatter
 import pandas as pd
-from dataclasses import dataclass
+import plotly.graph_objects as go
+from dataclasses import asdict, astuple
 from datetime import datetime
 from typing import Optional
 
+from simulation_impot import (
+    BAREME_VISUALISATION,
+    TAUX_ENDETTEMENT_MAX,
+    SegmentsTaux,
+    calcul_brut_net_mensuel,
+    calcul_brut_pour_cible,
+    calcul_impot,
+    capacite_emprunt,
+    courbes_taux,
+    grille_capacite_emprunt,
+    taux_pour_quotients,
+)
+from simulation_impot.amortissement import CHAMPS_AMORTISSEMENT, echeancier
+from simulation_impot.export_arrow import SCHEMA_SALAIRE, ecrire_parquet, lot_arrow
+from simulation_impot.grille import grille_net_apres_impot
+from simulation_impot.parallele import ExecuteurParallele
+from simulation_impot.rapports import rendre_rapport_html
+from simulation_impot.rapports_pdf import rapport_brut_net_pdf, rapport_impot_pdf
+from simulation_impot.cache import CacheLRU, cle_canonique, memoiser
+from simulation_impot.instrumentation import RegistreLatences, registre_depuis_environnement
+from simulation_impot.monte_carlo import (
+    SEUIL_PARALLELE_MONTE_CARLO,
+    centiles_scenarios,
+    simuler_scenarios,
+    tirer_chiffres_affaires,
+)
+from simulation_impot.session import (
+    BUDGET_SESSION_DEFAUT,
+    EmpreintesSessions,
+    SimulationEnregistree,
+    appliquer_budget,
+    empreinte,
+    taille_objet,
+)
+
+TAILLE_CACHE_CALCULS = 2048  # Entrées conservées par calculateur (éviction LRU)
+TAILLE_CACHE_FIGURES = 256  # Images PNG conservées (éviction LRU)
+OCTETS_CACHE_CALCULS = 32 * 1024 * 1024  # Mémoire maximale de chaque calculateur partagé
+OCTETS_CACHE_FIGURES = 64 * 1024 * 1024  # Mémoire maximale des graphiques partagés
+DUREE_VIE_CACHE_S = 3600.0  # Un résultat partagé est recalculé au-delà de ce délai
+NB_SCENARIOS_MONTE_CARLO = (100_000, 250_000, 500_000, 1_000_000, 2_000_000)
+WORKERS_MONTE_CARLO_MAX = 4  # Processus du pool partagé, quel que soit le nombre de cœurs
+BUDGET_SESSION_OCTETS = int(
+    os.environ.get("SIMULATION_IMPOT_BUDGET_SESSION", BUDGET_SESSION_DEFAUT)
+)  # Au-delà, les données dérivées de la session sont évincées
+DONNEES_DERIVEES = ("monte_carlo",)  # Clés de session recalculables, évincées dans cet ordre
+
 # --- Pied de page / Informations version ---
 st.set_page_config(page_title="Simulations financières 2025", layout="centered")
 
@@ -22,93 +78,597 @@ st.sidebar.caption("🔢 Version : **v1.1.0**")
 st.markdown("---")
 st.caption("🛠️ Développé par **I. Bitar** · 📅 Dernière mise à jour : **25 septembre 2025** · 🔢 Version : **v1.1.0**")
 
-# ---------- PARAMÈTRES 2025 (Brut → Net cadre) ----------
-PMSS = 3925.0           # Plafond Mensuel Sécurité sociale (PASS mensuel) 2025
-PASS_ANNUEL = 47100.0   # PASS annuel 2025
-AA_T2_MAX = 8 * PMSS    # Limite supérieure Agirc-Arrco Tranche 2 (8 PMSS)
-APEC_PLAFOND = 4 * PMSS # Assiette max APEC (4 PMSS)
-
-# Régime général - part SALARIÉE
-TAUX_VIEIL_PLAF_SAL = 0.069   # 6,90% sur T1
-TAUX_VIEIL_DEPLAF_SAL = 0.004 # 0,40% sur totalité
-TAUX_MALADIE_SAL_AM = 0.013   # Maladie salariée Alsace-Moselle
-
-# AGIRC-ARRCO (taux d'appel) - part SALARIÉE
-TAUX_AA_T1_SAL  = 0.0315  # 3,15%
-TAUX_AA_T2_SAL  = 0.0864  # 8,64%
-TAUX_CEG_T1_SAL = 0.0086  # 0,86%
-TAUX_CEG_T2_SAL = 0.0108  # 1,08%
-TAUX_CET_SAL    = 0.0014  # 0,14% si brut > PMSS, assiette T1+T2
-TAUX_APEC_SAL   = 0.00024 # 0,024% sur 0→4 PMSS (cadres)
-
-# CSG/CRDS (assiette = 98,25% du brut)
-ASSIETTE_CSG_ABATT = 0.9825
-TAUX_CSG_DED   = 0.068  # 6,8% déductible
-TAUX_CSG_NDED  = 0.024  # 2,4% non déductible
-TAUX_CRDS      = 0.005  # 0,5%
-
-# --------- PART EMPLOYEUR (paramétrable) ----------
-TAUX_VIEIL_PLAF_EMP   = 0.0855  # 8,55% sur T1
-TAUX_VIEIL_DEPLAF_EMP = 0.0202  # 2,02% sur totalité
-
-# AGIRC-ARRCO (taux d'appel) - part EMPLOYEUR
-TAUX_AA_T1_EMP  = 0.0472  # 4,72%
-TAUX_AA_T2_EMP  = 0.1295  # 12,95%
-TAUX_CEG_T1_EMP = 0.0129  # 1,29%
-TAUX_CEG_T2_EMP = 0.0162  # 1,62%
-TAUX_CET_EMP    = 0.0021  # 0,21%
-TAUX_APEC_EMP   = 0.00036 # 0,036% (0→4 PMSS, cadres)
-
-# Autres contributions employeur variables selon cas
-TAUX_MALADIE_EMP_INF_2P5 = 0.07   # 7,0% si rémunération ≤ 2,5 SMIC
-TAUX_MALADIE_EMP_SUP_2P5 = 0.13   # 13,0% si rémunération > 2,5 SMIC
-TAUX_AF_EMP_INF_3P5      = 0.0345 # 3,45% si rémunération ≤ 3,5 SMIC
-TAUX_AF_EMP_SUP_3P5      = 0.0525 # 5,25% si rémunération > 3,5 SMIC
-TAUX_CHOMAGE_EMP_2025_MAI = 0.04  # 4,00% à compter du 01/05/2025 (hors modulation)
-TAUX_CHOMAGE_EMP_AVANT_MAI = 0.0405
-TAUX_AGS_EMP = 0.0025             # 0,25% en 2025
-TAUX_FNAL_MOINS_50 = 0.001        # 0,10%
-TAUX_FNAL_50_PLUS  = 0.005        # 0,50%
-TAUX_CSA_EMP = 0.003              # Contribution solidarité autonomie 0,30%
-
-
-@dataclass
-class ResultatSalaire:
-    brut_mensuel: float
-    base_T1: float
-    base_T2: float
-    vieillesse_plafonnee: float
-    vieillesse_deplafonnee: float
-    maladie_salarie: float
-    agirc_arrco_T1: float
-    agirc_arrco_T2: float
-    ceg_T1: float
-    ceg_T2: float
-    cet: float
-    apec: float
-    csg_deductible: float
-    csg_non_deductible: float
-    crds: float
-    total_cot_sal_hors_csg: float
-    total_csg_crds: float
-    net_imposable: float
-    net_a_payer: float
-    maladie_employeur: float
-    vieillesse_plaf_emp: float
-    vieillesse_deplaf_emp: float
-    aa_T1_emp: float
-    aa_T2_emp: float
-    ceg_T1_emp: float
-    ceg_T2_emp: float
-    cet_emp: float
-    apec_emp: float
-    allocations_familiales: float
-    chomage: float
-    ags: float
-    fnal: float
-    csa: float
-    total_charges_employeur: float
-    cout_total_employeur: float
+
+@st.cache_resource
+def calculateurs_partages() -> dict:
+    """Calculateurs mémoïsés, partagés par toutes les sessions du serveur."""
+
+    return {
+        fonction.__name__: memoiser(
+            fonction,
+            taille_max=TAILLE_CACHE_CALCULS,
+            octets_max=OCTETS_CACHE_CALCULS,
+            duree_vie_s=DUREE_VIE_CACHE_S,
+        )
+        for fonction in (calcul_brut_net_mensuel, calcul_impot, courbes_taux)
+    }
+
+
+def simulation_detaillee() -> Optional[dict]:
+    """Résultat complet de la simulation enregistrée, servi par le calculateur partagé."""
+
+    simulation = st.session_state.get("simulation")
+    if simulation is None:
+        return None
+    return simulation.detail(calculateurs_partages()["calcul_impot"])
+
+
+@st.cache_resource
+def empreintes_sessions() -> EmpreintesSessions:
+    return EmpreintesSessions()
+
+
+@st.cache_resource
+def executeur_monte_carlo() -> Optional[ExecuteurParallele]:
+    """Pool de processus partagé pour les grands tirages Monte Carlo (aucun sur un seul cœur).
+
+    Les workers partent d'un serveur de fork (voir `METHODE_DEMARRAGE`), jamais
+    d'un fork du serveur Streamlit et de ses threads.
+    """
+
+    nb_coeurs = os.cpu_count() or 1
+    if nb_coeurs <= 1:
+        return None
+    return ExecuteurParallele(min(nb_coeurs, WORKERS_MONTE_CARLO_MAX))
+
+
+def lire_historique_mensuel(texte: str) -> list[float]:
+    """Lit des montants mensuels séparés par des espaces, des « ; » ou des retours à la ligne."""
+
+    montants = []
+    for valeur in re.split(r"[;\s]+", texte.strip()):
+        if not valeur:
+            continue
+        try:
+            montants.append(float(valeur.replace(",", ".")))
+        except ValueError:
+            raise ValueError(f"montant mensuel illisible : {valeur!r}") from None
+    return montants
+
+
+@st.cache_resource
+def registre_latences() -> RegistreLatences:
+    """Latences des pages, actives si SIMULATION_IMPOT_METRIQUES_PORT ou _FICHIER est défini."""
+
+    return registre_depuis_environnement()
+
+
+# Inactif par défaut : chaque marque d'étape se réduit alors à un test d'attribut
+latences = registre_latences()
+
+
+def taille_figure(figure) -> int:
+    """Octets d'une image PNG, ou des données d'une figure Plotly (sans ses validateurs partagés)."""
+
+    if isinstance(figure, go.Figure):
+        return taille_objet(figure.to_plotly_json())
+    return taille_objet(figure)
+
+
+@st.cache_resource
+def cache_figures() -> CacheLRU:
+    """Images PNG et figures Plotly des graphiques, indexées par leurs valeurs d'entrée canoniques."""
+
+    return CacheLRU(
+        TAILLE_CACHE_FIGURES,
+        octets_max=OCTETS_CACHE_FIGURES,
+        duree_vie_s=DUREE_VIE_CACHE_S,
+        mesurer=taille_figure,
+    )
+
+
+class MetriquesRendu:
+    """Compteurs des rendus matplotlib effectivement exécutés (hors cache)."""
+
+    def __init__(self):
+        self._verrou = threading.Lock()
+        self.rendus = 0
+        self.duree_totale_s = 0.0
+        self.derniere_duree_s = 0.0
+
+    def enregistrer(self, duree_s: float) -> None:
+        with self._verrou:
+            self.rendus += 1
+            self.duree_totale_s += duree_s
+            self.derniere_duree_s = duree_s
+
+    def statistiques(self) -> dict:
+        with self._verrou:
+            return {
+                "rendus": self.rendus,
+                "duree_moyenne_s": self.duree_totale_s / self.rendus if self.rendus else 0.0,
+                "derniere_duree_s": self.derniere_duree_s,
+                "figures_ouvertes": len(plt.get_fignums()),
+            }
+
+
+@st.cache_resource
+def metriques_rendu() -> MetriquesRendu:
+    return MetriquesRendu()
+
+
+def exporter_png(fig) -> bytes:
+    """Image PNG de `fig` telle qu'affichée ; la figure est fermée dès son export."""
+
+    try:
+        tampon = io.BytesIO()
+        fig.savefig(tampon, format="png", dpi=200, bbox_inches="tight")
+    finally:
+        plt.close(fig)
+    return tampon.getvalue()
+
+
+def exporter_parquet_salaire(res) -> bytes:
+    """Fichier Parquet (`SCHEMA_SALAIRE`) d'un seul résultat brut → net."""
+
+    tampon = io.BytesIO()
+    ecrire_parquet(
+        tampon,
+        [lot_arrow({champ: [valeur] for champ, valeur in asdict(res).items()}, SCHEMA_SALAIRE)],
+        SCHEMA_SALAIRE,
+    )
+    return tampon.getvalue()
+
+
+def afficher_figure(construire, *args) -> None:
+    """Affiche la figure `construire(*args)`, rendue en PNG une seule fois par jeu d'arguments.
+
+    Aucune figure matplotlib ne survit au rerun (voir `exporter_png`).
+    """
+
+    cle = (construire.__name__, cle_canonique(args))
+    png = cache_figures().obtenir(cle)
+    if png is None:
+        debut = time.perf_counter()
+        png = exporter_png(construire(*args))
+        cache_figures().stocker(cle, png)
+        metriques_rendu().enregistrer(time.perf_counter() - debut)
+    st.image(png, use_container_width=True)
+
+
+def figure_voyage_salaire(etapes: tuple, retenues: tuple):
+    """Courbe coût employeur → net ; `etapes` = ((libellé, montant), ...),
+    `retenues` = ((libellé, montant, étape de départ, étape d'arrivée), ...)."""
+
+    def format_euro(value: float) -> str:
+        return f"{value:,.2f}".replace(",", " ").replace(".", ",") + " €"
+
+    def format_euro_plain(value: float) -> str:
+        return f"{value:,.0f} €".replace(",", " ")
+
+    journey_labels = [label for label, _ in etapes]
+    journey_values = [value for _, value in etapes]
+
+    fig, ax = plt.subplots(figsize=(12, 5.5))
+    x_positions = np.arange(len(journey_labels))
+
+    line_color = "#1f4e79"
+    ax.plot(x_positions, journey_values, color=line_color, linewidth=3, zorder=2)
+
+    stage_colors = ["#1f4e79", "#2874a6", "#2e8b57", "#27ae60"]
+    stage_colors = stage_colors[: len(journey_labels)]
+
+    y_min = min(journey_values)
+    y_max = max(journey_values)
+    y_range = max(y_max - y_min, max(journey_values) * 0.1 if journey_values else 1)
+    if y_range == 0:
+        y_range = 1
+
+    for idx, (label, value, color) in enumerate(
+        zip(journey_labels, journey_values, stage_colors)
+    ):
+        ax.scatter(idx, value, color=color, s=120, zorder=3, edgecolor="white", linewidth=1.5)
+        ax.text(
+            idx,
+            value + y_range * 0.04,
+            format_euro(value),
+            ha="center",
+            va="bottom",
+            fontsize=11,
+            fontweight="bold",
+            color=color,
+        )
+
+    for label, amount, start_idx, end_idx in retenues:
+        if amount <= 0:
+            continue
+        x_pos = (start_idx + end_idx) / 2
+        y_start = journey_values[start_idx]
+        y_end = journey_values[end_idx]
+        ax.annotate(
+            f"-{format_euro_plain(amount)}\n{label}",
+            xy=(x_pos, y_end),
+            xytext=(x_pos, y_start - y_range * 0.12),
+            ha="center",
+            va="top",
+            fontsize=10,
+            color="#c0392b",
+            arrowprops=dict(arrowstyle="->", color="#c0392b", linewidth=1.5),
+            bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="#c0392b", alpha=0.85),
+        )
+
+    ax.set_xticks(x_positions)
+    ax.set_xticklabels(journey_labels, rotation=10, ha="right", fontsize=11)
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda v, _: format_euro_plain(v)))
+    ax.set_ylabel("Montant mensuel (€)")
+    ax.set_title(
+        "Voyage du salaire : de la charge employeur au net perçu",
+        pad=20,
+    )
+    ax.grid(axis="y", linestyle="--", alpha=0.3)
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    ax.set_xlim(-0.15, len(journey_labels) - 0.85)
+
+    fig.tight_layout()
+    return fig
+
+
+def figure_repartition_impot(impot_total: float, revenu_net: float):
+    """Camembert impôt / revenu net après impôt."""
+
+    fig, ax = plt.subplots()
+    labels = ['Impôt payé', 'Revenu net après impôt']
+    values = [impot_total, revenu_net - impot_total]
+    colors = ['#ff6b6b', '#4ecdc4']
+    ax.pie(values, labels=labels, autopct='%1.1f%%', startangle=90, colors=colors)
+    ax.axis('equal')
+    ax.set_title("Répartition de l'impôt sur le revenu net annuel")
+    return fig
+
+
+def figure_courbes_taux(
+    bareme,
+    quotient_familial: float,
+    nombre_parts: float,
+    deduction_aide: float,
+    situation: tuple,
+    situation_ajustee: tuple,
+):
+    """Courbes TE/TM/TN et bandes de tranches ; `situation` et `situation_ajustee`
+    valent `(quotient mensuel, TE %, TM %, TN %)`."""
+
+    courbes = calculateurs_partages()["courbes_taux"](
+        bareme, quotient_familial, nombre_parts, deduction_aide
+    )
+    quotients_mensuels = courbes["quotients_mensuels"]
+    taux_eff = courbes["taux_effectif"]
+    taux_marg_arr = courbes["taux_marginal"]
+    taux_nom = courbes["taux_nominal"]
+    quotient_mensuel, te_c, tm_c, tn_c = situation
+    quotient_mensuel_ajuste, te_ajuste, tm_ajuste, tn_ajuste = situation_ajustee
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    couleurs = ['#e0f7fa', '#b2ebf2', '#80deea', '#4dd0e1', '#26c6da']
+
+    def format_euro(val: float) -> str:
+        return f"{val:,.0f} €".replace(",", " ")
+
+    max_quotient_mensuel = quotients_mensuels.max()
+    tranche_patches = []
+    for idx, ((b, h, t), c) in enumerate(zip(bareme.tranches, couleurs), start=1):
+        xmax = (h / 12) if np.isfinite(h) else max_quotient_mensuel
+        ax.axvspan(b / 12, xmax, facecolor=c, alpha=0.3)
+        if np.isfinite(h):
+            tranche_label = (
+                f"Tranche {idx} : {format_euro(b)} – {format_euro(h)} "
+                f"({t * 100:.0f} %)"
+            )
+        else:
+            tranche_label = (
+                f"Tranche {idx} : ≥ {format_euro(b)} ({t * 100:.0f} %)"
+            )
+        tranche_patches.append(
+            Patch(facecolor=c, edgecolor='none', alpha=0.3, label=tranche_label)
+        )
+
+    ax.plot(quotients_mensuels, taux_eff * 100, label="Taux effectif", linewidth=2)
+    ax.plot(quotients_mensuels, taux_marg_arr * 100, '--', label="Taux marginal")
+    ax.plot(quotients_mensuels, taux_nom * 100, ':', label="Taux nominal")
+
+    ax.axvline(x=quotient_mensuel, color='red', linestyle='--')
+    ax.plot(quotient_mensuel, te_c, 'ro', label=f"Votre position ({quotient_mensuel:.0f} €)")
+
+    ax.axvline(x=quotient_mensuel_ajuste, color='#8e44ad', linestyle='-.')
+    ax.plot(
+        quotient_mensuel_ajuste,
+        te_ajuste,
+        'o',
+        color='#8e44ad',
+        label=f"Situation ajustée ({quotient_mensuel_ajuste:.0f} €)",
+    )
+
+    annotation = f"TE: {te_c:.1f}%\nTM: {tm_c:.1f}%\nTN: {tn_c:.1f}%"
+    ax.annotate(
+        annotation,
+        xy=(quotient_mensuel, te_c),
+        xytext=(quotient_mensuel + 200, te_c + 5),
+        arrowprops=dict(arrowstyle="->", color='red'),
+        fontsize=10,
+        color='red',
+        bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="red", alpha=0.8),
+    )
+
+    annotation_ajuste = f"TE: {te_ajuste:.1f}%\nTM: {tm_ajuste:.1f}%\nTN: {tn_ajuste:.1f}%"
+    ax.annotate(
+        annotation_ajuste,
+        xy=(quotient_mensuel_ajuste, te_ajuste),
+        xytext=(quotient_mensuel_ajuste + 200, te_ajuste + 5),
+        arrowprops=dict(arrowstyle="->", color='#8e44ad'),
+        fontsize=10,
+        color='#8e44ad',
+        bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="#8e44ad", alpha=0.8),
+    )
+
+    ax.set_xlabel("Quotient familial mensuel (€)")
+    ax.set_ylabel("Taux (%)")
+    ax.set_title(
+        "Taux d'imposition 2025 selon votre quotient familial "
+        "(axe supérieur : revenu imposable total annuel)"
+    )
+    ax.grid(True)
+
+    quotient_ticks = ax.get_xticks()
+    ax2 = ax.twiny()
+    ax2.set_xlim(np.array(ax.get_xlim()) * 12 * nombre_parts)
+    ax2.set_xticks(quotient_ticks * 12 * nombre_parts)
+    ax2.set_xlabel("Revenu imposable total annuel (€)")
+    ax2.xaxis.set_major_formatter(FuncFormatter(lambda val, _: format_euro(val)))
+
+    handles, _ = ax.get_legend_handles_labels()
+    legend_handles = handles + tranche_patches
+    ax.legend(
+        handles=legend_handles,
+        loc="center left",
+        bbox_to_anchor=(1.02, 0.5),
+        frameon=True,
+    )
+    fig.tight_layout()
+    return fig
+
+
+POINTS_GRILLE_BRUT = 500  # Bruts mensuels échantillonnés sur la carte brut × parts
+
+
+def figure_grille_net_apres_impot(
+    brut_min: float,
+    brut_max: float,
+    parts_max: float,
+    couple: bool,
+    ca_auto: float,
+    reduction_forfaitaire: bool,
+    aide: float,
+    garde: float,
+):
+    """Cartes de chaleur du net après impôt et du taux marginal combiné."""
+
+    bruts = np.linspace(brut_min, brut_max, POINTS_GRILLE_BRUT)
+    parts = np.arange(1.0, parts_max + 0.25, 0.5)
+    grille = grille_net_apres_impot(
+        bruts,
+        parts,
+        couple,
+        chiffre_affaire_autoentrepreneur=ca_auto,
+        reduction_forfaitaire=reduction_forfaitaire,
+        aide_familiale=aide,
+        frais_garde=garde,
+    )
+
+    fig, axes = plt.subplots(1, 2, figsize=(12, 5.5), sharey=True)
+    etendue = (-0.5, len(parts) - 0.5, brut_min, brut_max)
+    for ax, cle, titre, cmap, legende in (
+        (axes[0], "net_apres_impot_mensuel", "Net mensuel après impôt", "viridis", "€ / mois"),
+        (axes[1], "taux_marginal_combine", "Taux marginal combiné", "magma_r", "%"),
+    ):
+        valeurs = grille[cle] * (100 if cle == "taux_marginal_combine" else 1)
+        image = ax.imshow(
+            valeurs, origin="lower", aspect="auto", extent=etendue, cmap=cmap
+        )
+        fig.colorbar(image, ax=ax, label=legende)
+        ax.set_title(titre)
+        ax.set_xlabel("Nombre de parts")
+        ax.set_xticks(np.arange(len(parts)))
+        ax.set_xticklabels([f"{p:g}" for p in parts], rotation=90 if len(parts) > 10 else 0)
+    axes[0].set_ylabel("Brut mensuel (€)")
+    axes[0].yaxis.set_major_formatter(
+        FuncFormatter(lambda v, _: f"{v:,.0f} €".replace(",", " "))
+    )
+    fig.tight_layout()
+    return fig
+
+
+def figure_grille_capacite(
+    revenu_total: float,
+    mensualite_existante: float,
+    taux_emprunt: float,
+    duree_annees: int,
+):
+    """Carte de chaleur du capital empruntable selon le taux et la durée."""
+
+    grille = grille_capacite_emprunt(revenu_total, mensualite_existante=mensualite_existante)
+    taux, durees = grille["taux_emprunt"], grille["durees_annees"]
+    capital_k = grille["capital_max"] / 1000
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    etendue = (durees[0] - 0.5, durees[-1] + 0.5, taux[0], taux[-1])
+    image = ax.imshow(capital_k, origin="lower", aspect="auto", extent=etendue, cmap="viridis")
+    fig.colorbar(image, ax=ax, label="Capital maximal (k€)")
+    if capital_k.max() > 0:
+        contours = ax.contour(durees, taux, capital_k, colors="white", linewidths=0.7)
+        ax.clabel(contours, fmt=lambda v: f"{v:,.0f} k€".replace(",", " "), fontsize=8)
+    ax.plot(duree_annees, taux_emprunt, "o", color="red", label="Votre projet")
+    ax.set_xlabel("Durée (années)")
+    ax.set_ylabel("Taux nominal (%)")
+    ax.set_title("Capacité d'emprunt selon le taux et la durée")
+    ax.legend(loc="upper right")
+    fig.tight_layout()
+    return fig
+
+
+VARIATIONS_INTERACTIVES = np.arange(-20, 21)  # Pas du curseur intégré au graphique Plotly (%)
+
+
+def afficher_figure_interactive(construire, *args) -> None:
+    """Affiche la figure Plotly `construire(*args)`, construite une fois par jeu d'arguments."""
+
+    cle = (construire.__name__, cle_canonique(args))
+    fig = cache_figures().obtenir(cle)
+    if fig is None:
+        fig = construire(*args)
+        cache_figures().stocker(cle, fig)
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def figure_courbes_taux_interactive(
+    bareme,
+    quotient_familial: float,
+    nombre_parts: float,
+    deduction_aide: float,
+    situation: tuple,
+    variation_initiale: float,
+):
+    """Version Plotly de `figure_courbes_taux`.
+
+    Les positions ajustées de -20 % à +20 % sont précalculées et embarquées dans
+    un curseur Plotly : zoom, survol et variation se font dans le navigateur.
+    """
+
+    def format_euro(val: float) -> str:
+        return f"{val:,.0f} €".replace(",", " ")
+
+    courbes = calculateurs_partages()["courbes_taux"](
+        bareme, quotient_familial, nombre_parts, deduction_aide
+    )
+    quotients_mensuels = courbes["quotients_mensuels"]
+    revenus_annuels = courbes["quotients_annuels"] * nombre_parts
+    quotient_mensuel, te_c, tm_c, tn_c = situation
+
+    fig = go.Figure()
+    couleurs = ['#e0f7fa', '#b2ebf2', '#80deea', '#4dd0e1', '#26c6da']
+    max_quotient_mensuel = quotients_mensuels.max()
+    for idx, ((b, h, t), c) in enumerate(zip(bareme.tranches, couleurs), start=1):
+        xmax = (h / 12) if np.isfinite(h) else max_quotient_mensuel
+        fig.add_vrect(
+            x0=b / 12,
+            x1=xmax,
+            fillcolor=c,
+            opacity=0.5,
+            line_width=0,
+            layer="below",
+            annotation_text=f"T{idx} · {t * 100:.0f} %",
+            annotation_position="top left",
+        )
+
+    survol = "Quotient mensuel : %{x:,.0f} €<br>Revenu annuel : %{customdata:,.0f} €<br>%{y:.1f} %"
+    for cle, nom, style in (
+        ("taux_effectif", "Taux effectif", dict(width=2)),
+        ("taux_marginal", "Taux marginal", dict(dash="dash")),
+        ("taux_nominal", "Taux nominal", dict(dash="dot")),
+    ):
+        fig.add_trace(
+            go.Scatter(
+                x=quotients_mensuels,
+                y=courbes[cle] * 100,
+                customdata=revenus_annuels,
+                name=nom,
+                line=style,
+                hovertemplate=survol,
+            )
+        )
+
+    fig.add_vline(x=quotient_mensuel, line_color="red", line_dash="dash")
+    fig.add_trace(
+        go.Scatter(
+            x=[quotient_mensuel],
+            y=[te_c],
+            mode="markers",
+            marker=dict(color="red", size=10),
+            name=f"Votre position ({quotient_mensuel:.0f} €)",
+            hovertemplate=f"TE: {te_c:.1f}%<br>TM: {tm_c:.1f}%<br>TN: {tn_c:.1f}%<extra></extra>",
+        )
+    )
+
+    # Situations ajustées précalculées pour chaque pas du curseur intégré
+    quotients_ajustes = quotient_familial * (1 + VARIATIONS_INTERACTIVES / 100)
+    taux_ajustes = taux_pour_quotients(bareme, quotients_ajustes, nombre_parts, deduction_aide)
+    x_ajustes = quotients_ajustes / 12
+    te_ajustes = taux_ajustes["taux_effectif"] * 100
+    textes = [
+        f"TE: {te:.1f}%<br>TM: {tm * 100:.1f}%<br>TN: {tn * 100:.1f}%"
+        for te, tm, tn in zip(
+            te_ajustes, taux_ajustes["taux_marginal"], taux_ajustes["taux_nominal"]
+        )
+    ]
+    hauteur = max(float(np.max(courbes["taux_marginal"])) * 100, te_c) + 5
+    actif = int(np.argmin(np.abs(VARIATIONS_INTERACTIVES - variation_initiale)))
+
+    indice_ajuste = len(fig.data)
+    fig.add_trace(
+        go.Scatter(
+            x=[x_ajustes[actif]] * 2,
+            y=[0, hauteur],
+            mode="lines",
+            line=dict(color="#8e44ad", dash="dashdot"),
+            showlegend=False,
+            hoverinfo="skip",
+        )
+    )
+    fig.add_trace(
+        go.Scatter(
+            x=[x_ajustes[actif]],
+            y=[te_ajustes[actif]],
+            mode="markers",
+            marker=dict(color="#8e44ad", size=10),
+            name="Situation ajustée",
+            hovertext=[textes[actif]],
+            hovertemplate="%{hovertext}<extra></extra>",
+        )
+    )
+
+    pas = [
+        dict(
+            method="restyle",
+            label=f"{variation:+d} %",
+            args=[
+                {
+                    "x": [[x, x], [x]],
+                    "y": [[0, hauteur], [te]],
+                    "hovertext": [None, [texte]],
+                },
+                [indice_ajuste, indice_ajuste + 1],
+            ],
+        )
+        for variation, x, te, texte in zip(
+            VARIATIONS_INTERACTIVES, x_ajustes, te_ajustes, textes
+        )
+    ]
+    fig.update_layout(
+        title="Taux d'imposition 2025 selon votre quotient familial",
+        xaxis_title="Quotient familial mensuel (€)",
+        yaxis_title="Taux (%)",
+        hovermode="closest",
+        legend=dict(orientation="h", yanchor="top", y=-0.25),
+        sliders=[
+            dict(
+                active=actif,
+                steps=pas,
+                currentvalue=dict(prefix="Variation du revenu imposable : "),
+                pad=dict(t=60),
+            )
+        ],
+        margin=dict(t=60),
+    )
+    return fig
 
 
 def transfer_brut_net_to_simulation(
@@ -148,138 +708,13 @@ def navigate_to_page(page_label: str) -> None:
         st.experimental_rerun()
 
 
-def calcul_brut_net_mensuel(
-    brut_mensuel: float,
-    *,
-    cadre: bool = True,
-    alsace_moselle: bool = False,
-    sup_2p5_smic: bool = True,
-    sup_3p5_smic: bool = True,
-    effectif_50plus: bool = True,
-    chomage_apres_mai_2025: bool = True,
-) -> ResultatSalaire:
-    """Calcule les cotisations et nets mensuels pour un cadre."""
-
-    base_T1 = min(brut_mensuel, PMSS)
-    base_T2 = max(0.0, min(brut_mensuel, AA_T2_MAX) - PMSS)
-
-    # Cotisations salariales
-    vieill_plaf = TAUX_VIEIL_PLAF_SAL * base_T1
-    vieill_depl = TAUX_VIEIL_DEPLAF_SAL * brut_mensuel
-    maladie_sal = (TAUX_MALADIE_SAL_AM * brut_mensuel) if alsace_moselle else 0.0
-
-    aa_T1_sal = TAUX_AA_T1_SAL * base_T1
-    aa_T2_sal = TAUX_AA_T2_SAL * base_T2
-    ceg_T1_sal = TAUX_CEG_T1_SAL * base_T1
-    ceg_T2_sal = TAUX_CEG_T2_SAL * base_T2
-    cet_sal = (TAUX_CET_SAL * (base_T1 + base_T2)) if brut_mensuel > PMSS else 0.0
-
-    apec_base = min(brut_mensuel, APEC_PLAFOND) if cadre else 0.0
-    apec_sal = TAUX_APEC_SAL * apec_base if cadre else 0.0
-
-    assiette_csg = ASSIETTE_CSG_ABATT * brut_mensuel
-    csg_ded = TAUX_CSG_DED * assiette_csg
-    csg_nded = TAUX_CSG_NDED * assiette_csg
-    crds = TAUX_CRDS * assiette_csg
-
-    total_sal_hors_csg = (
-        vieill_plaf
-        + vieill_depl
-        + maladie_sal
-        + aa_T1_sal
-        + aa_T2_sal
-        + ceg_T1_sal
-        + ceg_T2_sal
-        + cet_sal
-        + apec_sal
-    )
-    total_csg_crds = csg_ded + csg_nded + crds
-
-    net_imposable = brut_mensuel - total_sal_hors_csg - csg_ded
-    net_a_payer = brut_mensuel - total_sal_hors_csg - total_csg_crds
-
-    # Cotisations employeur
-    maladie_emp = (
-        TAUX_MALADIE_EMP_SUP_2P5 if sup_2p5_smic else TAUX_MALADIE_EMP_INF_2P5
-    ) * brut_mensuel
-    vieill_plaf_emp = TAUX_VIEIL_PLAF_EMP * base_T1
-    vieill_deplaf_emp = TAUX_VIEIL_DEPLAF_EMP * brut_mensuel
-    aa_T1_emp = TAUX_AA_T1_EMP * base_T1
-    aa_T2_emp = TAUX_AA_T2_EMP * base_T2
-    ceg_T1_emp = TAUX_CEG_T1_EMP * base_T1
-    ceg_T2_emp = TAUX_CEG_T2_EMP * base_T2
-    cet_emp = (TAUX_CET_EMP * (base_T1 + base_T2)) if brut_mensuel > PMSS else 0.0
-    apec_emp = (TAUX_APEC_EMP * apec_base) if cadre else 0.0
-    af_emp = (
-        TAUX_AF_EMP_SUP_3P5 if sup_3p5_smic else TAUX_AF_EMP_INF_3P5
-    ) * brut_mensuel
-    taux_chom = (
-        TAUX_CHOMAGE_EMP_2025_MAI
-        if chomage_apres_mai_2025
-        else TAUX_CHOMAGE_EMP_AVANT_MAI
-    )
-    chomage_emp = taux_chom * brut_mensuel
-    ags_emp = TAUX_AGS_EMP * brut_mensuel
-    fnal_emp = (
-        TAUX_FNAL_50_PLUS if effectif_50plus else TAUX_FNAL_MOINS_50
-    ) * brut_mensuel
-    csa_emp = TAUX_CSA_EMP * brut_mensuel
-
-    total_emp = (
-        maladie_emp
-        + vieill_plaf_emp
-        + vieill_deplaf_emp
-        + aa_T1_emp
-        + aa_T2_emp
-        + ceg_T1_emp
-        + ceg_T2_emp
-        + cet_emp
-        + apec_emp
-        + af_emp
-        + chomage_emp
-        + ags_emp
-        + fnal_emp
-        + csa_emp
-    )
-    cout_total = brut_mensuel + total_emp
-
-    return ResultatSalaire(
-        brut_mensuel=brut_mensuel,
-        base_T1=base_T1,
-        base_T2=base_T2,
-        vieillesse_plafonnee=vieill_plaf,
-        vieillesse_deplafonnee=vieill_depl,
-        maladie_salarie=maladie_sal,
-        agirc_arrco_T1=aa_T1_sal,
-        agirc_arrco_T2=aa_T2_sal,
-        ceg_T1=ceg_T1_sal,
-        ceg_T2=ceg_T2_sal,
-        cet=cet_sal,
-        apec=apec_sal,
-        csg_deductible=csg_ded,
-        csg_non_deductible=csg_nded,
-        crds=crds,
-        total_cot_sal_hors_csg=total_sal_hors_csg,
-        total_csg_crds=total_csg_crds,
-        net_imposable=net_imposable,
-        net_a_payer=net_a_payer,
-        maladie_employeur=maladie_emp,
-        vieillesse_plaf_emp=vieill_plaf_emp,
-        vieillesse_deplaf_emp=vieill_deplaf_emp,
-        aa_T1_emp=aa_T1_emp,
-        aa_T2_emp=aa_T2_emp,
-        ceg_T1_emp=ceg_T1_emp,
-        ceg_T2_emp=ceg_T2_emp,
-        cet_emp=cet_emp,
-        apec_emp=apec_emp,
-        allocations_familiales=af_emp,
-        chomage=chomage_emp,
-        ags=ags_emp,
-        fnal=fnal_emp,
-        csa=csa_emp,
-        total_charges_employeur=total_emp,
-        cout_total_employeur=cout_total,
-    )
+
+# Montants visés proposés en mode Net → Brut (libellé → champ de ResultatSalaire)
+CIBLES_NET_VERS_BRUT = {
+    "Net à payer": "net_a_payer",
+    "Net imposable": "net_imposable",
+    "Coût total employeur": "cout_total_employeur",
+}
 
 
 def page_brut_net():
@@ -291,16 +726,33 @@ def page_brut_net():
         " automatiquement un salaire annuel brut."
     )
 
+    mode_calcul = st.radio(
+        "Mode de calcul",
+        ["Brut → Net", "Net → Brut"],
+        horizontal=True,
+        help="*Net → Brut* retrouve le brut nécessaire pour atteindre un net ou un"
+        " budget employeur donné.",
+    )
+
     colA, colB = st.columns(2)
     with colA:
         period = st.selectbox("Période", ["Mensuel", "Annuel"], index=0)
     with colB:
-        brut_input = st.number_input(
-            f"Salaire brut {period.lower()}",
-            min_value=0.0,
-            value=6000.0,
-            step=100.0,
-        )
+        if mode_calcul == "Brut → Net":
+            brut_input = st.number_input(
+                f"Salaire brut {period.lower()}",
+                min_value=0.0,
+                value=6000.0,
+                step=100.0,
+            )
+        else:
+            cible_label = st.selectbox("Montant visé", list(CIBLES_NET_VERS_BRUT))
+            montant_cible = st.number_input(
+                f"{cible_label} {period.lower()}",
+                min_value=0.0,
+                value=4800.0,
+                step=100.0,
+            )
 
     st.subheader("Options")
     c1, c2, c3 = st.columns(3)
@@ -322,9 +774,28 @@ def page_brut_net():
             "Taux chômage 4,00% (après 01/05/2025)", value=True
         )
 
-    brut_mensuel = brut_input / 12.0 if period == "Annuel" else brut_input
+    latences.etape("widgets")
+    if mode_calcul == "Brut → Net":
+        brut_mensuel = brut_input / 12.0 if period == "Annuel" else brut_input
+    else:
+        brut_mensuel = calcul_brut_pour_cible(
+            CIBLES_NET_VERS_BRUT[cible_label],
+            montant_cible / 12.0 if period == "Annuel" else montant_cible,
+            cadre=cadre,
+            alsace_moselle=alsace_moselle,
+            sup_2p5_smic=sup_2p5,
+            sup_3p5_smic=sup_3p5,
+            effectif_50plus=effectif_50plus,
+            chomage_apres_mai_2025=chomage_mai,
+        )
+        brut_texte = f"{brut_mensuel:,.2f}".replace(",", " ").replace(".", ",")
+        brut_annuel_texte = f"{brut_mensuel * 12:,.2f}".replace(",", " ").replace(".", ",")
+        st.info(
+            f"Salaire brut nécessaire : **{brut_texte} € par mois**"
+            f" ({brut_annuel_texte} € par an)."
+        )
 
-    res = calcul_brut_net_mensuel(
+    res = calculateurs_partages()["calcul_brut_net_mensuel"](
         brut_mensuel,
         cadre=cadre,
         alsace_moselle=alsace_moselle,
@@ -333,29 +804,24 @@ def page_brut_net():
         effectif_50plus=effectif_50plus,
         chomage_apres_mai_2025=chomage_mai,
     )
-
-    st.session_state["brut_mensuel_calcule"] = res.brut_mensuel
-    st.session_state["brut_annuel_calcule"] = res.brut_mensuel * 12
+    latences.etape("calcul")
 
     net_imposable_mensuel = res.net_imposable
     net_imposable_annuel = res.net_imposable * 12
     net_a_payer_mensuel = res.net_a_payer
     net_a_payer_annuel = res.net_a_payer * 12
 
-    brut_net_result = {
-        "revenu_net_imposable_mensuel": net_imposable_mensuel,
-        "revenu_net_imposable_annuel": net_imposable_annuel,
-        "net_a_payer_mensuel": net_a_payer_mensuel,
-        "net_a_payer_annuel": net_a_payer_annuel,
-        "period": period,
-    }
-
-    previous_result = st.session_state.get("brut_net_result")
-    if previous_result != brut_net_result:
+    # Le ResultatSalaire (à slots, partagé avec le cache des calculs) est gardé tel
+    # quel : les montants mensuels et annuels en sont dérivés à la lecture.
+    if (
+        st.session_state.get("brut_net_resultat") != res
+        or st.session_state.get("brut_net_period") != period
+    ):
         previous_version = st.session_state.get("brut_net_ready_version", 0)
         new_version = previous_version + 1
         st.session_state["brut_net_ready_version"] = new_version
-        st.session_state["brut_net_result"] = brut_net_result
+        st.session_state["brut_net_resultat"] = res
+        st.session_state["brut_net_period"] = period
 
         applied_version = st.session_state.get("brut_net_applied_version")
         if applied_version not in (None, new_version):
@@ -444,9 +910,6 @@ def page_brut_net():
         )
     )
 
-    def format_euro_plain(value: float) -> str:
-        return f"{value:,.0f} €".replace(",", " ")
-
     st.subheader("Parcours du salaire : du coût employeur au net")
     st.caption(
         "Visualisez, étape par étape, comment le coût total employeur se transforme"
@@ -459,11 +922,8 @@ def page_brut_net():
     net_transfere = st.session_state.get("net_a_payer_mensuel")
     if simulation_result and net_transfere is not None:
         if abs(net_transfere - res.net_a_payer) < 0.5:
-            impot_annuel = simulation_result.get("impot_final")
-            revenu_net_mensuel = simulation_result.get("revenu_net_mensuel")
-            if impot_annuel is not None and revenu_net_mensuel is not None:
-                impot_mensuel = impot_annuel / 12.0
-                net_apres_impot = max(revenu_net_mensuel, 0.0)
+            impot_mensuel = simulation_result.impot_final / 12.0
+            net_apres_impot = max(simulation_result.revenu_net_mensuel, 0.0)
 
     journey_labels = [
         "Coût total employeur",
@@ -491,69 +951,13 @@ def page_brut_net():
         journey_values.append(net_apres_impot)
         deductions.append(("Impôt sur le revenu", impot_mensuel, 2, 3))
 
-    fig, ax = plt.subplots(figsize=(12, 5.5))
-    x_positions = np.arange(len(journey_labels))
-
-    line_color = "#1f4e79"
-    ax.plot(x_positions, journey_values, color=line_color, linewidth=3, zorder=2)
-
-    stage_colors = ["#1f4e79", "#2874a6", "#2e8b57", "#27ae60"]
-    stage_colors = stage_colors[: len(journey_labels)]
-
-    y_min = min(journey_values)
-    y_max = max(journey_values)
-    y_range = max(y_max - y_min, max(journey_values) * 0.1 if journey_values else 1)
-    if y_range == 0:
-        y_range = 1
-
-    for idx, (label, value, color) in enumerate(
-        zip(journey_labels, journey_values, stage_colors)
-    ):
-        ax.scatter(idx, value, color=color, s=120, zorder=3, edgecolor="white", linewidth=1.5)
-        ax.text(
-            idx,
-            value + y_range * 0.04,
-            format_euro(value),
-            ha="center",
-            va="bottom",
-            fontsize=11,
-            fontweight="bold",
-            color=color,
-        )
-
-    for label, amount, start_idx, end_idx in deductions:
-        if amount <= 0:
-            continue
-        x_pos = (start_idx + end_idx) / 2
-        y_start = journey_values[start_idx]
-        y_end = journey_values[end_idx]
-        ax.annotate(
-            f"-{format_euro_plain(amount)}\n{label}",
-            xy=(x_pos, y_end),
-            xytext=(x_pos, y_start - y_range * 0.12),
-            ha="center",
-            va="top",
-            fontsize=10,
-            color="#c0392b",
-            arrowprops=dict(arrowstyle="->", color="#c0392b", linewidth=1.5),
-            bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="#c0392b", alpha=0.85),
-        )
-
-    ax.set_xticks(x_positions)
-    ax.set_xticklabels(journey_labels, rotation=10, ha="right", fontsize=11)
-    ax.yaxis.set_major_formatter(FuncFormatter(lambda v, _: format_euro_plain(v)))
-    ax.set_ylabel("Montant mensuel (€)")
-    ax.set_title(
-        "Voyage du salaire : de la charge employeur au net perçu",
-        pad=20,
+    latences.etape("widgets")
+    afficher_figure(
+        figure_voyage_salaire,
+        tuple(zip(journey_labels, journey_values)),
+        tuple(deductions),
     )
-    ax.grid(axis="y", linestyle="--", alpha=0.3)
-    ax.spines["top"].set_visible(False)
-    ax.spines["right"].set_visible(False)
-    ax.set_xlim(-0.15, len(journey_labels) - 0.85)
-
-    plt.tight_layout()
-    st.pyplot(fig, use_container_width=True)
+    latences.etape("rendu")
 
     if net_apres_impot is None:
         st.caption(
@@ -696,6 +1100,7 @@ def page_brut_net():
         st.dataframe(sal_df.style.format({"Montant €": "{:,.2f}"}), hide_index=True)
     with tabs[2]:
         st.dataframe(emp_df.style.format({"Montant €": "{:,.2f}"}), hide_index=True)
+    latences.etape("tableaux")
 
     st.markdown("### Export")
     export_dict = {
@@ -712,6 +1117,20 @@ def page_brut_net():
         file_name="breakdown_brut_net_2025.csv",
         mime="text/csv",
     )
+    # Les exports Parquet et PDF ne sont produits qu'au clic, dans le thread du téléchargement
+    st.download_button(
+        "Télécharger le breakdown en Parquet",
+        data=functools.partial(exporter_parquet_salaire, res),
+        file_name="breakdown_brut_net_2025.parquet",
+        mime="application/vnd.apache.parquet",
+    )
+    st.download_button(
+        "Télécharger le breakdown en PDF",
+        data=functools.partial(rapport_brut_net_pdf, res),
+        file_name="breakdown_brut_net_2025.pdf",
+        mime="application/pdf",
+    )
+    latences.etape("exports")
 
     ready_version = st.session_state.get("brut_net_ready_version")
     applied_version = st.session_state.get("brut_net_applied_version")
@@ -766,6 +1185,7 @@ def page_brut_net():
         " CSG/CRDS), taux maladie employeur, allocations familiales, FNAL, chômage"
         " (mai 2025), AGS et CSA."
     )
+    latences.etape("widgets")
 
 # --- Initialisation du state pour stocker le résultat de la simulation ---
 if "simulation" not in st.session_state:
@@ -774,113 +1194,8 @@ if "simulation" not in st.session_state:
 if "page" not in st.session_state:
     st.session_state["page"] = "Étape 1 : Brut → Net"
 
-# --- Fonction de calcul d'impôt (inchangée) ---
-# Fonction de calcul d'impôt
-def calcul_impot(revenu_salarial, chiffre_affaire_autoentrepreneur,
-                 nombre_parts, reduction_forfaitaire=False,
-                 aide_familiale=0, frais_garde=0, est_couple=False):
-    if reduction_forfaitaire:
-        revenu_salarial_apres_reduction = revenu_salarial * 0.90
-        reduction_salariale = revenu_salarial - revenu_salarial_apres_reduction
-    else:
-        revenu_salarial_apres_reduction = revenu_salarial
-        reduction_salariale = 0
-
-    revenu_autoentrepreneur = chiffre_affaire_autoentrepreneur * 0.66
-    reduction_autoentrepreneur = chiffre_affaire_autoentrepreneur * 0.34
-
-    revenu_imposable = revenu_salarial_apres_reduction + revenu_autoentrepreneur
-    revenu_imposable_apres_aide = revenu_imposable - aide_familiale
-    quotient_familial = revenu_imposable_apres_aide / nombre_parts
-
-    tranches = [
-        (0, 11497, 0.00),
-        (11497, 29315, 0.11),
-        (29315, 83823, 0.30),
-        (83823, 180294, 0.41),
-        (180294, float('inf'), 0.45)
-    ]
-
-    impot_quotient = 0
-    details_tranches = []
-    for tranche in tranches:
-        if quotient_familial > tranche[1]:
-            impot_tranche = (tranche[1] - tranche[0]) * tranche[2]
-            impot_quotient += impot_tranche
-            details_tranches.append(f"Tranche {tranche[0]}€ à {tranche[1]}€ : {impot_tranche:.2f} €")
-        else:
-            impot_tranche = (quotient_familial - tranche[0]) * tranche[2]
-            impot_quotient += impot_tranche
-            details_tranches.append(f"Tranche {tranche[0]}€ à {quotient_familial:.2f}€ : {impot_tranche:.2f} €")
-            break
-
-    impot_total = impot_quotient * nombre_parts
-
-    if est_couple:
-        decote = max(0, 1470 - 0.4525 * impot_total)
-    else:
-        decote = max(0, 889 - 0.4525 * impot_total)
-
-    impot_apres_decote = max(0, impot_total - decote)
-    reduction_frais_garde = frais_garde * 0.50
-    impot_final = max(0, impot_apres_decote - reduction_frais_garde)
-
-    revenu_net_annuel = revenu_imposable_apres_aide - impot_final
-    revenu_net_mensuel = revenu_net_annuel / 12
-
-    return {
-        "impot_final": impot_final,
-        "revenu_net_mensuel": revenu_net_mensuel,
-        "nombre_parts": nombre_parts,
-        "details": {
-            "Revenu salarial initial": revenu_salarial,
-            "Réduction salariale forfaitaire (10%)": reduction_salariale,
-            "Revenu (chiffre d'affaire) auto-entrepreneur ": chiffre_affaire_autoentrepreneur,
-            "Réduction auto-entrepreneur (34%)": reduction_autoentrepreneur,
-            "Revenu imposable annuel total": revenu_imposable,
-            "Déduction pour aides et dons": aide_familiale,
-            "Revenu imposable annuel après aides": revenu_imposable_apres_aide,
-            "Impôt brut avant décote": impot_total,
-            "Décote": decote,
-            "Impôt après décote": impot_apres_decote,
-            "Réduction frais de garde (50%)": reduction_frais_garde,
-        },
-        "details_tranches": details_tranches
-    }
-
 def generate_html_report(result_dict):
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    html = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="utf-8">
-    <title>Rapport Simulation Impôt</title>
-</head>
-<body>
-    <h1>Rapport de Simulation d'Impôt</h1>
-    <p><strong>Date de génération :</strong> {now}</p>
-    <hr>
-    <h2>Résumé</h2>
-    <p><strong>Impôt Final (€):</strong> {result_dict['impot_final']:.2f}</p>
-    <p><strong>Revenu Net Mensuel (€):</strong> {result_dict['revenu_net_mensuel']:.2f}</p>
-    <h2>Détails</h2>
-    <ul>
-    """
-    for k, v in result_dict["details"].items():
-        html += f"<li><strong>{k}:</strong> {v:.2f} €</li>"
-    html += """
-    </ul>
-    <h2>Détails des Tranches</h2>
-    <ul>
-    """
-    for t in result_dict["details_tranches"]:
-        html += f"<li>{t}</li>"
-    html += """
-    </ul>
-</body>
-</html>
-"""
-    return html.encode("utf-8")
+    return rendre_rapport_html(result_dict)
 
 
 # --- Fonction pour la page Simulation ---
@@ -900,17 +1215,16 @@ def simulation_page():
             "les modifier si nécessaire."
         )
 
-    brut_mensuel_calcule = st.session_state.get("brut_mensuel_calcule")
-    brut_annuel_calcule = st.session_state.get("brut_annuel_calcule")
+    resultat_brut_net = st.session_state.get("brut_net_resultat")
 
     def format_euro(value: float) -> str:
         return f"{value:,.2f} €".replace(",", " ").replace(".", ",")
 
-    if brut_mensuel_calcule is not None and brut_annuel_calcule is not None:
+    if resultat_brut_net is not None:
         st.subheader("Références importées de l'étape 1")
         col_brut_m, col_brut_a = st.columns(2)
-        col_brut_m.metric("Salaire brut mensuel", format_euro(brut_mensuel_calcule))
-        col_brut_a.metric("Salaire brut annuel", format_euro(brut_annuel_calcule))
+        col_brut_m.metric("Salaire brut mensuel", format_euro(resultat_brut_net.brut_mensuel))
+        col_brut_a.metric("Salaire brut annuel", format_euro(resultat_brut_net.brut_mensuel * 12))
 
     # Inputs
     revenu_importe = st.session_state.get("revenu_net_imposable_annuel")
@@ -947,10 +1261,19 @@ def simulation_page():
     red = st.checkbox("Réduction Forfaitaire 10% sur Salaire", key="red")
     couple = st.checkbox("Couple (Marié/Pacsé)", key="couple")
 
+    latences.etape("widgets")
     if st.button("Calculer"):
-        st.session_state["simulation"] = calcul_impot(
-            revenu_salarial, ca_auto, parts, red, aide, garde, couple
+        st.session_state["simulation"] = SimulationEnregistree.calculer(
+            revenu_salarial,
+            ca_auto,
+            parts,
+            red,
+            aide,
+            garde,
+            couple,
+            calcul=calculateurs_partages()["calcul_impot"],
         )
+        latences.etape("calcul")
         st.success("✅ Simulation enregistrée !")
         version = st.session_state.get("simulation_version", 0) + 1
         st.session_state["simulation_version"] = version
@@ -962,7 +1285,7 @@ def simulation_page():
                 navigate_to_page("Étape 3 : Visualisation")
                 return
 
-    result = st.session_state.get("simulation")
+    result = simulation_detaillee()
     if result:
         with st.expander("Résumé", expanded=True):
             st.metric("Impôt Final (€)", f"{result['impot_final']:.2f}")
@@ -981,15 +1304,10 @@ def simulation_page():
             revenu_net = result["details"]["Revenu imposable annuel après aides"]
             impot_total = result["details"]["Impôt après décote"]
 
-            fig, ax = plt.subplots()
-            labels = ['Impôt payé', 'Revenu net après impôt']
-            values = [impot_total, revenu_net - impot_total]
-            colors = ['#ff6b6b', '#4ecdc4']
-            ax.pie(values, labels=labels, autopct='%1.1f%%', startangle=90, colors=colors)
-            ax.axis('equal')
-            ax.set_title("Répartition de l'impôt sur le revenu net annuel")
-            st.pyplot(fig)
-            
+            latences.etape("widgets")
+            afficher_figure(figure_repartition_impot, impot_total, revenu_net)
+            latences.etape("rendu")
+
         with st.expander("📄 Télécharger le rapport HTML", expanded=False):
             html_data = generate_html_report(result)
             st.download_button(
@@ -998,6 +1316,156 @@ def simulation_page():
                 file_name=f"rapport_impot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html",
                 mime="text/html"
             )
+            st.download_button(
+                label="📥 Télécharger le rapport PDF",
+                data=functools.partial(rapport_impot_pdf, result),
+                file_name=f"rapport_impot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+                mime="application/pdf",
+            )
+            latences.etape("exports")
+
+        with st.expander("🗺️ Paysage du net après impôt (brut × parts)", expanded=False):
+            st.caption(
+                "Net mensuel après impôt (net à payer moins l'impôt mensualisé) et taux"
+                " marginal combiné (cotisations, CSG/CRDS et impôt) pour toute une plage de"
+                " bruts mensuels et de nombres de parts, avec les autres données du foyer."
+            )
+            brut_min, brut_max = st.slider(
+                "Plage de brut mensuel (€)",
+                min_value=0.0,
+                max_value=40000.0,
+                value=(1500.0, 15000.0),
+                step=500.0,
+                key="grille_brut",
+            )
+            parts_max = st.slider(
+                "Nombre de parts maximal", 1.0, 10.0, 5.0, step=0.5, key="grille_parts"
+            )
+            latences.etape("widgets")
+            afficher_figure(
+                figure_grille_net_apres_impot,
+                brut_min,
+                brut_max,
+                parts_max,
+                couple,
+                ca_auto,
+                red,
+                aide,
+                garde,
+            )
+            latences.etape("rendu")
+
+        with st.expander("🎲 Chiffre d'affaires incertain (Monte Carlo)", expanded=False):
+            st.caption(
+                "Tire un grand nombre de chiffres d'affaires auto-entrepreneur possibles et"
+                " calcule l'impôt de chaque scénario avec les autres données du foyer."
+            )
+            mode_tirage = st.radio(
+                "Loi du chiffre d'affaires",
+                ["Moyenne et dispersion", "Historique mensuel"],
+                horizontal=True,
+                key="mc_mode",
+            )
+            if mode_tirage == "Moyenne et dispersion":
+                col_moy, col_disp = st.columns(2)
+                # Sans clé : la valeur par défaut suit le chiffre d'affaires saisi plus haut
+                moyenne_ca = col_moy.number_input(
+                    "CA annuel moyen (€)", 0.0, value=float(ca_auto), step=1000.0
+                )
+                dispersion = col_disp.slider(
+                    "Écart-type (% de la moyenne)", 0, 100, 30, step=5, key="mc_dispersion"
+                )
+                loi = {"moyenne": moyenne_ca, "ecart_type": moyenne_ca * dispersion / 100}
+            else:
+                texte_historique = st.text_area(
+                    "CA mensuels passés (€), séparés par des espaces ou des « ; »",
+                    key="mc_historique",
+                )
+                loi = {"historique_mensuel": texte_historique}
+            col_nb, col_graine = st.columns(2)
+            nb_scenarios = col_nb.select_slider(
+                "Nombre de scénarios",
+                NB_SCENARIOS_MONTE_CARLO,
+                value=NB_SCENARIOS_MONTE_CARLO[0],
+                format_func=lambda n: f"{n:,}".replace(",", " "),
+                key="mc_nb",
+            )
+            graine = int(col_graine.number_input("Graine", 0, value=2025, step=1, key="mc_graine"))
+
+            latences.etape("widgets")
+            if st.button("Lancer les scénarios", key="mc_lancer"):
+                try:
+                    if "historique_mensuel" in loi:
+                        loi = {"historique_mensuel": lire_historique_mensuel(loi["historique_mensuel"])}
+                    debut = time.perf_counter()
+                    chiffres_affaires = tirer_chiffres_affaires(nb_scenarios, graine=graine, **loi)
+                    scenarios = simuler_scenarios(
+                        revenu_salarial,
+                        chiffres_affaires,
+                        parts,
+                        red,
+                        aide,
+                        garde,
+                        couple,
+                        executeur=(
+                            executeur_monte_carlo()
+                            if nb_scenarios >= SEUIL_PARALLELE_MONTE_CARLO
+                            else None
+                        ),
+                    )
+                    # Seuls les centiles sont conservés dans la session
+                    st.session_state["monte_carlo"] = {
+                        "nb_scenarios": nb_scenarios,
+                        "duree_s": time.perf_counter() - debut,
+                        **centiles_scenarios(
+                            scenarios,
+                            ("chiffre_affaire_autoentrepreneur", "impot_final", "revenu_net_mensuel"),
+                        ),
+                    }
+                    latences.etape("calcul")
+                except ValueError as erreur:
+                    st.error(f"Tirage impossible : {erreur}")
+
+            resume_mc = st.session_state.get("monte_carlo")
+            if resume_mc:
+                centiles = list(resume_mc["centiles"])
+                mediane = centiles.index(50)
+                col_impot, col_net = st.columns(2)
+                col_impot.metric(
+                    "Impôt final médian",
+                    format_euro(resume_mc["impot_final"][mediane]),
+                    help=(
+                        f"Entre {format_euro(resume_mc['impot_final'][0])} et"
+                        f" {format_euro(resume_mc['impot_final'][-1])}"
+                        f" (centiles {centiles[0]:.0f} à {centiles[-1]:.0f})"
+                    ),
+                )
+                col_net.metric(
+                    "Revenu net mensuel médian",
+                    format_euro(resume_mc["revenu_net_mensuel"][mediane]),
+                    help=(
+                        f"Entre {format_euro(resume_mc['revenu_net_mensuel'][0])} et"
+                        f" {format_euro(resume_mc['revenu_net_mensuel'][-1])}"
+                        f" (centiles {centiles[0]:.0f} à {centiles[-1]:.0f})"
+                    ),
+                )
+                st.dataframe(
+                    pd.DataFrame(
+                        {
+                            "CA annuel (€)": resume_mc["chiffre_affaire_autoentrepreneur"],
+                            "Impôt final (€)": resume_mc["impot_final"],
+                            "Revenu net mensuel (€)": resume_mc["revenu_net_mensuel"],
+                        },
+                        index=[f"P{centile:.0f}" for centile in centiles],
+                    ).round(2),
+                    use_container_width=True,
+                )
+                latences.etape("tableaux")
+                st.caption(
+                    f"{resume_mc['nb_scenarios']:,} scénarios en".replace(",", " ")
+                    + f" {resume_mc['duree_s'] * 1000:.0f} ms · impôt moyen"
+                    f" {format_euro(resume_mc['moyenne_impot_final'])}."
+                )
 
         st.markdown("### 🚀 Étape suivante")
         st.caption("Visualisez graphiquement l'impact de votre simulation sur les taux d'imposition.")
@@ -1007,6 +1475,7 @@ def simulation_page():
             key="cta_simulation_to_visualisation",
         ):
             navigate_to_page("Étape 3 : Visualisation")
+    latences.etape("widgets")
 
 # --- Fonction pour la page d’Information ---
 def page_information():
@@ -1018,7 +1487,7 @@ def page_information():
             "simulation. Naviguez librement pour affiner vos paramètres."
         )
 
-    sim = st.session_state.get("simulation")
+    sim = simulation_detaillee()
     if not sim:
         st.warning("Aucune simulation enregistrée. Veuillez d'abord remplir la page de simulation.")
         if st.button(
@@ -1035,32 +1504,7 @@ def page_information():
     quotient_mensuel = quotient_familial / 12
 
     # --- Barème d'imposition ---
-    bareme = [
-        (0, 11294, 0.00),
-        (11294, 28797, 0.11),
-        (28797, 82341, 0.30),
-        (82341, 177106, 0.41),
-        (177106, float('inf'), 0.45)
-    ]
-
-    # --- Fonctions de calcul ---
-    def calc_imp(r):
-        i, d = 0, []
-        for bas, haut, tx in bareme:
-            if r > bas:
-                tr = min(haut, r) - bas
-                m = tr * tx
-                i += m
-                d.append((bas, min(haut, r), tr, tx, m))
-            else:
-                break
-        return i, d
-
-    def tx_marg(r):
-        for bas, _, tx in reversed(bareme):
-            if r > bas:
-                return tx
-        return 0.0
+    bareme = BAREME_VISUALISATION
 
     st.markdown("### 🔧 Ajustez votre revenu imposable simulé")
     variation_pct = st.slider(
@@ -1072,82 +1516,41 @@ def page_information():
         format="%+.0f%%",
         help="Ajustez votre revenu imposable pour visualiser l'impact sur l'impôt."
     )
+    latences.etape("widgets")
 
     revenu_imposable_ajuste = revenu_imposable_apres_aide * (1 + variation_pct / 100)
     quotient_familial_ajuste = revenu_imposable_ajuste / nombre_parts
     quotient_mensuel_ajuste = quotient_familial_ajuste / 12
 
     # --- Données pour les courbes ---
-    quotients_annuels = np.linspace(0.7, 1.3, 400) * quotient_familial
-    quotients_mensuels = quotients_annuels / 12
-    revenus_imposables_totaux_annuels = quotients_annuels * nombre_parts
-
-    impots_par_part = np.array([calc_imp(r)[0] for r in quotients_annuels])
-    impots_totaux = impots_par_part * nombre_parts
-
-    revenus_totaux_apres_aide = revenus_imposables_totaux_annuels
     deduction_aide = sim["details"].get("Déduction pour aides et dons", 0.0)
-    revenus_totaux_avant_aide = revenus_totaux_apres_aide + deduction_aide
 
-    taux_eff = np.divide(
-        impots_totaux,
-        revenus_totaux_apres_aide,
-        out=np.zeros_like(impots_totaux),
-        where=revenus_totaux_apres_aide > 0,
-    )
-    taux_marg_arr = np.array([tx_marg(r) for r in quotients_annuels])
-    taux_nom = np.divide(
-        impots_totaux,
-        revenus_totaux_avant_aide,
-        out=np.zeros_like(impots_totaux),
-        where=revenus_totaux_avant_aide > 0,
-    )
+    # --- Données ciblées : évaluation exacte du seul point demandé ---
+    segments = SegmentsTaux(bareme, nombre_parts, deduction_aide)
+    point = segments.evaluer(quotient_familial)
+    point_ajuste = segments.evaluer(quotient_familial_ajuste)
 
-    # --- Données ciblées à partir de la simulation ---
-    impot_cible_par_part, details = calc_imp(quotient_familial)
-    impot_cible_total = impot_cible_par_part * nombre_parts
-    revenu_total_apres_aide = revenu_imposable_apres_aide
-    revenu_total_avant_aide = revenu_total_apres_aide + deduction_aide
-
-    te_c = (
-        (impot_cible_total / revenu_total_apres_aide) * 100
-        if revenu_total_apres_aide > 0
-        else 0.0
-    )
-    tm_c = tx_marg(quotient_familial) * 100
-    tn_c = (
-        (impot_cible_total / revenu_total_avant_aide) * 100
-        if revenu_total_avant_aide > 0
-        else 0.0
-    )
+    impot_cible_par_part = bareme.impot(quotient_familial)
+    details = bareme.detail(quotient_familial)
+    impot_cible_total = point["impot_total"]
+    revenu_total_avant_aide = revenu_imposable_apres_aide + deduction_aide
 
-    impot_ajuste_par_part, _ = calc_imp(quotient_familial_ajuste)
-    impot_ajuste_total = impot_ajuste_par_part * nombre_parts
-    revenu_total_apres_aide_ajuste = revenu_imposable_ajuste
-    revenu_total_avant_aide_ajuste = revenu_total_apres_aide_ajuste + deduction_aide
+    te_c = point["taux_effectif"] * 100
+    tm_c = point["taux_marginal"] * 100
+    tn_c = point["taux_nominal"] * 100
 
-    te_ajuste = (
-        (impot_ajuste_total / revenu_total_apres_aide_ajuste) * 100
-        if revenu_total_apres_aide_ajuste > 0
-        else 0.0
-    )
-    tm_ajuste = tx_marg(quotient_familial_ajuste) * 100
-    tn_ajuste = (
-        (impot_ajuste_total / revenu_total_avant_aide_ajuste) * 100
-        if revenu_total_avant_aide_ajuste > 0
-        else 0.0
-    )
+    impot_ajuste_total = point_ajuste["impot_total"]
+    te_ajuste = point_ajuste["taux_effectif"] * 100
+    tm_ajuste = point_ajuste["taux_marginal"] * 100
+    tn_ajuste = point_ajuste["taux_nominal"] * 100
 
-    def distance_prochaine_tranche(quotient):
-        for _, haut, _ in bareme:
-            if quotient < haut:
-                if np.isinf(haut):
-                    return None
-                return haut - quotient
-        return None
+    def distance_prochaine_tranche(evaluation):
+        distance = evaluation["distance_prochaine_tranche"]
+        return None if np.isinf(distance) else distance
 
-    distance_initiale = distance_prochaine_tranche(quotient_familial)
-    distance_ajustee = distance_prochaine_tranche(quotient_familial_ajuste)
+    distance_initiale = distance_prochaine_tranche(point)
+    distance_ajustee = distance_prochaine_tranche(point_ajuste)
+    latences.etape("calcul")
 
     st.caption(
         f"Revenu imposable ajusté : {revenu_imposable_ajuste:.0f} € "
@@ -1169,93 +1572,37 @@ def page_information():
     col_tranche.metric("Distance avant prochaine tranche", distance_text)
 
     # --- Tracé des courbes ---
-    fig, ax = plt.subplots(figsize=(10, 6))
-    couleurs = ['#e0f7fa', '#b2ebf2', '#80deea', '#4dd0e1', '#26c6da']
-
-    def format_euro(val: float) -> str:
-        return f"{val:,.0f} €".replace(",", " ")
-
-    max_quotient_mensuel = quotients_mensuels.max()
-    tranche_patches = []
-    for idx, ((b, h, t), c) in enumerate(zip(bareme, couleurs), start=1):
-        xmax = (h / 12) if np.isfinite(h) else max_quotient_mensuel
-        ax.axvspan(b / 12, xmax, facecolor=c, alpha=0.3)
-        if np.isfinite(h):
-            tranche_label = (
-                f"Tranche {idx} : {format_euro(b)} – {format_euro(h)} "
-                f"({t * 100:.0f} %)"
-            )
-        else:
-            tranche_label = (
-                f"Tranche {idx} : ≥ {format_euro(b)} ({t * 100:.0f} %)"
-            )
-        tranche_patches.append(
-            Patch(facecolor=c, edgecolor='none', alpha=0.3, label=tranche_label)
-        )
-
-    ax.plot(quotients_mensuels, taux_eff * 100, label="Taux effectif", linewidth=2)
-    ax.plot(quotients_mensuels, taux_marg_arr * 100, '--', label="Taux marginal")
-    ax.plot(quotients_mensuels, taux_nom * 100, ':', label="Taux nominal")
-
-    ax.axvline(x=quotient_mensuel, color='red', linestyle='--')
-    ax.plot(quotient_mensuel, te_c, 'ro', label=f"Votre position ({quotient_mensuel:.0f} €)")
-
-    ax.axvline(x=quotient_mensuel_ajuste, color='#8e44ad', linestyle='-.')
-    ax.plot(
-        quotient_mensuel_ajuste,
-        te_ajuste,
-        'o',
-        color='#8e44ad',
-        label=f"Situation ajustée ({quotient_mensuel_ajuste:.0f} €)",
-    )
-
-    annotation = f"TE: {te_c:.1f}%\nTM: {tm_c:.1f}%\nTN: {tn_c:.1f}%"
-    ax.annotate(
-        annotation,
-        xy=(quotient_mensuel, te_c),
-        xytext=(quotient_mensuel + 200, te_c + 5),
-        arrowprops=dict(arrowstyle="->", color='red'),
-        fontsize=10,
-        color='red',
-        bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="red", alpha=0.8),
-    )
-
-    annotation_ajuste = f"TE: {te_ajuste:.1f}%\nTM: {tm_ajuste:.1f}%\nTN: {tn_ajuste:.1f}%"
-    ax.annotate(
-        annotation_ajuste,
-        xy=(quotient_mensuel_ajuste, te_ajuste),
-        xytext=(quotient_mensuel_ajuste + 200, te_ajuste + 5),
-        arrowprops=dict(arrowstyle="->", color='#8e44ad'),
-        fontsize=10,
-        color='#8e44ad',
-        bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="#8e44ad", alpha=0.8),
-    )
-
-    ax.set_xlabel("Quotient familial mensuel (€)")
-    ax.set_ylabel("Taux (%)")
-    ax.set_title(
-        "Taux d'imposition 2025 selon votre quotient familial "
-        "(axe supérieur : revenu imposable total annuel)"
-    )
-    ax.grid(True)
-
-    quotient_ticks = ax.get_xticks()
-    ax2 = ax.twiny()
-    ax2.set_xlim(np.array(ax.get_xlim()) * 12 * nombre_parts)
-    ax2.set_xticks(quotient_ticks * 12 * nombre_parts)
-    ax2.set_xlabel("Revenu imposable total annuel (€)")
-    ax2.xaxis.set_major_formatter(FuncFormatter(lambda val, _: format_euro(val)))
-
-    handles, _ = ax.get_legend_handles_labels()
-    legend_handles = handles + tranche_patches
-    ax.legend(
-        handles=legend_handles,
-        loc="center left",
-        bbox_to_anchor=(1.02, 0.5),
-        frameon=True,
+    rendu = st.radio(
+        "Rendu du graphique",
+        ["Image (matplotlib)", "Interactif (Plotly)"],
+        horizontal=True,
+        help=(
+            "Le mode interactif envoie les courbes au navigateur : zoom, survol et "
+            "curseur de variation intégré s'y exécutent sans recalcul côté serveur."
+        ),
     )
-    fig.tight_layout()
-    st.pyplot(fig)
+    latences.etape("widgets")
+    if rendu == "Interactif (Plotly)":
+        afficher_figure_interactive(
+            figure_courbes_taux_interactive,
+            bareme,
+            quotient_familial,
+            nombre_parts,
+            deduction_aide,
+            (quotient_mensuel, te_c, tm_c, tn_c),
+            variation_pct,
+        )
+    else:
+        afficher_figure(
+            figure_courbes_taux,
+            bareme,
+            quotient_familial,
+            nombre_parts,
+            deduction_aide,
+            (quotient_mensuel, te_c, tm_c, tn_c),
+            (quotient_mensuel_ajuste, te_ajuste, tm_ajuste, tn_ajuste),
+        )
+    latences.etape("rendu")
 
     # --- Analyse texte ---
     st.markdown("---")
@@ -1309,27 +1656,27 @@ def page_information():
     )
 
     def progression_tranche(quotient):
-        for idx, (bas, haut, _) in enumerate(bareme):
-            if quotient >= bas:
-                if np.isinf(haut):
-                    return {
-                        "index": idx,
-                        "bas": bas,
-                        "haut": haut,
-                        "avance": quotient - bas,
-                        "reste": None,
-                        "largeur": None,
-                    }
-                if quotient <= haut:
-                    return {
-                        "index": idx,
-                        "bas": bas,
-                        "haut": haut,
-                        "avance": quotient - bas,
-                        "reste": haut - quotient,
-                        "largeur": haut - bas,
-                    }
-        return None
+        if quotient < 0:
+            return None
+        idx = bareme.indice_tranche(quotient)
+        bas, haut, _ = bareme.tranches[idx]
+        if np.isinf(haut):
+            return {
+                "index": idx,
+                "bas": bas,
+                "haut": haut,
+                "avance": quotient - bas,
+                "reste": None,
+                "largeur": None,
+            }
+        return {
+            "index": idx,
+            "bas": bas,
+            "haut": haut,
+            "avance": quotient - bas,
+            "reste": haut - quotient,
+            "largeur": haut - bas,
+        }
 
     tranche_courante = progression_tranche(quotient_familial)
     if tranche_courante and tranche_courante["reste"] is not None:
@@ -1349,11 +1696,12 @@ def page_information():
     elif tranche_courante:
         st.info("Vous êtes déjà dans la tranche supérieure du barème (taux maximal appliqué).")
 
+    latences.etape("widgets")
     with st.expander("📊 Détail par tranche appliquée à votre quotient familial"):
         if details:
             donnees_tranches = []
             for idx, (bas, _, tr, tx, mnt) in enumerate(details):
-                haut_theorique = bareme[idx][1]
+                haut_theorique = bareme.tranches[idx][1]
                 libelle_haut = "∞" if np.isinf(haut_theorique) else f"{haut_theorique:,.0f} €"
                 donnees_tranches.append(
                     {
@@ -1390,6 +1738,7 @@ def page_information():
             "ℹ️ Chaque montant correspond à l'impôt payé dans la tranche considérée. "
             "La part de l'impôt indique la contribution relative de la tranche au total (par part)."
         )
+    latences.etape("tableaux")
 
     st.markdown("### 🚀 Étape suivante")
     st.caption("Estimez votre capacité d'emprunt en utilisant le revenu net issu de la simulation.")
@@ -1399,6 +1748,7 @@ def page_information():
         key="cta_visualisation_to_credit",
     ):
         navigate_to_page("Étape 4 : Capacité d'emprunt")
+    latences.etape("widgets")
 
 def page_credit():
     st.title("🏠 Simulation Capacité d'Emprunt")
@@ -1406,7 +1756,7 @@ def page_credit():
     # Récupération des données de la simulation
     sim = st.session_state.get("simulation")
     if sim:
-        revenu_net_simulation = sim["revenu_net_mensuel"]
+        revenu_net_simulation = sim.revenu_net_mensuel
         st.success(
             f"✅ Salaire net mensuel récupéré depuis la simulation : "
             f"**{revenu_net_simulation:,.2f} €**"
@@ -1478,18 +1828,15 @@ def page_credit():
         value=20, step=1
     )
 
+    latences.etape("widgets")
     if revenu_total > 0:
-        taux_endettement_max = 0.35
-        capacite_mensuelle = revenu_total * taux_endettement_max - mensualite_existante
-        capacite_mensuelle = max(capacite_mensuelle, 0)
-
-        nb_mois = duree_annees * 12
-        taux_mensuel = taux_emprunt / 100 / 12
-
-        if taux_mensuel > 0:
-            capital_max = capacite_mensuelle * (1 - (1 + taux_mensuel) ** -nb_mois) / taux_mensuel
-        else:
-            capital_max = capacite_mensuelle * nb_mois
+        capacite_mensuelle, capital_max = capacite_emprunt(
+            revenu_total,
+            taux_emprunt,
+            duree_annees,
+            mensualite_existante=mensualite_existante,
+        )
+        latences.etape("calcul")
 
         st.subheader("💰 Résultats")
         st.metric("Capacité d'emprunt mensuelle (€)", f"{capacite_mensuelle:.2f}")
@@ -1502,7 +1849,7 @@ def page_credit():
             st.markdown(f"- **Revenus locatifs pris en compte** : {revenus_locatifs_net:.2f} €")
         st.markdown(f"- **Revenu total pris en compte** : {revenu_total:.2f} €")
         st.markdown(f"- **Mensualité existante** : {mensualite_existante:.2f} €")
-        st.markdown(f"- **Taux d'endettement max** : 35 %")
+        st.markdown(f"- **Taux d'endettement max** : {TAUX_ENDETTEMENT_MAX * 100:.0f} %")
         st.markdown(f"- **Taux nominal du prêt** : {taux_emprunt:.2f} %")
         st.markdown(f"- **Durée du prêt** : {duree_annees} ans")
 
@@ -1512,6 +1859,72 @@ def page_credit():
             f"avec une mensualité de **{capacite_mensuelle:,.0f} €**."
         )
 
+        with st.expander("📅 Tableau d'amortissement", expanded=False):
+            taux_assurance = st.number_input(
+                "Taux d'assurance annuel (% du capital)",
+                min_value=0.0,
+                max_value=2.0,
+                value=0.0,
+                step=0.05,
+                key="taux_assurance",
+            )
+            latences.etape("widgets")
+            if capital_max > 0:
+                lignes = echeancier(capital_max, taux_emprunt, duree_annees, taux_assurance)
+                tableau = pd.DataFrame(map(astuple, lignes), columns=CHAMPS_AMORTISSEMENT)
+                tableau["annee"] = (tableau["mois"] - 1) // 12 + 1
+                par_annee = tableau.groupby("annee").agg(
+                    interets=("interets", "sum"),
+                    principal=("principal", "sum"),
+                    assurance=("assurance", "sum"),
+                    capital_restant=("capital_restant", "last"),
+                )
+                st.dataframe(par_annee.round(2), use_container_width=True)
+                latences.etape("tableaux")
+                st.caption(
+                    f"Coût total des intérêts : {tableau['interets'].sum():,.0f} €".replace(",", " ")
+                    + f" · assurance : {tableau['assurance'].sum():,.0f} €".replace(",", " ")
+                )
+                st.download_button(
+                    "📥 Télécharger le tableau mensuel (CSV)",
+                    data=tableau.drop(columns="annee")
+                    .round(2)
+                    .to_csv(sep=";", decimal=",", index=False),
+                    file_name="tableau_amortissement.csv",
+                    mime="text/csv",
+                    key="amortissement_csv",
+                )
+                latences.etape("exports")
+
+        with st.expander("🗺️ Comparer les taux et les durées", expanded=False):
+            st.caption(
+                "Capital maximal pour chaque taux de 0,1 % à 10 % (pas de 0,05 %) et chaque"
+                " durée de 5 à 30 ans, avec les mêmes revenus et charges."
+            )
+            latences.etape("widgets")
+            afficher_figure(
+                figure_grille_capacite,
+                revenu_total,
+                mensualite_existante,
+                taux_emprunt,
+                duree_annees,
+            )
+            latences.etape("rendu")
+            grille = grille_capacite_emprunt(revenu_total, mensualite_existante=mensualite_existante)
+            matrice = pd.DataFrame(
+                grille["capital_max"].round(2),
+                index=pd.Index(grille["taux_emprunt"], name="Taux (%)"),
+                columns=[f"{duree} ans" for duree in grille["durees_annees"]],
+            )
+            st.download_button(
+                "📥 Télécharger la matrice (CSV)",
+                data=matrice.to_csv(sep=";", decimal=","),
+                file_name="capacite_taux_duree.csv",
+                mime="text/csv",
+                key="grille_capacite_csv",
+            )
+            latences.etape("exports")
+
         st.markdown("### 🔁 Aller plus loin")
         st.caption("Ajustez votre situation en recalculant le net ou relancez une simulation complète.")
         if st.button(
@@ -1527,6 +1940,7 @@ def page_credit():
             key="cta_credit_to_brut",
         ):
             navigate_to_page("Étape 1 : Brut → Net")
+    latences.etape("widgets")
 
 
 # --- Barre latérale de navigation simplifiée ---
@@ -1576,12 +1990,61 @@ if selected_page != current_page:
 
 page = st.session_state["page"]
 
-if page == "Étape 1 : Brut → Net":
-    page_brut_net()
-elif page == "Étape 2 : Simulation d'impôt":
-    simulation_page()
-elif page == "Étape 3 : Visualisation":
-    page_information()
-elif page == "Étape 4 : Capacité d'emprunt":
-    page_credit()
-
+fonctions_pages = {
+    "Étape 1 : Brut → Net": page_brut_net,
+    "Étape 2 : Simulation d'impôt": simulation_page,
+    "Étape 3 : Visualisation": page_information,
+    "Étape 4 : Capacité d'emprunt": page_credit,
+}
+fonction_page = fonctions_pages.get(page)
+if fonction_page is not None:
+    with latences.page(fonction_page.__name__):
+        fonction_page()
+
+# --- Empreinte mémoire de la session ---
+if "identifiant_session" not in st.session_state:
+    st.session_state["identifiant_session"] = uuid.uuid4().hex
+donnees_evincees = appliquer_budget(st.session_state, BUDGET_SESSION_OCTETS, DONNEES_DERIVEES)
+tailles_session = empreinte(st.session_state.to_dict())
+taille_session = sum(tailles_session.values())
+empreintes_sessions().enregistrer(st.session_state["identifiant_session"], taille_session)
+
+
+with st.sidebar.expander("⚙️ Cache des calculs"):
+    for nom_calculateur, calculateur in calculateurs_partages().items():
+        stats_cache = calculateur.statistiques()
+        st.caption(
+            f"`{nom_calculateur}` : {stats_cache['succes']} succès,"
+            f" {stats_cache['echecs']} échecs ({stats_cache['taux_succes']:.0%}),"
+            f" {stats_cache['entrees']}/{stats_cache['taille_max']} entrées,"
+            f" {stats_cache['octets'] / 1024:.0f} Kio"
+        )
+    stats_figures = cache_figures().statistiques()
+    st.caption(
+        f"Graphiques : {stats_figures['succes']} succès,"
+        f" {stats_figures['echecs']} échecs ({stats_figures['taux_succes']:.0%}),"
+        f" {stats_figures['entrees']}/{stats_figures['taille_max']} images,"
+        f" {stats_figures['octets'] / 1024:.0f}/{stats_figures['octets_max'] / 1024:.0f} Kio"
+    )
+    stats_rendu = metriques_rendu().statistiques()
+    st.caption(
+        f"Rendus matplotlib : {stats_rendu['rendus']},"
+        f" {stats_rendu['duree_moyenne_s'] * 1000:.0f} ms en moyenne"
+        f" (dernier : {stats_rendu['derniere_duree_s'] * 1000:.0f} ms),"
+        f" {stats_rendu['figures_ouvertes']} figure(s) ouverte(s)"
+    )
+    plus_lourdes = ", ".join(
+        f"`{cle}` {octets / 1024:.1f} Kio" for cle, octets in list(tailles_session.items())[:3]
+    )
+    st.caption(
+        f"Session : {taille_session / 1024:.1f} Kio sur {BUDGET_SESSION_OCTETS / 1024:.0f} Kio"
+        f" ({plus_lourdes})"
+    )
+    if donnees_evincees:
+        st.caption("Évincé pour respecter le budget : " + ", ".join(f"`{cle}`" for cle in donnees_evincees))
+    stats_sessions = empreintes_sessions().statistiques()
+    st.caption(
+        f"Sessions actives : {stats_sessions['sessions']},"
+        f" {stats_sessions['octets_total'] / 1024:.1f} Kio au total"
+        f" (max {stats_sessions['octets_max'] / 1024:.1f} Kio)"
+    )
@@ -0,0 +1,58 @@
+"""Couche de calcul sans interface : brut → net, impôt sur le revenu et crédit.
+
+Ce paquet ne dépend que de NumPy et peut être importé par des traitements
+par lots sans déclencher Streamlit, matplotlib ni pandas. Seule l'API de
+calcul est chargée ici ; les outils plus lourds s'importent depuis leur
+sous-module : `agregation`, `amortissement`, `grille`, `monte_carlo`,
+`parallele` (exécuteur multi-cœurs), `rapports`, `cli`...
+"""
+
+from .bareme import BaremeCompile, SegmentsTaux, courbes_taux, taux_pour_quotients
+from .credit import TAUX_ENDETTEMENT_MAX, capacite_emprunt, grille_capacite_emprunt
+from .impot import calcul_impot, calcul_impot_batch
+from .parametres import (
+    BAREME_IMPOT,
+    BAREME_VISUALISATION,
+    PARAMETRES_DEFAUT,
+    ParametresAnnuels,
+    annees_disponibles,
+    charger_parametres,
+    parametres_annee,
+)
+from .salaire import (
+    CIBLES_INVERSE,
+    TAILLE_BLOC_BATCH,
+    LotSalaires,
+    ResultatSalaire,
+    calcul_brut_net_mensuel,
+    calcul_brut_net_mensuel_batch,
+    calcul_brut_pour_cible,
+    calcul_lot_salaires,
+)
+
+__all__ = [
+    "BAREME_IMPOT",
+    "BAREME_VISUALISATION",
+    "BaremeCompile",
+    "CIBLES_INVERSE",
+    "LotSalaires",
+    "PARAMETRES_DEFAUT",
+    "ParametresAnnuels",
+    "ResultatSalaire",
+    "SegmentsTaux",
+    "TAILLE_BLOC_BATCH",
+    "TAUX_ENDETTEMENT_MAX",
+    "annees_disponibles",
+    "calcul_brut_net_mensuel",
+    "calcul_brut_net_mensuel_batch",
+    "calcul_brut_pour_cible",
+    "calcul_impot",
+    "calcul_impot_batch",
+    "calcul_lot_salaires",
+    "capacite_emprunt",
+    "charger_parametres",
+    "courbes_taux",
+    "grille_capacite_emprunt",
+    "parametres_annee",
+    "taux_pour_quotients",
+]
@@ -0,0 +1,197 @@
+"""Agrégation des cotisations par groupes (centre de coût, mois, statut...).
+
+Chaque bloc de salariés donne une matrice lignes de cotisation × salariés,
+réduite par groupe en un seul `np.bincount` sur l'indice aplati
+(ligne, groupe). Les groupes sont accumulés d'un bloc à l'autre : un fichier
+de plusieurs millions de lignes s'agrège en mémoire bornée, sans DataFrame
+par salarié.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .parametres import PARAMETRES_DEFAUT, ParametresAnnuels
+from .salaire import CHAMPS_SALAIRE, OPTIONS_SALAIRE, matrice_cotisations
+
+TAILLE_BLOC_AGREGATION = 262_144  # Salariés par matrice réduite
+ETENDUE_DENSE_MAX = 1 << 22  # Au-delà, les clés entières sont numérotées par tri
+
+
+def _factoriser(cle: np.ndarray) -> tuple[np.ndarray, int]:
+    """Numérote de 0 à k-1 les valeurs distinctes d'une colonne ; renvoie (codes, k).
+
+    Les entiers et booléens d'étendue raisonnable sont numérotés sans tri, par
+    une table de correspondance dense.
+    """
+
+    if cle.dtype.kind in "biu" and len(cle):
+        if cle.dtype.kind == "b":
+            cle = cle.view(np.uint8)
+        minimum = cle.min()
+        # En entiers Python : `max - min` déborderait pour des clés int64 très dispersées
+        etendue = int(cle.max()) - int(minimum) + 1
+        if etendue <= max(ETENDUE_DENSE_MAX, len(cle)):
+            decalees = (cle - minimum).astype(np.int64, copy=False)
+            presentes = np.bincount(decalees, minlength=etendue) > 0
+            table = np.cumsum(presentes) - 1
+            return table[decalees], int(table[-1]) + 1
+    valeurs, inverse = np.unique(cle, return_inverse=True)
+    return inverse.reshape(-1), len(valeurs)
+
+
+def _codes_groupes(cles: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """Numérote les combinaisons de clés d'un bloc.
+
+    Renvoie l'indice de groupe local de chaque ligne et, pour chaque groupe,
+    l'indice d'une ligne qui le représente.
+    """
+
+    code = np.zeros(len(cles[0]), dtype=np.int64)
+    nb_codes = 1  # Borne (entier Python) des valeurs de `code`
+    for cle in cles:
+        codes, nb_valeurs = _factoriser(cle)
+        code *= nb_valeurs
+        code += codes
+        nb_codes *= nb_valeurs
+        if nb_codes > max(ETENDUE_DENSE_MAX, len(code)):
+            # Renumérote les combinaisons présentes : `code` reste inférieur à n et
+            # le produit par la cardinalité de la clé suivante tient dans un int64
+            code, nb_codes = _factoriser(code)
+    locaux, nb_groupes = _factoriser(code)
+    representants = np.empty(nb_groupes, dtype=np.int64)
+    representants[locaux] = np.arange(len(locaux))
+    return locaux, representants
+
+
+class AgregateurCotisations:
+    """Somme des montants par groupe, alimentée bloc par bloc.
+
+    `cles` nomme les colonnes de regroupement, `champs` les montants sommés
+    (par défaut tous les champs de `ResultatSalaire`).
+    """
+
+    def __init__(self, cles: Sequence[str], champs: Optional[Sequence[str]] = None):
+        if not cles:
+            raise ValueError("Au moins une clé de regroupement est nécessaire")
+        self.cles = tuple(cles)
+        self.champs = tuple(CHAMPS_SALAIRE if champs is None else champs)
+        self._groupes: dict[tuple, int] = {}
+        self._valeurs_cles: list[tuple] = []
+        self._sommes = np.zeros((len(self.champs), 0))
+        self._effectifs = np.zeros(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._groupes)
+
+    def ajouter(self, cles: dict, colonnes: dict) -> None:
+        """Ajoute un bloc : `cles` et `colonnes` associent un tableau 1D à chaque nom."""
+
+        self.ajouter_matrice(
+            cles,
+            np.stack(
+                [np.asarray(colonnes[champ], dtype=float).reshape(-1) for champ in self.champs]
+            ),
+        )
+
+    def ajouter_matrice(self, cles: dict, matrice: np.ndarray) -> None:
+        """Ajoute un bloc déjà sous forme de matrice `(len(champs), n)`."""
+
+        colonnes_cles = [np.asarray(cles[nom]).reshape(-1) for nom in self.cles]
+        if matrice.shape[1] == 0:
+            return
+        locaux, representants = _codes_groupes(colonnes_cles)
+        nb_locaux = len(representants)
+
+        # Réduction de toute la matrice en une passe : indice aplati (ligne, groupe)
+        indices = locaux + nb_locaux * np.arange(len(self.champs))[:, None]
+        sommes = np.bincount(
+            indices.reshape(-1),
+            weights=matrice.reshape(-1),
+            minlength=len(self.champs) * nb_locaux,
+        ).reshape(len(self.champs), nb_locaux)
+        effectifs = np.bincount(locaux, minlength=nb_locaux)
+
+        globaux = np.empty(nb_locaux, dtype=np.int64)
+        valeurs_representants = zip(*(cle[representants].tolist() for cle in colonnes_cles))
+        for i, valeurs in enumerate(valeurs_representants):
+            indice = self._groupes.get(valeurs)
+            if indice is None:
+                indice = self._groupes[valeurs] = len(self._valeurs_cles)
+                self._valeurs_cles.append(valeurs)
+            globaux[i] = indice
+        self._agrandir(len(self._valeurs_cles))
+        self._sommes[:, globaux] += sommes
+        self._effectifs[globaux] += effectifs
+
+    def _agrandir(self, nb_groupes: int) -> None:
+        capacite = self._sommes.shape[1]
+        if nb_groupes <= capacite:
+            return
+        capacite = max(nb_groupes, 2 * capacite)
+        sommes = np.zeros((len(self.champs), capacite))
+        sommes[:, : self._sommes.shape[1]] = self._sommes
+        effectifs = np.zeros(capacite, dtype=np.int64)
+        effectifs[: len(self._effectifs)] = self._effectifs
+        self._sommes, self._effectifs = sommes, effectifs
+
+    def resultat(self) -> dict[str, np.ndarray]:
+        """Colonnes du tableau agrégé : clés, `effectif` puis une somme par champ.
+
+        Les groupes sont triés par valeurs de clés.
+        """
+
+        n = len(self._valeurs_cles)
+        colonnes_cles = {
+            nom: np.array([valeurs[i] for valeurs in self._valeurs_cles])
+            for i, nom in enumerate(self.cles)
+        }
+        ordre = np.lexsort([colonnes_cles[nom] for nom in reversed(self.cles)]) if n else []
+        resultat = {nom: colonne[ordre] for nom, colonne in colonnes_cles.items()}
+        resultat["effectif"] = self._effectifs[:n][ordre]
+        for champ, sommes in zip(self.champs, self._sommes[:, :n]):
+            resultat[champ] = sommes[ordre]
+        return resultat
+
+
+def agreger_cotisations(
+    brut_mensuel,
+    cles: dict,
+    *,
+    champs: Optional[Sequence[str]] = None,
+    parametres: ParametresAnnuels = PARAMETRES_DEFAUT,
+    taille_bloc: int = TAILLE_BLOC_AGREGATION,
+    **options,
+) -> dict[str, np.ndarray]:
+    """Calcule brut → net pour chaque salarié et somme les montants par groupe.
+
+    `cles` associe un tableau (centre de coût, mois, statut...) à chaque clé
+    de regroupement ; les options de `calcul_brut_net_mensuel_batch`
+    acceptent des scalaires ou des tableaux de même longueur que `brut_mensuel`.
+    """
+
+    brut_mensuel = np.asarray(brut_mensuel, dtype=float).reshape(-1)
+    n = len(brut_mensuel)
+    inconnues = set(options) - set(OPTIONS_SALAIRE)
+    if inconnues:
+        raise TypeError(f"Options inconnues : {', '.join(sorted(inconnues))}")
+    options = {
+        nom: np.broadcast_to(np.asarray(options.get(nom, defaut), dtype=bool), n)
+        for nom, defaut in OPTIONS_SALAIRE.items()
+    }
+    cles = {nom: np.asarray(valeur).reshape(-1) for nom, valeur in cles.items()}
+
+    agregateur = AgregateurCotisations(list(cles), champs)
+    lignes = None if champs is None else [CHAMPS_SALAIRE.index(champ) for champ in agregateur.champs]
+    for debut in range(0, n, taille_bloc):
+        tranche = slice(debut, debut + taille_bloc)
+        matrice = matrice_cotisations(
+            brut_mensuel[tranche],
+            {nom: valeur[tranche] for nom, valeur in options.items()},
+            parametres,
+        )
+        agregateur.ajouter_matrice(
+            {nom: cle[tranche] for nom, cle in cles.items()},
+            matrice if lignes is None else matrice[lignes],
+        )
+    return agregateur.resultat()
@@ -0,0 +1,184 @@
+"""Tableaux d'amortissement de prêts à mensualités constantes.
+
+`echeancier` produit les lignes d'un prêt une à une, sans construire le
+tableau ; `echeanciers_batch` calcule d'un coup les tableaux complets de
+nombreux prêts sous forme de matrices prêts × mois. `exporter_echeanciers`
+écrit ces matrices par blocs de prêts dans un CSV ou un Parquet, en format
+long (une ligne par prêt et par mois), sans objet Python par ligne.
+"""
+
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+TAILLE_BLOC_PRETS = 2048  # Prêts par bloc exporté (2048 × 360 mois ≈ 740 000 lignes)
+
+
+@dataclass(frozen=True)
+class LigneAmortissement:
+    mois: int
+    mensualite: float        # Hors assurance
+    interets: float
+    principal: float
+    assurance: float
+    capital_restant: float
+
+
+CHAMPS_AMORTISSEMENT = tuple(champ.name for champ in fields(LigneAmortissement))
+
+
+def _mensualite(capital, taux_mensuel, nb_mois):
+    """Mensualité constante ; le taux nul est remplacé par 1 puis écarté par `where`."""
+
+    positif = taux_mensuel > 0
+    taux_calcul = np.where(positif, taux_mensuel, 1.0)
+    return np.where(
+        positif,
+        capital * taux_calcul / (1 - (1 + taux_calcul) ** -nb_mois),
+        capital / nb_mois,
+    )
+
+
+def _colonnes_prets(*colonnes) -> list[np.ndarray]:
+    """Diffuse les caractéristiques des prêts en colonnes 1D de même longueur."""
+
+    return [
+        col.reshape(-1)
+        for col in np.broadcast_arrays(*(np.asarray(col, dtype=float) for col in colonnes))
+    ]
+
+
+def echeancier(
+    capital: float,
+    taux_emprunt: float,
+    duree_annees: float,
+    taux_assurance: float = 0.0,
+) -> Iterator[LigneAmortissement]:
+    """Itère sur les lignes du tableau d'amortissement d'un prêt.
+
+    `taux_emprunt` et `taux_assurance` sont des taux annuels en pourcentage ;
+    l'assurance est calculée sur le capital initial. La dernière échéance
+    solde exactement le capital restant.
+    """
+
+    nb_mois = round(duree_annees * 12)
+    if capital < 0 or nb_mois <= 0:
+        raise ValueError("Le capital doit être positif et la durée non nulle")
+    taux_mensuel = taux_emprunt / 100 / 12
+    mensualite = float(_mensualite(capital, taux_mensuel, nb_mois))
+    assurance = capital * taux_assurance / 100 / 12
+
+    capital_restant = float(capital)
+    for mois in range(1, nb_mois + 1):
+        interets = capital_restant * taux_mensuel
+        principal = capital_restant if mois == nb_mois else mensualite - interets
+        capital_restant -= principal
+        if mois == nb_mois:
+            capital_restant = 0.0
+        yield LigneAmortissement(mois, mensualite, interets, principal, assurance, capital_restant)
+
+
+def echeanciers_batch(
+    capitaux,
+    taux_emprunt,
+    durees_annees,
+    taux_assurance=0.0,
+) -> dict[str, np.ndarray]:
+    """Tableaux d'amortissement de plusieurs prêts en matrices `(prêts, mois)`.
+
+    Les arguments acceptent des scalaires ou des tableaux diffusables entre
+    eux. Les matrices ont autant de colonnes que le prêt le plus long ; les
+    mois au-delà de la durée d'un prêt valent 0 et `nb_mois` donne la durée
+    de chacun. Le capital restant suit la forme fermée, si bien que chaque
+    colonne est indépendante des précédentes.
+    """
+
+    capitaux, taux_emprunt, durees_annees, taux_assurance = _colonnes_prets(
+        capitaux, taux_emprunt, durees_annees, taux_assurance
+    )
+    nb_mois = np.rint(durees_annees * 12).astype(np.int64)
+    if (capitaux < 0).any() or (nb_mois <= 0).any():
+        raise ValueError("Les capitaux doivent être positifs et les durées non nulles")
+
+    mois = np.arange(1, nb_mois.max(initial=0) + 1)
+    capital = capitaux[:, None]
+    duree = nb_mois[:, None]
+    taux_mensuel = (taux_emprunt / 100 / 12)[:, None]
+    mensualite = _mensualite(capital, taux_mensuel, duree)
+
+    # Capital restant avant l'échéance k : C (1+r)^(k-1) - M ((1+r)^(k-1) - 1) / r
+    positif = taux_mensuel > 0
+    taux_calcul = np.where(positif, taux_mensuel, 1.0)
+    facteur = (1 + taux_calcul) ** (mois - 1)
+    restant_avant = np.where(
+        positif,
+        capital * facteur - mensualite * (facteur - 1) / taux_calcul,
+        capital - mensualite * (mois - 1),
+    )
+    interets = restant_avant * taux_mensuel
+    derniere = mois == duree
+    principal = np.where(derniere, restant_avant, mensualite - interets)
+    capital_restant = np.where(derniere, 0.0, restant_avant - principal)
+
+    actif = mois <= duree
+    colonnes = {
+        "mois": np.where(actif, mois, 0),
+        "mensualite": np.where(actif, mensualite, 0.0),
+        "interets": np.where(actif, interets, 0.0),
+        "principal": np.where(actif, principal, 0.0),
+        "assurance": np.where(actif, (capitaux * taux_assurance / 100 / 12)[:, None], 0.0),
+        "capital_restant": np.where(actif, capital_restant, 0.0),
+    }
+    return {**colonnes, "nb_mois": nb_mois}
+
+
+def exporter_echeanciers(
+    chemin,
+    capitaux,
+    taux_emprunt,
+    durees_annees,
+    taux_assurance=0.0,
+    *,
+    taille_bloc: int = TAILLE_BLOC_PRETS,
+    separateur: str = ",",
+) -> int:
+    """Écrit les tableaux de plusieurs prêts dans un CSV ou un Parquet.
+
+    Une ligne par prêt et par mois, avec la colonne `pret` (indice du prêt).
+    Les prêts sont calculés et écrits par blocs de `taille_bloc` ; renvoie
+    le nombre de lignes écrites.
+    """
+
+    import pandas as pd
+
+    from .fichiers import EcrivainBlocs
+
+    capitaux, taux_emprunt, durees_annees, taux_assurance = _colonnes_prets(
+        capitaux, taux_emprunt, durees_annees, taux_assurance
+    )
+    ecrivain = EcrivainBlocs(Path(chemin), separateur)
+    try:
+        for debut in range(0, len(capitaux), taille_bloc):
+            tranche = slice(debut, debut + taille_bloc)
+            bloc = echeanciers_batch(
+                capitaux[tranche],
+                taux_emprunt[tranche],
+                durees_annees[tranche],
+                taux_assurance[tranche],
+            )
+            actif = bloc["mois"] > 0
+            # Le masque booléen parcourt la matrice ligne par ligne : prêt, puis mois
+            prets = np.broadcast_to(
+                np.arange(debut, debut + len(bloc["nb_mois"]))[:, None], actif.shape
+            )
+            ecrivain.ecrire(
+                pd.DataFrame(
+                    {"pret": prets[actif]}
+                    | {champ: bloc[champ][actif] for champ in CHAMPS_AMORTISSEMENT}
+                )
+            )
+    finally:
+        ecrivain.fermer()
+    return ecrivain.lignes
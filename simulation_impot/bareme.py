@@ -0,0 +1,208 @@
+"""Barèmes progressifs compilés de l'impôt sur le revenu."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+def _scalaire_ou_tableau(valeur):
+    """Renvoie un nombre Python pour un résultat 0-d, le tableau sinon."""
+
+    return valeur.item() if np.ndim(valeur) == 0 else valeur
+
+
+@dataclass(frozen=True, eq=False)
+class BaremeCompile:
+    """Barème progressif compilé : bornes, taux et impôt cumulé à chaque borne.
+
+    Chaque calcul (impôt, taux marginal, distance à la tranche suivante) se
+    résume à une recherche dichotomique suivie d'une multiplication-addition,
+    aussi bien pour un revenu isolé que pour un tableau de revenus.
+    """
+
+    tranches: tuple[tuple[float, float, float], ...]
+    bornes_basses: np.ndarray
+    bornes_hautes: np.ndarray
+    taux: np.ndarray
+    impot_cumule: np.ndarray
+
+    @classmethod
+    def depuis_tranches(cls, tranches) -> "BaremeCompile":
+        """Compile une liste de tranches `(bas, haut, taux)` ordonnées."""
+
+        tranches = tuple(tuple(tranche) for tranche in tranches)
+        impot_cumule = [0]
+        for bas, haut, taux in tranches[:-1]:
+            impot_cumule.append(impot_cumule[-1] + (haut - bas) * taux)
+
+        tableaux = [
+            np.array([bas for bas, _, _ in tranches], dtype=float),
+            np.array([haut for _, haut, _ in tranches], dtype=float),
+            np.array([taux for _, _, taux in tranches], dtype=float),
+            np.array(impot_cumule, dtype=float),
+        ]
+        for tableau in tableaux:
+            tableau.setflags(write=False)
+        return cls(tranches, *tableaux)
+
+    def indice_tranche(self, revenu):
+        """Indice de la tranche contenant `revenu` (borne haute incluse)."""
+
+        indice = np.searchsorted(self.bornes_hautes, revenu, side="left")
+        return _scalaire_ou_tableau(np.minimum(indice, len(self.tranches) - 1))
+
+    def impot(self, revenu, indice=None):
+        """Impôt dû sur `revenu`, optionnellement pour un indice de tranche déjà connu."""
+
+        revenu = np.asarray(revenu, dtype=float)
+        if indice is None:
+            indice = self.indice_tranche(revenu)
+        return _scalaire_ou_tableau(
+            self.impot_cumule[indice]
+            + (revenu - self.bornes_basses[indice]) * self.taux[indice]
+        )
+
+    def taux_marginal(self, revenu):
+        """Taux de la tranche dans laquelle se situe `revenu`."""
+
+        return _scalaire_ou_tableau(self.taux[self.indice_tranche(revenu)])
+
+    def distance_prochaine_tranche(self, revenu):
+        """Montant restant avant la borne suivante (`inf` dans la dernière tranche)."""
+
+        revenu = np.asarray(revenu, dtype=float)
+        indice = np.searchsorted(self.bornes_hautes, revenu, side="right")
+        indice = np.minimum(indice, len(self.tranches) - 1)
+        return _scalaire_ou_tableau(self.bornes_hautes[indice] - revenu)
+
+    def detail(self, revenu: float) -> list[tuple[float, float, float, float, float]]:
+        """Décompose l'impôt d'un revenu : `(bas, haut atteint, base, taux, montant)`."""
+
+        lignes = []
+        for bas, haut, taux in self.tranches[: self.indice_tranche(revenu) + 1]:
+            if revenu <= bas:
+                break
+            haut_atteint = min(haut, revenu)
+            base = haut_atteint - bas
+            lignes.append((bas, haut_atteint, base, taux, base * taux))
+        return lignes
+
+
+def taux_pour_quotients(
+    bareme: BaremeCompile,
+    quotients_annuels,
+    nombre_parts: float,
+    deduction_aide: float = 0.0,
+) -> dict[str, np.ndarray]:
+    """Taux effectif, marginal et nominal du foyer pour des quotients familiaux annuels."""
+
+    quotients_annuels = np.asarray(quotients_annuels, dtype=float)
+    impots_totaux = np.asarray(bareme.impot(quotients_annuels)) * nombre_parts
+
+    revenus_totaux_apres_aide = quotients_annuels * nombre_parts
+    revenus_totaux_avant_aide = revenus_totaux_apres_aide + deduction_aide
+
+    return {
+        "taux_effectif": np.divide(
+            impots_totaux,
+            revenus_totaux_apres_aide,
+            out=np.zeros_like(impots_totaux),
+            where=revenus_totaux_apres_aide > 0,
+        ),
+        "taux_marginal": np.asarray(bareme.taux_marginal(quotients_annuels)),
+        "taux_nominal": np.divide(
+            impots_totaux,
+            revenus_totaux_avant_aide,
+            out=np.zeros_like(impots_totaux),
+            where=revenus_totaux_avant_aide > 0,
+        ),
+    }
+
+
+@dataclass(frozen=True, eq=False)
+class SegmentsTaux:
+    """Taux d'un foyer, exacts par morceaux entre les bornes du barème.
+
+    Sur la tranche `i`, l'impôt par part vaut
+    `impot_cumule[i] + (q - bornes_basses[i]) * taux[i]` : le taux marginal y
+    est constant et les taux effectif et nominal sont des fractions
+    rationnelles de `q`. Un point s'évalue par une recherche dichotomique ; les
+    courbes sont tracées segment par segment, bornes comprises.
+    """
+
+    bareme: BaremeCompile
+    nombre_parts: float
+    deduction_aide: float = 0.0
+
+    def evaluer(self, quotient) -> dict:
+        """Impôt total, taux et distance à la tranche suivante pour un quotient annuel."""
+
+        resultat = taux_pour_quotients(
+            self.bareme, quotient, self.nombre_parts, self.deduction_aide
+        )
+        resultat["impot_total"] = np.asarray(self.bareme.impot(quotient)) * self.nombre_parts
+        resultat["distance_prochaine_tranche"] = np.asarray(
+            self.bareme.distance_prochaine_tranche(quotient)
+        )
+        return {nom: _scalaire_ou_tableau(valeur) for nom, valeur in resultat.items()}
+
+    def trace(
+        self, quotient_min: float, quotient_max: float, points_par_segment: int = 32
+    ) -> dict[str, np.ndarray]:
+        """Points des courbes sur `[quotient_min, quotient_max]` (quotients annuels).
+
+        Chaque borne de tranche apparaît deux fois, avec le taux marginal de
+        part et d'autre : la marche du taux marginal est verticale.
+        """
+
+        bareme = self.bareme
+        quotient_min, quotient_max = sorted((quotient_min, quotient_max))
+        bas = np.clip(bareme.bornes_basses, quotient_min, quotient_max)
+        haut = np.clip(bareme.bornes_hautes, quotient_min, quotient_max)
+        indices = np.nonzero(haut > bas)[0]
+        if len(indices):
+            pas = np.linspace(0.0, 1.0, points_par_segment)
+            quotients = bas[indices, None] + (haut - bas)[indices, None] * pas
+            indices = np.broadcast_to(indices[:, None], quotients.shape).reshape(-1)
+            quotients = quotients.reshape(-1)
+        else:
+            quotients = np.array([quotient_min])
+            indices = np.atleast_1d(bareme.indice_tranche(quotients))
+
+        impots_totaux = (
+            bareme.impot_cumule[indices]
+            + (quotients - bareme.bornes_basses[indices]) * bareme.taux[indices]
+        ) * self.nombre_parts
+        revenus_totaux_apres_aide = quotients * self.nombre_parts
+        revenus_totaux_avant_aide = revenus_totaux_apres_aide + self.deduction_aide
+        return {
+            "quotients_annuels": quotients,
+            "quotients_mensuels": quotients / 12,
+            "taux_effectif": np.divide(
+                impots_totaux,
+                revenus_totaux_apres_aide,
+                out=np.zeros_like(impots_totaux),
+                where=revenus_totaux_apres_aide > 0,
+            ),
+            "taux_marginal": bareme.taux[indices],
+            "taux_nominal": np.divide(
+                impots_totaux,
+                revenus_totaux_avant_aide,
+                out=np.zeros_like(impots_totaux),
+                where=revenus_totaux_avant_aide > 0,
+            ),
+        }
+
+
+def courbes_taux(
+    bareme: BaremeCompile,
+    quotient_familial: float,
+    nombre_parts: float,
+    deduction_aide: float = 0.0,
+    points_par_segment: int = 32,
+) -> dict[str, np.ndarray]:
+    """Taux effectif, marginal et nominal autour d'un quotient familial (±30 %)."""
+
+    return SegmentsTaux(bareme, nombre_parts, deduction_aide).trace(
+        0.7 * quotient_familial, 1.3 * quotient_familial, points_par_segment
+    )
@@ -0,0 +1,394 @@
+"""Banc de mesure des chemins de calcul, avec détection des régressions.
+
+Chaque cas prépare ses entrées (hors mesure) pour une taille donnée, puis
+renvoie l'appel à chronométrer. Le temps retenu est le meilleur de plusieurs
+répétitions. Le pic mémoire est mesuré par `tracemalloc`, qui suit aussi les
+tableaux NumPy, lors d'une exécution séparée. Les mesures sont écrites en
+JSON ; comparées à une référence, elles font échouer la commande dès qu'un
+chemin dépasse la tolérance en temps ou en mémoire. Exemple :
+
+    python -m simulation_impot.benchmarks --sortie reference.json
+    python -m simulation_impot.benchmarks --reference reference.json --tolerance 0.25
+
+Les cas `figure_*` importent l'application Streamlit en mode nu (sans
+serveur) pour mesurer ses vraies fonctions de tracé, export PNG ou JSON
+compris.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from .agregation import agreger_cotisations
+from .bareme import SegmentsTaux, courbes_taux
+from .credit import capacite_emprunt, grille_capacite_emprunt
+from .impot import calcul_impot, calcul_impot_batch
+from .parametres import BAREME_VISUALISATION
+from .salaire import calcul_brut_net_mensuel, calcul_lot_salaires
+
+FORMAT_MESURES = 1  # Version du format JSON des mesures
+TAILLES_BENCHMARK = (1, 100, 10_000, 1_000_000, 10_000_000)  # Lignes par appel
+GRAINE_BENCHMARK = 2025
+DUREE_MIN_S = 0.5  # Répétitions jusqu'à ce cumul (la première exécution compte)
+REPETITIONS_MAX = 1000
+TOLERANCE_TEMPS = 0.25  # Hausse relative admise avant de signaler une régression
+TOLERANCE_MEMOIRE = 0.10
+ECART_TEMPS_MIN_S = 1e-4  # En deçà, un écart de temps relève du bruit de mesure
+ECART_MEMOIRE_MIN = 64 * 1024  # Idem pour le pic mémoire (granularité de l'allocateur)
+APPLICATION = "Calcul_Impot_Streamlit"  # Module de l'interface, à la racine du dépôt
+
+
+@dataclass(frozen=True)
+class CasBenchmark:
+    """Chemin mesuré : `preparer(n)` construit les entrées et renvoie l'appel à chronométrer."""
+
+    nom: str
+    preparer: Callable[[int], Callable[[], object]]
+    tailles: tuple[int, ...]
+
+
+def _bruts(n: int) -> np.ndarray:
+    return np.random.default_rng(GRAINE_BENCHMARK).uniform(1500.0, 15000.0, n)
+
+
+def _foyers(n: int) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(GRAINE_BENCHMARK)
+    return rng.uniform(10_000.0, 200_000.0, n), rng.choice([1.0, 1.5, 2.0, 2.5, 3.0], n)
+
+
+def _salaire_scalaire(n: int):
+    bruts = _bruts(n).tolist()
+    cadres = [i % 2 == 0 for i in range(n)]
+
+    def appel():
+        for brut, cadre in zip(bruts, cadres):
+            calcul_brut_net_mensuel(brut, cadre=cadre)
+
+    return appel
+
+
+def _salaire_batch(n: int):
+    bruts = _bruts(n)
+    cadres = np.arange(n) % 2 == 0
+    return lambda: calcul_lot_salaires(bruts, cadre=cadres)
+
+
+def _salaire_agrege(n: int):
+    bruts = _bruts(n)
+    centres = (np.arange(n) % 64).astype(np.int16)
+    return lambda: agreger_cotisations(bruts, {"centre": centres}, cadre=centres % 2 == 0)
+
+
+def _impot_scalaire(n: int):
+    revenus, parts = (valeurs.tolist() for valeurs in _foyers(n))
+
+    def appel():
+        for revenu, nombre_parts in zip(revenus, parts):
+            calcul_impot(revenu, 0.0, nombre_parts, est_couple=nombre_parts >= 2)
+
+    return appel
+
+
+def _impot_batch(n: int):
+    revenus, parts = _foyers(n)
+    return lambda: calcul_impot_batch(revenus, 0.0, parts, est_couple=parts >= 2)
+
+
+def _courbes_taux(n: int):
+    # Courbes de la page de visualisation (anciennement 400 appels à calc_imp)
+    return lambda: courbes_taux(BAREME_VISUALISATION, 42_000.0, 1.0)
+
+
+def _capacite_scalaire(n: int):
+    revenus = _bruts(n).tolist()
+
+    def appel():
+        for revenu in revenus:
+            capacite_emprunt(revenu, 3.5, 20)
+
+    return appel
+
+
+def _grille_capacite(n: int):
+    return lambda: grille_capacite_emprunt(5000.0)
+
+
+def _application():
+    """Module de l'interface, importé une fois en mode nu."""
+
+    import importlib
+
+    from streamlit import config, logger
+
+    # Hors `streamlit run`, chaque appel à `st` signale l'absence de session : la
+    # configuration est lue d'abord, sinon sa lecture rétablirait le niveau par défaut
+    config.get_config_options()
+    logger.set_log_level("error")
+    racine = str(Path(__file__).resolve().parents[1])
+    if racine not in sys.path:
+        sys.path.insert(0, racine)
+    return importlib.import_module(APPLICATION)
+
+
+def _figure_png(construire, *args):
+    """Appel mesuré d'une figure matplotlib : calcul, tracé et export PNG, comme `afficher_figure`."""
+
+    app = _application()
+
+    def appel():
+        app.calculateurs_partages.clear()
+        return app.exporter_png(construire(*args))
+
+    return appel
+
+
+def _situation(quotient: float) -> tuple:
+    point = SegmentsTaux(BAREME_VISUALISATION, 1.0, 0.0).evaluer(quotient)
+    return (
+        quotient / 12,
+        point["taux_effectif"] * 100,
+        point["taux_marginal"] * 100,
+        point["taux_nominal"] * 100,
+    )
+
+
+def _figure_voyage_salaire(n: int):
+    res = calcul_brut_net_mensuel(6000.0)
+    etapes = (
+        ("Coût total employeur", res.cout_total_employeur),
+        ("Salaire brut", res.brut_mensuel),
+        ("Net à payer", res.net_a_payer),
+    )
+    retenues = (
+        ("Charges employeur", res.total_charges_employeur, 0, 1),
+        (
+            "Cotisations salarié (incl. CSG/CRDS)",
+            res.total_cot_sal_hors_csg + res.total_csg_crds,
+            1,
+            2,
+        ),
+    )
+    return _figure_png(_application().figure_voyage_salaire, etapes, retenues)
+
+
+def _figure_repartition_impot(n: int):
+    resultat = calcul_impot(42_000.0, 0.0, 1.0)
+    return _figure_png(
+        _application().figure_repartition_impot,
+        resultat["impot_final"],
+        resultat["revenu_net_mensuel"] * 12,
+    )
+
+
+def _figure_courbes_taux(n: int):
+    return _figure_png(
+        _application().figure_courbes_taux,
+        BAREME_VISUALISATION,
+        42_000.0,
+        1.0,
+        0.0,
+        _situation(42_000.0),
+        _situation(46_200.0),
+    )
+
+
+def _figure_courbes_taux_interactive(n: int):
+    app = _application()
+
+    def appel():
+        app.calculateurs_partages.clear()
+        # La figure Plotly part au navigateur sous forme de JSON
+        return app.figure_courbes_taux_interactive(
+            BAREME_VISUALISATION, 42_000.0, 1.0, 0.0, _situation(42_000.0), 0.0
+        ).to_json()
+
+    return appel
+
+
+def _figure_grille_net_apres_impot(n: int):
+    return _figure_png(
+        _application().figure_grille_net_apres_impot,
+        1500.0,
+        15000.0,
+        4.0,
+        True,
+        0.0,
+        False,
+        0.0,
+        0.0,
+    )
+
+
+def _figure_grille_capacite(n: int):
+    return _figure_png(_application().figure_grille_capacite, 5000.0, 0.0, 3.5, 20)
+
+
+# Les boucles scalaires s'arrêtent à 10 000 appels ; le lot complet brut → net
+# (35 champs) à 1 M de lignes, au-delà le chemin par blocs est l'agrégation.
+CAS_BENCHMARK = {
+    cas.nom: cas
+    for cas in (
+        CasBenchmark("salaire_scalaire", _salaire_scalaire, TAILLES_BENCHMARK[:3]),
+        CasBenchmark("salaire_batch", _salaire_batch, TAILLES_BENCHMARK[:4]),
+        CasBenchmark("salaire_agrege", _salaire_agrege, TAILLES_BENCHMARK),
+        CasBenchmark("impot_scalaire", _impot_scalaire, TAILLES_BENCHMARK[:3]),
+        CasBenchmark("impot_batch", _impot_batch, TAILLES_BENCHMARK),
+        CasBenchmark("courbes_taux", _courbes_taux, (1,)),
+        CasBenchmark("capacite_scalaire", _capacite_scalaire, TAILLES_BENCHMARK[:3]),
+        CasBenchmark("grille_capacite", _grille_capacite, (1,)),
+        CasBenchmark("figure_voyage_salaire", _figure_voyage_salaire, (1,)),
+        CasBenchmark("figure_repartition_impot", _figure_repartition_impot, (1,)),
+        CasBenchmark("figure_courbes_taux", _figure_courbes_taux, (1,)),
+        CasBenchmark("figure_courbes_taux_interactive", _figure_courbes_taux_interactive, (1,)),
+        CasBenchmark("figure_grille_net_apres_impot", _figure_grille_net_apres_impot, (1,)),
+        CasBenchmark("figure_grille_capacite", _figure_grille_capacite, (1,)),
+    )
+}
+
+
+def mesurer(appel: Callable[[], object]) -> dict:
+    """Meilleur temps sur des répétitions d'au moins `DUREE_MIN_S` au total, puis pic mémoire."""
+
+    durees = []
+    while sum(durees) < DUREE_MIN_S and len(durees) < REPETITIONS_MAX:
+        debut = time.perf_counter()
+        appel()
+        durees.append(time.perf_counter() - debut)
+
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        appel()
+        pic = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    return {"temps_s": min(durees), "memoire_pic_octets": pic, "repetitions": len(durees)}
+
+
+def executer(
+    cas: Optional[list[str]] = None,
+    taille_max: int = TAILLES_BENCHMARK[-1],
+    progression: Optional[Callable[[str, dict], None]] = None,
+) -> dict:
+    """Mesure les cas demandés (tous par défaut) ; renvoie le document JSON des mesures."""
+
+    mesures = {}
+    for nom in cas or CAS_BENCHMARK:
+        definition = CAS_BENCHMARK[nom]
+        for taille in definition.tailles:
+            if taille > taille_max:
+                continue
+            cle = f"{nom}/{taille}"
+            mesures[cle] = mesurer(definition.preparer(taille))
+            if progression is not None:
+                progression(cle, mesures[cle])
+    return {
+        "format": FORMAT_MESURES,
+        "environnement": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "plateforme": platform.platform(),
+            "processeurs": os.cpu_count(),
+        },
+        "mesures": mesures,
+    }
+
+
+def comparer(
+    mesures: dict,
+    reference: dict,
+    tolerance_temps: float = TOLERANCE_TEMPS,
+    tolerance_memoire: float = TOLERANCE_MEMOIRE,
+) -> list[str]:
+    """Régressions de `mesures` par rapport à `reference` (cas communs aux deux)."""
+
+    if reference.get("format") != FORMAT_MESURES:
+        raise ValueError(f"Format de référence {reference.get('format')!r} non pris en charge")
+    regressions = []
+    for cle, mesure in mesures["mesures"].items():
+        ref = reference["mesures"].get(cle)
+        if ref is None:
+            continue
+        for champ, tolerance, ecart_min, unite in (
+            ("temps_s", tolerance_temps, ECART_TEMPS_MIN_S, "s"),
+            ("memoire_pic_octets", tolerance_memoire, ECART_MEMOIRE_MIN, "octets"),
+        ):
+            ecart = mesure[champ] - ref[champ]
+            if ecart > ecart_min and ecart > tolerance * ref[champ]:
+                regressions.append(
+                    f"{cle} : {champ} {mesure[champ]:.6g} {unite} contre {ref[champ]:.6g}"
+                    f" (+{ecart / ref[champ]:.0%}, tolérance {tolerance:.0%})"
+                    if ref[champ]
+                    else f"{cle} : {champ} {mesure[champ]:.6g} {unite} contre 0"
+                )
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m simulation_impot.benchmarks",
+        description="Mesure temps et pic mémoire des chemins de calcul et détecte les régressions.",
+    )
+    parser.add_argument(
+        "--cas",
+        help=f"Cas à mesurer, séparés par des virgules (défaut : tous) parmi {', '.join(CAS_BENCHMARK)}",
+    )
+    parser.add_argument(
+        "--taille-max",
+        type=int,
+        default=TAILLES_BENCHMARK[-1],
+        help=f"Ignore les tailles supérieures (défaut : {TAILLES_BENCHMARK[-1]})",
+    )
+    parser.add_argument("--sortie", type=Path, help="Fichier JSON où écrire les mesures")
+    parser.add_argument("--reference", type=Path, help="Mesures JSON de référence à comparer")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=TOLERANCE_TEMPS,
+        help=f"Hausse de temps admise (défaut : {TOLERANCE_TEMPS})",
+    )
+    parser.add_argument(
+        "--tolerance-memoire",
+        type=float,
+        default=TOLERANCE_MEMOIRE,
+        help=f"Hausse du pic mémoire admise (défaut : {TOLERANCE_MEMOIRE})",
+    )
+    args = parser.parse_args(argv)
+    cas = args.cas.split(",") if args.cas else None
+    inconnus = set(cas or ()) - set(CAS_BENCHMARK)
+    if inconnus:
+        parser.error(f"cas inconnus : {', '.join(sorted(inconnus))}")
+    reference = json.loads(args.reference.read_text()) if args.reference else None
+
+    def afficher(cle: str, mesure: dict) -> None:
+        ligne = (
+            f"{cle:<42} {mesure['temps_s'] * 1e3:>12.3f} ms"
+            f" {mesure['memoire_pic_octets'] / 2**20:>10.1f} Mio"
+        )
+        ref = reference["mesures"].get(cle) if reference else None
+        if ref and ref["temps_s"]:
+            ligne += f"  ×{mesure['temps_s'] / ref['temps_s']:.2f}"
+        print(ligne, flush=True)
+
+    mesures = executer(cas, args.taille_max, afficher)
+    if args.sortie:
+        args.sortie.write_text(json.dumps(mesures, indent=2, ensure_ascii=False) + "\n")
+    if reference is None:
+        return 0
+    regressions = comparer(mesures, reference, args.tolerance, args.tolerance_memoire)
+    for regression in regressions:
+        print(f"RÉGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
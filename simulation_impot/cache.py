@@ -0,0 +1,185 @@
+"""Mémoïsation des calculateurs : cache LRU borné avec statistiques.
+
+La clé d'un appel est le tuple complet de ses arguments normalisés : valeurs
+par défaut appliquées, nombres convertis en `float` et booléens en `bool`, si
+bien que `calcul_impot(6000, 0, 1)` et `calcul_impot(6000.0, 0.0, 1.0, False)`
+partagent la même entrée. Les appels portant des tableaux NumPy ne sont pas
+mis en cache et sont transmis directement à la fonction.
+
+Un cache peut être borné en nombre d'entrées, en octets (taille mesurée à
+l'insertion) et en durée de vie : il est alors sûr de le partager entre toutes
+les sessions d'un serveur. Les résultats mis en cache sont partagés entre
+appelants : ils doivent être traités en lecture seule.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from numbers import Number
+from typing import Callable, Optional
+
+import numpy as np
+
+from .session import taille_objet
+
+TAILLE_CACHE_DEFAUT = 1024
+
+
+class CacheLRU:
+    """Dictionnaire borné évinçant l'entrée la moins récemment utilisée.
+
+    `octets_max` borne la somme des tailles mesurées par `mesurer` ; une entrée
+    plus grosse que cette borne n'est pas conservée. Une entrée plus vieille que
+    `duree_vie_s` est oubliée au premier accès.
+    """
+
+    def __init__(
+        self,
+        taille_max: int = TAILLE_CACHE_DEFAUT,
+        *,
+        octets_max: Optional[int] = None,
+        duree_vie_s: Optional[float] = None,
+        mesurer: Callable[[object], int] = taille_objet,
+    ):
+        if taille_max <= 0:
+            raise ValueError("La taille maximale du cache doit être strictement positive")
+        if octets_max is not None and octets_max <= 0:
+            raise ValueError("La borne en octets du cache doit être strictement positive")
+        self.taille_max = taille_max
+        self.octets_max = octets_max
+        self.duree_vie_s = duree_vie_s
+        self.mesurer = mesurer
+        self._entrees = OrderedDict()  # Clé -> (valeur, octets, instant d'insertion)
+        self._verrou = threading.Lock()
+        self.octets = 0
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entrees)
+
+    def _retirer(self, cle) -> None:
+        self.octets -= self._entrees.pop(cle)[1]
+
+    def obtenir(self, cle, defaut=None):
+        with self._verrou:
+            try:
+                valeur, _, instant = self._entrees[cle]
+            except KeyError:
+                self.echecs += 1
+                return defaut
+            if self.duree_vie_s is not None and time.monotonic() - instant > self.duree_vie_s:
+                self._retirer(cle)
+                self.expirations += 1
+                self.echecs += 1
+                return defaut
+            self._entrees.move_to_end(cle)
+            self.succes += 1
+            return valeur
+
+    def stocker(self, cle, valeur) -> None:
+        octets = self.mesurer(valeur)  # Hors verrou : la mesure peut parcourir un gros objet
+        with self._verrou:
+            if cle in self._entrees:
+                self._retirer(cle)
+            if self.octets_max is not None and octets > self.octets_max:
+                return
+            instant = time.monotonic()
+            self._entrees[cle] = (valeur, octets, instant)
+            self.octets += octets
+            # Les entrées expirées les moins récemment lues partent sans attendre un accès
+            while self.duree_vie_s is not None:
+                ancienne = next(iter(self._entrees))
+                if instant - self._entrees[ancienne][2] <= self.duree_vie_s:
+                    break
+                self._retirer(ancienne)
+                self.expirations += 1
+            while len(self._entrees) > self.taille_max or (
+                self.octets_max is not None and self.octets > self.octets_max
+            ):
+                self._retirer(next(iter(self._entrees)))
+                self.evictions += 1
+
+    def vider(self) -> None:
+        with self._verrou:
+            self._entrees.clear()
+            self.octets = 0
+            self.succes = self.echecs = self.evictions = self.expirations = 0
+
+    def statistiques(self) -> dict:
+        with self._verrou:
+            appels = self.succes + self.echecs
+            return {
+                "succes": self.succes,
+                "echecs": self.echecs,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entrees": len(self._entrees),
+                "taille_max": self.taille_max,
+                "octets": self.octets,
+                "octets_max": self.octets_max,
+                "taux_succes": self.succes / appels if appels else 0.0,
+            }
+
+
+_ABSENT = object()
+
+
+def cle_canonique(valeur):
+    """Forme hachable et normalisée de `valeur` : nombres en `float`, booléens en `bool`,
+    séquences en tuples et dictionnaires en tuples de paires triées, récursivement."""
+
+    if isinstance(valeur, (bool, np.bool_)):
+        return bool(valeur)
+    if isinstance(valeur, Number):
+        return float(valeur)
+    if isinstance(valeur, (tuple, list)):
+        return tuple(cle_canonique(element) for element in valeur)
+    if isinstance(valeur, dict):
+        return tuple(sorted((cle, cle_canonique(element)) for cle, element in valeur.items()))
+    return valeur
+
+
+def memoiser(
+    fonction=None,
+    *,
+    taille_max: int = TAILLE_CACHE_DEFAUT,
+    octets_max: Optional[int] = None,
+    duree_vie_s: Optional[float] = None,
+):
+    """Décore `fonction` d'un `CacheLRU` (accessible via l'attribut `cache`).
+
+    S'emploie avec ou sans paramètres : `@memoiser` ou `memoiser(f, taille_max=64)`.
+    """
+
+    if fonction is None:
+        return functools.partial(
+            memoiser, taille_max=taille_max, octets_max=octets_max, duree_vie_s=duree_vie_s
+        )
+
+    signature = inspect.signature(fonction)
+    cache = CacheLRU(taille_max, octets_max=octets_max, duree_vie_s=duree_vie_s)
+
+    @functools.wraps(fonction)
+    def enveloppe(*args, **kwargs):
+        arguments = signature.bind(*args, **kwargs)
+        arguments.apply_defaults()
+        cle = cle_canonique(tuple(arguments.arguments.values()))
+        try:
+            hash(cle)
+        except TypeError:  # Tableaux ou objets non hachables : pas de mise en cache
+            return fonction(*args, **kwargs)
+
+        resultat = cache.obtenir(cle, _ABSENT)
+        if resultat is _ABSENT:
+            resultat = fonction(*args, **kwargs)
+            cache.stocker(cle, resultat)
+        return resultat
+
+    enveloppe.cache = cache
+    enveloppe.statistiques = cache.statistiques
+    return enveloppe
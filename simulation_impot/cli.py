@@ -0,0 +1,260 @@
+"""Traitement par lots en ligne de commande : brut → net → impôt sur CSV/Parquet.
+
+Le fichier d'entrée est lu par blocs de taille fixe ; chaque bloc passe par
+`calcul_brut_net_mensuel_batch` puis `calcul_impot_batch` et est écrit
+immédiatement, de sorte que la mémoire reste bornée quelle que soit la taille
+du fichier. Exemple :
+
+    python -m simulation_impot paie.csv resultats.parquet --rejets rejets.csv
+
+Colonnes reconnues en entrée :
+- `brut_mensuel` (fiche de paie) ou, à défaut, `revenu_salarial` (foyer) ;
+- options salariales `cadre`, `alsace_moselle`, `sup_2p5_smic`, `sup_3p5_smic`,
+  `effectif_50plus`, `chomage_apres_mai_2025` ;
+- données du foyer `chiffre_affaire_autoentrepreneur`, `nombre_parts`,
+  `aide_familiale`, `frais_garde`, `reduction_forfaitaire`, `est_couple`.
+Les colonnes absentes ou vides prennent les valeurs par défaut de l'application.
+Toutes les autres colonnes sont recopiées telles quelles dans la sortie.
+
+Avec `--agreger centre,mois,cadre`, la sortie contient une ligne par groupe
+(effectif et somme de chaque montant du calcul brut → net) au lieu d'une
+ligne par salarié.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .agregation import AgregateurCotisations
+from .entrees import MONTANTS_FOYER, OPTIONS_FOYER, colonne_booleenne, colonne_numerique
+from .fichiers import TAILLE_BLOC_DEFAUT, EcrivainBlocs, lire_blocs
+from .impot import calcul_impot_batch
+from .parallele import ExecuteurParallele
+from .parametres import (
+    ANNEE_PAR_DEFAUT,
+    PARAMETRES_DEFAUT,
+    ParametresAnnuels,
+    annees_disponibles,
+    parametres_annee,
+)
+from .salaire import CHAMPS_SALAIRE, OPTIONS_SALAIRE, calcul_brut_net_mensuel_batch
+
+
+def _colonne_cle(resultats: pd.DataFrame, nom: str) -> np.ndarray:
+    """Clé de regroupement ; les options sont lues comme pour le calcul (« 1 » = « true »)."""
+
+    options = OPTIONS_SALAIRE | OPTIONS_FOYER
+    if nom in options:
+        return colonne_booleenne(resultats, nom, options[nom])[0]
+    serie = resultats[nom]
+    if pd.api.types.is_numeric_dtype(serie.dtype):
+        return serie.to_numpy()
+    return serie.astype(str).to_numpy(dtype=str)
+
+
+def agreger_bloc(agregateur: AgregateurCotisations, resultats: pd.DataFrame) -> None:
+    """Ajoute les résultats d'un bloc (chaîne brut → net) à `agregateur`."""
+
+    absentes = [nom for nom in agregateur.cles + agregateur.champs if nom not in resultats]
+    if absentes:
+        raise ValueError(f"Colonnes absentes pour l'agrégation : {', '.join(absentes)}")
+    agregateur.ajouter_matrice(
+        {nom: _colonne_cle(resultats, nom) for nom in agregateur.cles},
+        resultats[list(agregateur.champs)].to_numpy(dtype=float).T,
+    )
+
+
+def traiter_bloc(
+    bloc: pd.DataFrame,
+    executeur: Optional[ExecuteurParallele] = None,
+    parametres: ParametresAnnuels = PARAMETRES_DEFAUT,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Calcule un bloc avec les règles de `parametres` ; renvoie `(résultats, rejets)`.
+
+    Les rejets reprennent les lignes d'origine avec une colonne `motif_rejet`.
+    Avec un `executeur`, le calcul du bloc est réparti entre ses workers.
+    """
+
+    brut_net = executeur.brut_net if executeur else calcul_brut_net_mensuel_batch
+    impot_batch = executeur.impot if executeur else calcul_impot_batch
+
+    n = len(bloc)
+    motifs = np.full(n, "", dtype=object)
+
+    def signaler(invalides: np.ndarray, motif: str) -> None:
+        motifs[invalides & (motifs == "")] = motif
+
+    chaine_salaire = "brut_mensuel" in bloc
+    colonne_revenu = "brut_mensuel" if chaine_salaire else "revenu_salarial"
+    revenu, invalides = colonne_numerique(bloc, colonne_revenu, None)
+    signaler(invalides | (revenu < 0), f"{colonne_revenu} invalide")
+
+    options_salaire = {}
+    if chaine_salaire:
+        for nom, defaut in OPTIONS_SALAIRE.items():
+            options_salaire[nom], invalides = colonne_booleenne(bloc, nom, defaut)
+            signaler(invalides, f"{nom} invalide")
+
+    foyer = {}
+    for nom, defaut in MONTANTS_FOYER.items():
+        foyer[nom], invalides = colonne_numerique(bloc, nom, defaut)
+        plancher_invalide = foyer[nom] <= 0 if nom == "nombre_parts" else foyer[nom] < 0
+        signaler(invalides | plancher_invalide, f"{nom} invalide")
+    for nom, defaut in OPTIONS_FOYER.items():
+        foyer[nom], invalides = colonne_booleenne(bloc, nom, defaut)
+        signaler(invalides, f"{nom} invalide")
+
+    valides = motifs == ""
+    rejets = bloc.loc[~valides].assign(motif_rejet=motifs[~valides])
+
+    colonnes = {}
+    if chaine_salaire:
+        salaire = brut_net(
+            revenu[valides],
+            **{nom: valeurs[valides] for nom, valeurs in options_salaire.items()},
+            parametres=parametres,
+        )
+        colonnes.update(salaire)
+        revenu_salarial = salaire["net_imposable"] * 12
+    else:
+        revenu_salarial = revenu[valides]
+    impot = impot_batch(
+        revenu_salarial,
+        **{nom: valeurs[valides] for nom, valeurs in foyer.items()},
+        parametres=parametres,
+    )
+    colonnes.update(impot)
+
+    # Les colonnes calculées remplacent les colonnes d'entrée de même nom (valeurs converties)
+    recopiees = bloc.loc[valides, [nom for nom in bloc.columns if nom not in colonnes]]
+    resultats = pd.concat(
+        [recopiees.reset_index(drop=True), pd.DataFrame(colonnes)], axis=1
+    )
+    return resultats, rejets
+
+
+def executer(
+    entree: Path,
+    sortie: Path,
+    rejets: Optional[Path] = None,
+    *,
+    taille_bloc: int = TAILLE_BLOC_DEFAUT,
+    separateur: str = ",",
+    processus: int = 1,
+    annee: int = ANNEE_PAR_DEFAUT,
+    agreger: Optional[list[str]] = None,
+) -> dict:
+    """Traite `entree` bloc par bloc et renvoie les compteurs du traitement.
+
+    Avec `agreger`, les résultats sont sommés par groupe de ces colonnes et
+    seul le tableau agrégé est écrit dans `sortie`.
+    """
+
+    debut = time.perf_counter()
+    parametres = parametres_annee(annee)
+    ecrivain = EcrivainBlocs(sortie, separateur)
+    ecrivain_rejets = EcrivainBlocs(rejets, separateur) if rejets is not None else None
+    executeur = ExecuteurParallele(processus) if processus > 1 else None
+    agregateur = AgregateurCotisations(agreger, CHAMPS_SALAIRE) if agreger else None
+    lignes_traitees = lignes_rejetees = 0
+    resultats = None
+    try:
+        for bloc in lire_blocs(entree, taille_bloc, separateur):
+            resultats, lignes_rejet = traiter_bloc(bloc, executeur, parametres)
+            lignes_traitees += len(resultats)
+            if agregateur is not None:
+                agreger_bloc(agregateur, resultats)
+            elif len(resultats):
+                ecrivain.ecrire(resultats)
+            if len(lignes_rejet):
+                lignes_rejetees += len(lignes_rejet)
+                if ecrivain_rejets is not None:
+                    ecrivain_rejets.ecrire(lignes_rejet)
+        if agregateur is not None:
+            ecrivain.ecrire(pd.DataFrame(agregateur.resultat()))
+        elif ecrivain.lignes == 0:
+            # Aucune ligne valide : la sortie est créée avec le seul en-tête
+            ecrivain.ecrire(resultats if resultats is not None else pd.DataFrame())
+    finally:
+        ecrivain.fermer()
+        if ecrivain_rejets is not None:
+            ecrivain_rejets.fermer()
+        if executeur is not None:
+            executeur.fermer()
+
+    return {
+        "lignes_traitees": lignes_traitees,
+        "lignes_rejetees": lignes_rejetees,
+        "duree_s": time.perf_counter() - debut,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m simulation_impot",
+        description="Calcule brut → net → impôt pour un fichier CSV ou Parquet.",
+    )
+    parser.add_argument("entree", type=Path, help="Fichier d'entrée (.csv ou .parquet)")
+    parser.add_argument("sortie", type=Path, help="Fichier de résultats (.csv ou .parquet)")
+    parser.add_argument(
+        "--rejets",
+        type=Path,
+        default=None,
+        help="Fichier recevant les lignes invalides et le motif du rejet",
+    )
+    parser.add_argument(
+        "--taille-bloc",
+        type=int,
+        default=TAILLE_BLOC_DEFAUT,
+        help=f"Nombre de lignes lues par bloc (défaut : {TAILLE_BLOC_DEFAUT})",
+    )
+    parser.add_argument(
+        "--separateur", default=",", help="Séparateur des fichiers CSV (défaut : ,)"
+    )
+    parser.add_argument(
+        "--processus",
+        type=int,
+        default=1,
+        help="Nombre de processus de calcul (défaut : 1, sans parallélisme)",
+    )
+    parser.add_argument(
+        "--annee",
+        type=int,
+        default=ANNEE_PAR_DEFAUT,
+        choices=annees_disponibles(),
+        help=f"Année des règles de calcul (défaut : {ANNEE_PAR_DEFAUT})",
+    )
+    parser.add_argument(
+        "--agreger",
+        default=None,
+        help="Colonnes de regroupement séparées par des virgules (ex. centre,mois,cadre)",
+    )
+    args = parser.parse_args(argv)
+    if args.taille_bloc <= 0:
+        parser.error("--taille-bloc doit être strictement positif")
+
+    stats = executer(
+        args.entree,
+        args.sortie,
+        args.rejets,
+        taille_bloc=args.taille_bloc,
+        separateur=args.separateur,
+        processus=args.processus,
+        annee=args.annee,
+        agreger=args.agreger.split(",") if args.agreger else None,
+    )
+    print(
+        f"{stats['lignes_traitees']} lignes calculées, "
+        f"{stats['lignes_rejetees']} rejetées en {stats['duree_s']:.2f} s",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Capacité d'emprunt immobilier à partir du revenu net mensuel."""
+
+import numpy as np
+
+TAUX_ENDETTEMENT_MAX = 0.35  # Taux d'endettement maximal retenu par les banques
+TAUX_GRILLE = np.arange(10, 1001, 5) / 100  # Taux nominaux de 0,1 % à 10 % par pas de 0,05 %
+DUREES_GRILLE = np.arange(5, 31)  # Durées de 5 à 30 ans
+
+
+def capacite_emprunt(
+    revenu_total: float,
+    taux_emprunt: float,
+    duree_annees: int,
+    mensualite_existante: float = 0.0,
+    taux_endettement_max: float = TAUX_ENDETTEMENT_MAX,
+) -> tuple[float, float]:
+    """Renvoie la mensualité disponible et le capital maximal empruntable.
+
+    `taux_emprunt` est le taux nominal annuel exprimé en pourcentage.
+    """
+
+    capacite_mensuelle = revenu_total * taux_endettement_max - mensualite_existante
+    capacite_mensuelle = max(capacite_mensuelle, 0)
+
+    nb_mois = duree_annees * 12
+    taux_mensuel = taux_emprunt / 100 / 12
+
+    if taux_mensuel > 0:
+        capital_max = capacite_mensuelle * (1 - (1 + taux_mensuel) ** -nb_mois) / taux_mensuel
+    else:
+        capital_max = capacite_mensuelle * nb_mois
+
+    return capacite_mensuelle, capital_max
+
+
+def grille_capacite_emprunt(
+    revenu_total: float,
+    taux_emprunt=TAUX_GRILLE,
+    durees_annees=DUREES_GRILLE,
+    mensualite_existante: float = 0.0,
+    taux_endettement_max: float = TAUX_ENDETTEMENT_MAX,
+) -> dict[str, np.ndarray]:
+    """Capital maximal empruntable pour chaque taux × durée.
+
+    Même calcul que `capacite_emprunt`, diffusé en une expression sur la
+    matrice `(len(taux_emprunt), len(durees_annees))` renvoyée sous la clé
+    `capital_max`.
+    """
+
+    taux_emprunt = np.asarray(taux_emprunt, dtype=float).reshape(-1)
+    durees_annees = np.asarray(durees_annees).reshape(-1)
+    capacite_mensuelle = max(revenu_total * taux_endettement_max - mensualite_existante, 0)
+
+    nb_mois = durees_annees[None, :] * 12
+    taux_mensuel = (taux_emprunt / 100 / 12)[:, None]
+    positif = taux_mensuel > 0
+    # Le taux nul est remplacé par 1 dans la formule actuarielle, puis écarté par `where`
+    taux_calcul = np.where(positif, taux_mensuel, 1.0)
+    capital_max = capacite_mensuelle * np.where(
+        positif,
+        (1 - (1 + taux_calcul) ** -nb_mois) / taux_calcul,
+        nb_mois,
+    )
+    return {
+        "taux_emprunt": taux_emprunt,
+        "durees_annees": durees_annees,
+        "capacite_mensuelle": capacite_mensuelle,
+        "capital_max": capital_max,
+    }
@@ -0,0 +1,76 @@
+"""Lecture des colonnes d'entrée des fichiers de paie et de foyers.
+
+Partagé par le traitement par lots (`cli`) et les rapports en masse
+(`rapports`) : une même cellule est convertie de la même façon partout. Les
+fichiers CSV sont lus en texte ; chaque fonction renvoie les valeurs
+converties et le masque des cellules invalides, les cellules vides prenant
+la valeur par défaut quand la colonne en a une.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+MONTANTS_FOYER = {
+    "chiffre_affaire_autoentrepreneur": 0.0,
+    "nombre_parts": 1.0,
+    "aide_familiale": 0.0,
+    "frais_garde": 0.0,
+}
+OPTIONS_FOYER = {
+    "reduction_forfaitaire": False,
+    "est_couple": False,
+}
+
+VALEURS_VRAIES = {"1", "1.0", "true", "vrai", "oui", "yes", "o", "y"}
+VALEURS_FAUSSES = {"0", "0.0", "false", "faux", "non", "no", "n"}
+
+
+def valeurs_manquantes(serie: pd.Series) -> np.ndarray:
+    """Masque des cellules absentes ou vides."""
+
+    manquantes = serie.isna()
+    if not pd.api.types.is_numeric_dtype(serie.dtype):
+        manquantes |= serie.astype(str).str.strip() == ""
+    return manquantes.to_numpy(dtype=bool)
+
+
+def colonne_numerique(
+    bloc: pd.DataFrame, nom: str, defaut: Optional[float]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Convertit une colonne en flottants ; renvoie les valeurs et le masque invalide."""
+
+    n = len(bloc)
+    if nom not in bloc:
+        return np.full(n, np.nan if defaut is None else defaut), np.full(n, defaut is None)
+    serie = bloc[nom]
+    manquantes = valeurs_manquantes(serie)
+    valeurs = pd.to_numeric(serie, errors="coerce").to_numpy(
+        dtype=float, na_value=np.nan, copy=True
+    )
+    invalides = ~np.isfinite(valeurs) & ~manquantes
+    if defaut is None:
+        invalides |= manquantes
+    else:
+        valeurs[manquantes] = defaut
+    return valeurs, invalides
+
+
+def colonne_booleenne(
+    bloc: pd.DataFrame, nom: str, defaut: bool
+) -> tuple[np.ndarray, np.ndarray]:
+    """Convertit une colonne en booléens ; renvoie les valeurs et le masque invalide."""
+
+    n = len(bloc)
+    if nom not in bloc:
+        return np.full(n, defaut), np.zeros(n, dtype=bool)
+    serie = bloc[nom]
+    if serie.dtype == bool:
+        return serie.to_numpy(), np.zeros(n, dtype=bool)
+    manquantes = valeurs_manquantes(serie)
+    texte = serie.astype(str).str.strip().str.lower()
+    vraies = texte.isin(VALEURS_VRAIES).to_numpy()
+    fausses = texte.isin(VALEURS_FAUSSES).to_numpy()
+    valeurs = np.where(manquantes, defaut, vraies)
+    return valeurs, ~(vraies | fausses | manquantes)
@@ -0,0 +1,163 @@
+"""Export colonnaire des résultats : lots Arrow et fichiers Parquet.
+
+Les résultats vectorisés (`calcul_brut_net_mensuel_batch`,
+`calcul_impot_batch`) sont déjà des colonnes NumPy contiguës : les colonnes
+numériques sont confiées à Arrow sans copie, seuls les booléens (stockés par
+bits côté Arrow) et les colonnes d'un autre type que celui du schéma sont
+convertis. Les schémas sont fixes (ordre, types, non-nullité) et versionnés
+dans leurs métadonnées, pour un chargement direct dans un entrepôt.
+"""
+
+from typing import Iterable, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .impot import calcul_impot_batch
+from .parametres import PARAMETRES_DEFAUT, ParametresAnnuels
+from .salaire import CHAMPS_SALAIRE, calcul_brut_net_mensuel_batch
+
+VERSION_SCHEMA = "1"  # À incrémenter à chaque changement de colonnes ou de types
+TAILLE_LOT_ARROW = 262_144  # Lignes par lot Arrow (et par groupe de lignes Parquet)
+
+TYPES_IMPOT = {
+    "impot_final": pa.float64(),
+    "revenu_net_mensuel": pa.float64(),
+    "nombre_parts": pa.float64(),
+    "revenu_imposable": pa.float64(),
+    "revenu_imposable_apres_aide": pa.float64(),
+    "quotient_familial": pa.float64(),
+    "tranche": pa.int64(),
+    "impot_brut": pa.float64(),
+    "decote": pa.float64(),
+    "impot_apres_decote": pa.float64(),
+    "reduction_frais_garde": pa.float64(),
+}
+
+
+def _schema(champs: list[tuple[str, pa.DataType]]) -> pa.Schema:
+    return pa.schema(
+        [pa.field(nom, type_arrow, nullable=False) for nom, type_arrow in champs],
+        metadata={"simulation_impot.version_schema": VERSION_SCHEMA},
+    )
+
+
+SCHEMA_SALAIRE = _schema(
+    [("annee", pa.int16())] + [(champ, pa.float64()) for champ in CHAMPS_SALAIRE]
+)
+SCHEMA_IMPOT = _schema([("annee", pa.int16())] + list(TYPES_IMPOT.items()))
+# Chaîne brut → net → impôt : `nombre_parts` n'apparaît qu'une fois, côté impôt
+SCHEMA_RESULTATS = _schema(
+    [("annee", pa.int16())]
+    + [(champ, pa.float64()) for champ in CHAMPS_SALAIRE]
+    + list(TYPES_IMPOT.items())
+)
+
+
+def colonne_arrow(valeurs, type_arrow: pa.DataType) -> pa.Array:
+    """Tableau Arrow d'une colonne NumPy, sans copie si son type et sa disposition le permettent."""
+
+    valeurs = np.asarray(valeurs).reshape(-1)
+    if not pa.types.is_boolean(type_arrow):
+        valeurs = np.ascontiguousarray(valeurs, dtype=type_arrow.to_pandas_dtype())
+    return pa.array(valeurs, type=type_arrow)
+
+
+def lot_arrow(
+    colonnes: dict[str, np.ndarray],
+    schema: pa.Schema,
+    parametres: ParametresAnnuels = PARAMETRES_DEFAUT,
+) -> pa.RecordBatch:
+    """Lot Arrow de `schema` à partir de colonnes de résultats.
+
+    La colonne `annee` est celle de `parametres` ; les colonnes en trop sont
+    ignorées, les colonnes manquantes lèvent une `KeyError`.
+    """
+
+    n = len(np.ravel(next(iter(colonnes.values()))))
+    tableaux = [
+        colonne_arrow(
+            np.full(n, parametres.annee, dtype=np.int16)
+            if champ.name == "annee"
+            else colonnes[champ.name],
+            champ.type,
+        )
+        for champ in schema
+    ]
+    return pa.RecordBatch.from_arrays(tableaux, schema=schema)
+
+
+def lots_resultats(
+    brut_mensuel,
+    chiffre_affaire_autoentrepreneur=0.0,
+    nombre_parts=1.0,
+    reduction_forfaitaire=False,
+    aide_familiale=0.0,
+    frais_garde=0.0,
+    est_couple=False,
+    *,
+    parametres: ParametresAnnuels = PARAMETRES_DEFAUT,
+    taille_lot: int = TAILLE_LOT_ARROW,
+    **options,
+) -> Iterable[pa.RecordBatch]:
+    """Calcule la chaîne brut → net → impôt par lots et les rend au format `SCHEMA_RESULTATS`.
+
+    Le revenu salarial imposé est le net imposable annualisé ; les données du
+    foyer et les options salariales acceptent des scalaires ou des tableaux
+    de même longueur que `brut_mensuel`.
+    """
+
+    brut_mensuel = np.asarray(brut_mensuel, dtype=float).reshape(-1)
+    n = len(brut_mensuel)
+    foyer = {
+        "chiffre_affaire_autoentrepreneur": chiffre_affaire_autoentrepreneur,
+        "nombre_parts": nombre_parts,
+        "reduction_forfaitaire": reduction_forfaitaire,
+        "aide_familiale": aide_familiale,
+        "frais_garde": frais_garde,
+        "est_couple": est_couple,
+    }
+    par_ligne = {
+        nom: np.broadcast_to(valeur, n)
+        for nom, valeur in (foyer | options).items()
+        if np.ndim(valeur)
+    }
+
+    def tranche_de(nom, valeur, tranche):
+        return par_ligne[nom][tranche] if nom in par_ligne else valeur
+
+    for debut in range(0, n, taille_lot):
+        tranche = slice(debut, debut + taille_lot)
+        salaire = calcul_brut_net_mensuel_batch(
+            brut_mensuel[tranche],
+            parametres=parametres,
+            **{nom: tranche_de(nom, valeur, tranche) for nom, valeur in options.items()},
+        )
+        impot = calcul_impot_batch(
+            salaire["net_imposable"] * 12,
+            **{nom: tranche_de(nom, valeur, tranche) for nom, valeur in foyer.items()},
+            parametres=parametres,
+        )
+        yield lot_arrow(salaire | impot, SCHEMA_RESULTATS, parametres)
+
+
+def ecrire_parquet(
+    chemin,
+    lots: Iterable[pa.RecordBatch],
+    schema: pa.Schema = SCHEMA_RESULTATS,
+    *,
+    compression: Optional[str] = "zstd",
+) -> int:
+    """Écrit des lots Arrow dans un fichier Parquet de `schema` ; renvoie le nombre de lignes.
+
+    `chemin` est un chemin ou un fichier binaire ouvert. Chaque lot devient
+    un groupe de lignes ; un fichier sans lot contient tout de même le schéma.
+    """
+
+    lignes = 0
+    with pq.ParquetWriter(chemin, schema, compression=compression) as ecrivain:
+        for lot in lots:
+            ecrivain.write_batch(lot)
+            lignes += lot.num_rows
+    return lignes
@@ -0,0 +1,78 @@
+"""Lecture et écriture par blocs des fichiers CSV et Parquet.
+
+Utilisé par le traitement par lots, les rapports en masse et l'export des
+tableaux d'amortissement : un fichier est lu ou écrit bloc par bloc, sans
+jamais être chargé en entier.
+"""
+
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+
+TAILLE_BLOC_DEFAUT = 100_000  # Lignes lues par bloc
+
+
+def format_fichier(chemin: Path) -> str:
+    """`"parquet"` pour les extensions .parquet et .pq, `"csv"` sinon."""
+
+    return "parquet" if chemin.suffix.lower() in {".parquet", ".pq"} else "csv"
+
+
+def lire_blocs(
+    chemin: Path, taille_bloc: int, separateur: str = ","
+) -> Iterator[pd.DataFrame]:
+    """Itère sur le fichier d'entrée par blocs d'au plus `taille_bloc` lignes."""
+
+    if format_fichier(chemin) == "parquet":
+        import pyarrow.parquet as pq
+
+        fichier = pq.ParquetFile(chemin)
+        for lot in fichier.iter_batches(batch_size=taille_bloc):
+            yield lot.to_pandas()
+    else:
+        # Lecture en texte : la conversion (et le rejet) est faite ligne à ligne
+        with pd.read_csv(
+            chemin,
+            sep=separateur,
+            dtype=str,
+            keep_default_na=False,
+            chunksize=taille_bloc,
+        ) as lecteur:
+            yield from lecteur
+
+
+class EcrivainBlocs:
+    """Écrit des blocs successifs dans un même fichier CSV ou Parquet."""
+
+    def __init__(self, chemin: Path, separateur: str = ","):
+        self.chemin = chemin
+        self.separateur = separateur
+        self.format = format_fichier(chemin)
+        self.lignes = 0
+        self._fichier = None
+        self._parquet = None
+
+    def ecrire(self, bloc: pd.DataFrame) -> None:
+        if self.format == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(bloc, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.chemin, table.schema)
+            else:
+                table = table.cast(self._parquet.schema)
+            self._parquet.write_table(table)
+        else:
+            entete = self._fichier is None
+            if entete:
+                self._fichier = open(self.chemin, "w", encoding="utf-8", newline="")
+            bloc.to_csv(self._fichier, sep=self.separateur, header=entete, index=False)
+        self.lignes += len(bloc)
+
+    def fermer(self) -> None:
+        if self._parquet is not None:
+            self._parquet.close()
+        if self._fichier is not None:
+            self._fichier.close()
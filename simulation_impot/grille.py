@@ -0,0 +1,73 @@
+"""Balayage « et si » : net après impôt sur une grille brut × nombre de parts.
+
+La grille est calculée en une seule passe vectorisée : les bruts mensuels
+sont diffusés sur l'axe des parts (et éventuellement sur la situation de
+couple) à travers `calcul_brut_net_mensuel_batch` puis `calcul_impot_batch`.
+"""
+
+import numpy as np
+
+from .impot import calcul_impot_batch
+from .parametres import PARAMETRES_DEFAUT, ParametresAnnuels
+from .salaire import calcul_brut_net_mensuel_batch
+
+PAS_TAUX_MARGINAL = 1.0  # Euro de brut mensuel supplémentaire pour le taux marginal combiné
+
+
+def grille_net_apres_impot(
+    bruts_mensuels,
+    nombres_parts,
+    est_couple=False,
+    *,
+    chiffre_affaire_autoentrepreneur: float = 0.0,
+    reduction_forfaitaire: bool = False,
+    aide_familiale: float = 0.0,
+    frais_garde: float = 0.0,
+    parametres: ParametresAnnuels = PARAMETRES_DEFAUT,
+    pas_marginal: float = PAS_TAUX_MARGINAL,
+    **options,
+) -> dict[str, np.ndarray]:
+    """Net mensuel après impôt pour chaque brut mensuel × nombre de parts.
+
+    `est_couple` vaut un booléen ou une séquence de booléens ; dans ce second
+    cas, les tableaux de résultat ont un troisième axe. Le net après impôt est
+    le net à payer diminué de l'impôt annuel mensualisé ; le taux marginal
+    combiné est la part d'un euro de brut supplémentaire absorbée par les
+    cotisations, la CSG/CRDS et l'impôt.
+    """
+
+    bruts_mensuels = np.asarray(bruts_mensuels, dtype=float).reshape(-1)
+    nombres_parts = np.asarray(nombres_parts, dtype=float).reshape(-1)
+    couples = np.atleast_1d(np.asarray(est_couple, dtype=bool))
+
+    # Axe 0 : brut puis brut + pas, pour la différence finie du taux marginal
+    points = np.stack([bruts_mensuels, bruts_mensuels + pas_marginal])
+    salaire = calcul_brut_net_mensuel_batch(
+        points[:, :, None, None], parametres=parametres, **options
+    )
+    impot = calcul_impot_batch(
+        salaire["net_imposable"] * 12,
+        chiffre_affaire_autoentrepreneur,
+        nombres_parts[None, None, :, None],
+        reduction_forfaitaire,
+        aide_familiale,
+        frais_garde,
+        couples[None, None, None, :],
+        parametres=parametres,
+    )
+    net_apres_impot = salaire["net_a_payer"] - impot["impot_final"] / 12
+    taux_marginal = 1 - (net_apres_impot[1] - net_apres_impot[0]) / pas_marginal
+
+    resultat = {
+        "impot_final": impot["impot_final"][0],
+        "net_apres_impot_mensuel": net_apres_impot[0],
+        "taux_marginal_combine": taux_marginal,
+    }
+    if np.ndim(est_couple) == 0:
+        resultat = {nom: valeur[..., 0] for nom, valeur in resultat.items()}
+    return {
+        "bruts_mensuels": bruts_mensuels,
+        "nombres_parts": nombres_parts,
+        "net_a_payer": salaire["net_a_payer"][0, :, 0, 0],
+        **resultat,
+    }
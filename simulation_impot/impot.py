@@ -0,0 +1,149 @@
+"""Calcul de l'impôt sur le revenu d'un foyer (scalaire et vectorisé)."""
+
+import numpy as np
+
+from .parametres import PARAMETRES_DEFAUT, ParametresAnnuels
+
+
+# Fonction de calcul d'impôt : tranche et impôt lus sur le barème compilé (`BaremeCompile`)
+def calcul_impot(revenu_salarial, chiffre_affaire_autoentrepreneur,
+                 nombre_parts, reduction_forfaitaire=False,
+                 aide_familiale=0, frais_garde=0, est_couple=False,
+                 parametres: ParametresAnnuels = PARAMETRES_DEFAUT):
+    p = parametres
+    bareme = p.bareme_impot
+    if reduction_forfaitaire:
+        revenu_salarial_apres_reduction = revenu_salarial * p.coefficient_reduction_forfaitaire
+        reduction_salariale = revenu_salarial - revenu_salarial_apres_reduction
+    else:
+        revenu_salarial_apres_reduction = revenu_salarial
+        reduction_salariale = 0
+
+    revenu_autoentrepreneur = chiffre_affaire_autoentrepreneur * p.taux_revenu_autoentrepreneur
+    reduction_autoentrepreneur = chiffre_affaire_autoentrepreneur * p.taux_abattement_autoentrepreneur
+
+    revenu_imposable = revenu_salarial_apres_reduction + revenu_autoentrepreneur
+    revenu_imposable_apres_aide = revenu_imposable - aide_familiale
+    quotient_familial = revenu_imposable_apres_aide / nombre_parts
+
+    indice_tranche = bareme.indice_tranche(quotient_familial)
+    impot_quotient = bareme.impot(quotient_familial, indice_tranche)
+    details_tranches = [
+        f"Tranche {bas}€ à {haut}€ : {(haut - bas) * taux:.2f} €"
+        for bas, haut, taux in bareme.tranches[:indice_tranche]
+    ]
+    bas, _, taux = bareme.tranches[indice_tranche]
+    details_tranches.append(
+        f"Tranche {bas}€ à {quotient_familial:.2f}€ : {(quotient_familial - bas) * taux:.2f} €"
+    )
+
+    impot_total = impot_quotient * nombre_parts
+
+    if est_couple:
+        decote = max(0, p.decote_couple - p.taux_decote * impot_total)
+    else:
+        decote = max(0, p.decote_seul - p.taux_decote * impot_total)
+
+    impot_apres_decote = max(0, impot_total - decote)
+    reduction_frais_garde = frais_garde * p.taux_reduction_frais_garde
+    impot_final = max(0, impot_apres_decote - reduction_frais_garde)
+
+    revenu_net_annuel = revenu_imposable_apres_aide - impot_final
+    revenu_net_mensuel = revenu_net_annuel / 12
+
+    return {
+        "impot_final": impot_final,
+        "revenu_net_mensuel": revenu_net_mensuel,
+        "nombre_parts": nombre_parts,
+        "details": {
+            "Revenu salarial initial": revenu_salarial,
+            "Réduction salariale forfaitaire (10%)": reduction_salariale,
+            "Revenu (chiffre d'affaire) auto-entrepreneur ": chiffre_affaire_autoentrepreneur,
+            "Réduction auto-entrepreneur (34%)": reduction_autoentrepreneur,
+            "Revenu imposable annuel total": revenu_imposable,
+            "Déduction pour aides et dons": aide_familiale,
+            "Revenu imposable annuel après aides": revenu_imposable_apres_aide,
+            "Impôt brut avant décote": impot_total,
+            "Décote": decote,
+            "Impôt après décote": impot_apres_decote,
+            "Réduction frais de garde (50%)": reduction_frais_garde,
+        },
+        "details_tranches": details_tranches
+    }
+
+
+def calcul_impot_batch(
+    revenu_salarial,
+    chiffre_affaire_autoentrepreneur,
+    nombre_parts,
+    reduction_forfaitaire=False,
+    aide_familiale=0,
+    frais_garde=0,
+    est_couple=False,
+    parametres: ParametresAnnuels = PARAMETRES_DEFAUT,
+) -> dict[str, np.ndarray]:
+    """Version vectorisée de `calcul_impot` pour des fichiers de foyers.
+
+    Les arguments acceptent des scalaires ou des tableaux diffusables entre eux.
+    La tranche de chaque quotient est trouvée par `searchsorted` sur les bornes
+    du barème de `parametres` ; le résultat est un dictionnaire de colonnes (une valeur par
+    foyer), sans le détail textuel des tranches.
+    """
+
+    (
+        revenu_salarial,
+        chiffre_affaire_autoentrepreneur,
+        nombre_parts,
+        reduction_forfaitaire,
+        aide_familiale,
+        frais_garde,
+        est_couple,
+    ) = np.broadcast_arrays(
+        np.asarray(revenu_salarial, dtype=float),
+        np.asarray(chiffre_affaire_autoentrepreneur, dtype=float),
+        np.asarray(nombre_parts, dtype=float),
+        np.asarray(reduction_forfaitaire, dtype=bool),
+        np.asarray(aide_familiale, dtype=float),
+        np.asarray(frais_garde, dtype=float),
+        np.asarray(est_couple, dtype=bool),
+    )
+
+    p = parametres
+    revenu_salarial_apres_reduction = np.where(
+        reduction_forfaitaire,
+        revenu_salarial * p.coefficient_reduction_forfaitaire,
+        revenu_salarial,
+    )
+    revenu_autoentrepreneur = chiffre_affaire_autoentrepreneur * p.taux_revenu_autoentrepreneur
+
+    revenu_imposable = revenu_salarial_apres_reduction + revenu_autoentrepreneur
+    revenu_imposable_apres_aide = revenu_imposable - aide_familiale
+    quotient_familial = revenu_imposable_apres_aide / nombre_parts
+
+    tranche = p.bareme_impot.indice_tranche(quotient_familial)
+    impot_quotient = p.bareme_impot.impot(quotient_familial, tranche)
+    impot_total = impot_quotient * nombre_parts
+
+    decote = np.maximum(
+        0, np.where(est_couple, p.decote_couple, p.decote_seul) - p.taux_decote * impot_total
+    )
+    impot_apres_decote = np.maximum(0, impot_total - decote)
+    reduction_frais_garde = frais_garde * p.taux_reduction_frais_garde
+    impot_final = np.maximum(0, impot_apres_decote - reduction_frais_garde)
+
+    revenu_net_annuel = revenu_imposable_apres_aide - impot_final
+    revenu_net_mensuel = revenu_net_annuel / 12
+
+    return {
+        "impot_final": impot_final,
+        "revenu_net_mensuel": revenu_net_mensuel,
+        "nombre_parts": nombre_parts,
+        "revenu_imposable": revenu_imposable,
+        "revenu_imposable_apres_aide": revenu_imposable_apres_aide,
+        "quotient_familial": quotient_familial,
+        "tranche": tranche,
+        "impot_brut": impot_total,
+        "decote": decote,
+        "impot_apres_decote": impot_apres_decote,
+        "reduction_frais_garde": reduction_frais_garde,
+    }
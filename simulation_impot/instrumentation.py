@@ -0,0 +1,177 @@
+"""Latences des pages et de leurs étapes, exportées au format texte Prometheus.
+
+Une page est chronométrée du début à la fin (étape `total`) et découpée en
+étapes par des marques successives : `etape("calcul")` attribue à l'étape
+`calcul` le temps écoulé depuis la marque précédente. Les durées d'une même
+étape sont cumulées sur l'exécution de la page, puis versées une fois dans
+son histogramme. Un registre inactif ne fait qu'un test d'attribut par
+marque : les crochets peuvent rester en place en production.
+"""
+
+import bisect
+import os
+import tempfile
+import threading
+import time
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+BORNES_LATENCE_S = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+NOM_METRIQUE = "simulation_impot_latence_secondes"
+VARIABLE_PORT = "SIMULATION_IMPOT_METRIQUES_PORT"  # Port local de l'endpoint /metrics
+VARIABLE_FICHIER = "SIMULATION_IMPOT_METRIQUES_FICHIER"  # Fichier réécrit après chaque page
+TYPE_CONTENU_PROMETHEUS = "text/plain; version=0.0.4; charset=utf-8"
+
+_INACTIF = nullcontext()
+
+
+def _etiquette(valeur: str) -> str:
+    return valeur.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Chronometre:
+    """Exécution d'une page : cumul du temps passé dans chaque étape."""
+
+    __slots__ = ("registre", "page", "debut", "marque", "cumuls")
+
+    def __init__(self, registre: "RegistreLatences", page: str):
+        self.registre = registre
+        self.page = page
+        self.debut = self.marque = time.perf_counter()
+        self.cumuls = {}
+
+    def etape(self, nom: str) -> None:
+        instant = time.perf_counter()
+        self.cumuls[nom] = self.cumuls.get(nom, 0.0) + instant - self.marque
+        self.marque = instant
+
+    def __enter__(self) -> "Chronometre":
+        self.registre._local.chronometre = self
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.registre._local.chronometre = None
+        fin = time.perf_counter()
+        for nom, duree in self.cumuls.items():
+            self.registre.enregistrer(self.page, nom, duree)
+        self.registre.enregistrer(self.page, "total", fin - self.debut)
+        if self.registre.fichier:
+            self.registre.ecrire(self.registre.fichier)
+
+
+class RegistreLatences:
+    """Histogrammes de latence par page et par étape, partagés entre sessions."""
+
+    def __init__(
+        self,
+        bornes: tuple = BORNES_LATENCE_S,
+        actif: bool = False,
+        fichier: Optional[str] = None,
+    ):
+        self.bornes = tuple(sorted(bornes))
+        self.actif = actif
+        self.fichier = fichier  # Réécrit à la fin de chaque page chronométrée
+        self._verrou = threading.Lock()
+        self._local = threading.local()  # Chronomètre de la page en cours, par thread
+        # (page, étape) -> [comptes par intervalle (+Inf en dernier), somme, nombre]
+        self._histogrammes = {}
+
+    def page(self, nom: str):
+        """Contexte chronométrant une exécution de la page `nom` (sans effet si inactif)."""
+
+        if not self.actif:
+            return _INACTIF
+        return Chronometre(self, nom)
+
+    def etape(self, nom: str) -> None:
+        """Attribue à l'étape `nom` le temps écoulé depuis la marque précédente de la page."""
+
+        if not self.actif:
+            return
+        chronometre = getattr(self._local, "chronometre", None)
+        if chronometre is not None:
+            chronometre.etape(nom)
+
+    def enregistrer(self, page: str, etape: str, duree_s: float) -> None:
+        indice = bisect.bisect_left(self.bornes, duree_s)
+        with self._verrou:
+            histogramme = self._histogrammes.get((page, etape))
+            if histogramme is None:
+                histogramme = self._histogrammes[(page, etape)] = [
+                    [0] * (len(self.bornes) + 1),
+                    0.0,
+                    0,
+                ]
+            histogramme[0][indice] += 1
+            histogramme[1] += duree_s
+            histogramme[2] += 1
+
+    def texte_prometheus(self) -> str:
+        """Histogrammes au format d'exposition texte de Prometheus (intervalles cumulés)."""
+
+        with self._verrou:
+            histogrammes = {
+                cle: (list(comptes), somme, nombre)
+                for cle, (comptes, somme, nombre) in self._histogrammes.items()
+            }
+        lignes = [
+            f"# HELP {NOM_METRIQUE} Durée des pages de l'application et de leurs étapes.",
+            f"# TYPE {NOM_METRIQUE} histogram",
+        ]
+        bornes = [repr(borne) for borne in self.bornes] + ["+Inf"]
+        for (page, etape), (comptes, somme, nombre) in sorted(histogrammes.items()):
+            etiquettes = f'page="{_etiquette(page)}",etape="{_etiquette(etape)}"'
+            cumul = 0
+            for borne, compte in zip(bornes, comptes):
+                cumul += compte
+                lignes.append(f'{NOM_METRIQUE}_bucket{{{etiquettes},le="{borne}"}} {cumul}')
+            lignes.append(f"{NOM_METRIQUE}_sum{{{etiquettes}}} {somme!r}")
+            lignes.append(f"{NOM_METRIQUE}_count{{{etiquettes}}} {nombre}")
+        return "\n".join(lignes) + "\n"
+
+    def ecrire(self, chemin) -> None:
+        """Réécrit `chemin` d'un bloc (fichier temporaire puis renommage), pour un collecteur de fichiers."""
+
+        dossier = os.path.dirname(os.path.abspath(chemin))
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=dossier, suffix=".tmp", delete=False
+        ) as fichier:
+            fichier.write(self.texte_prometheus())
+        os.replace(fichier.name, chemin)
+
+    def servir(self, port: int, hote: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Expose `/metrics` sur `hote:port` depuis un thread de fond ; renvoie le serveur."""
+
+        registre = self
+
+        class Gestionnaire(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                corps = registre.texte_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", TYPE_CONTENU_PROMETHEUS)
+                self.send_header("Content-Length", str(len(corps)))
+                self.end_headers()
+                self.wfile.write(corps)
+
+            def log_message(self, format, *args):
+                pass
+
+        serveur = ThreadingHTTPServer((hote, port), Gestionnaire)
+        serveur.daemon_threads = True
+        threading.Thread(target=serveur.serve_forever, name="metriques", daemon=True).start()
+        return serveur
+
+
+def registre_depuis_environnement(environ=os.environ) -> RegistreLatences:
+    """Registre actif si `VARIABLE_PORT` ou `VARIABLE_FICHIER` est défini, inactif sinon."""
+
+    port = environ.get(VARIABLE_PORT)
+    fichier = environ.get(VARIABLE_FICHIER) or None
+    registre = RegistreLatences(actif=bool(port or fichier), fichier=fichier)
+    if port:
+        registre.servir(int(port))
+    return registre
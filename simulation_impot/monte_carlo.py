@@ -0,0 +1,115 @@
+"""Mode Monte Carlo : incertitude sur le chiffre d'affaires auto-entrepreneur.
+
+Les chiffres d'affaires annuels sont tirés par un générateur NumPy initialisé
+par une graine (loi log-normale de moyenne et d'écart-type donnés, ou
+rééchantillonnage d'un historique mensuel), puis tous les scénarios passent en
+une fois dans `calcul_impot_batch`. Au-delà de `SEUIL_PARALLELE_MONTE_CARLO`
+scénarios, le calcul est réparti par un `ExecuteurParallele` s'il est fourni ;
+les tirages restent faits dans le processus appelant, si bien que le résultat
+ne dépend pas du nombre de workers.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .impot import calcul_impot_batch
+from .parallele import ExecuteurParallele
+from .parametres import PARAMETRES_DEFAUT, ParametresAnnuels
+
+NB_SCENARIOS_DEFAUT = 100_000
+SEUIL_PARALLELE_MONTE_CARLO = 500_000  # En dessous, le calcul direct est plus rapide que le pool
+CENTILES_DEFAUT = (5, 10, 25, 50, 75, 90, 95)
+MOIS_PAR_AN = 12
+
+
+def tirer_chiffres_affaires(
+    nb_scenarios: int = NB_SCENARIOS_DEFAUT,
+    *,
+    moyenne: Optional[float] = None,
+    ecart_type: float = 0.0,
+    historique_mensuel: Optional[Sequence[float]] = None,
+    graine: Optional[int] = None,
+) -> np.ndarray:
+    """Tire `nb_scenarios` chiffres d'affaires annuels.
+
+    Avec `historique_mensuel`, chaque année est la somme de douze mois tirés
+    avec remise dans l'historique ; sinon le chiffre d'affaires suit une loi
+    log-normale (toujours positive) de `moyenne` et `ecart_type` annuels.
+    """
+
+    if nb_scenarios <= 0:
+        raise ValueError("Le nombre de scénarios doit être strictement positif")
+    generateur = np.random.default_rng(graine)
+
+    if historique_mensuel is not None:
+        historique = np.asarray(historique_mensuel, dtype=float).reshape(-1)
+        if len(historique) == 0:
+            raise ValueError("L'historique mensuel est vide")
+        if (historique < 0).any():
+            raise ValueError("L'historique mensuel contient des montants négatifs")
+        mois = generateur.integers(0, len(historique), size=(nb_scenarios, MOIS_PAR_AN))
+        return historique[mois].sum(axis=1)
+
+    if moyenne is None:
+        raise ValueError("Indiquez une moyenne ou un historique mensuel")
+    if moyenne < 0 or ecart_type < 0:
+        raise ValueError("La moyenne et l'écart-type doivent être positifs")
+    if moyenne == 0 or ecart_type == 0:
+        return np.full(nb_scenarios, float(moyenne))
+    # Paramètres de la loi normale sous-jacente donnant la moyenne et l'écart-type voulus
+    sigma2 = np.log1p((ecart_type / moyenne) ** 2)
+    mu = np.log(moyenne) - sigma2 / 2
+    return generateur.lognormal(mu, np.sqrt(sigma2), size=nb_scenarios)
+
+
+def simuler_scenarios(
+    revenu_salarial,
+    chiffres_affaires,
+    nombre_parts,
+    reduction_forfaitaire=False,
+    aide_familiale=0,
+    frais_garde=0,
+    est_couple=False,
+    *,
+    parametres: ParametresAnnuels = PARAMETRES_DEFAUT,
+    executeur: Optional[ExecuteurParallele] = None,
+    seuil_parallele: int = SEUIL_PARALLELE_MONTE_CARLO,
+) -> dict[str, np.ndarray]:
+    """Calcule l'impôt de chaque scénario de chiffre d'affaires.
+
+    Les autres données du foyer sont diffusées sur tous les scénarios ; le
+    résultat est celui de `calcul_impot_batch`, complété de la colonne
+    `chiffre_affaire_autoentrepreneur`.
+    """
+
+    chiffres_affaires = np.asarray(chiffres_affaires, dtype=float).reshape(-1)
+    arguments = (
+        revenu_salarial,
+        chiffres_affaires,
+        nombre_parts,
+        reduction_forfaitaire,
+        aide_familiale,
+        frais_garde,
+        est_couple,
+    )
+    if executeur is not None and len(chiffres_affaires) >= seuil_parallele:
+        resultat = executeur.impot(*arguments, parametres=parametres)
+    else:
+        resultat = calcul_impot_batch(*arguments, parametres=parametres)
+    return {"chiffre_affaire_autoentrepreneur": chiffres_affaires, **resultat}
+
+
+def centiles_scenarios(
+    resultat: dict[str, np.ndarray],
+    champs: Sequence[str] = ("impot_final", "revenu_net_mensuel"),
+    centiles: Sequence[float] = CENTILES_DEFAUT,
+) -> dict[str, np.ndarray]:
+    """Centiles et moyenne de chaque champ sur l'ensemble des scénarios."""
+
+    resume = {"centiles": np.asarray(centiles, dtype=float)}
+    for champ in champs:
+        colonne = resultat[champ]
+        resume[champ] = np.percentile(colonne, centiles)
+        resume[f"moyenne_{champ}"] = float(colonne.mean())
+    return resume
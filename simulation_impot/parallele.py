@@ -0,0 +1,321 @@
+"""Exécution multi-cœurs par blocs des calculs vectorisés.
+
+Les entrées sont recopiées une fois dans un segment de mémoire partagée, puis
+découpées en blocs confiés à un pool de processus préchauffé. Chaque worker
+écrit ses résultats directement à leur place dans un segment partagé par
+colonne de sortie : aucun tableau ni DataFrame ne transite par pickle et
+l'ordre des lignes est celui de l'entrée, quel que soit l'ordre d'achèvement
+des blocs. Les colonnes sont ensuite recopiées une à une dans des tableaux
+appartenant à l'appelant, chaque segment étant libéré dès sa copie faite.
+
+En mode `"threads"`, les blocs sont calculés dans un pool de threads (NumPy
+relâche le GIL dans ses boucles) et écrits directement dans les tableaux de
+sortie, sans mémoire partagée.
+"""
+
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+from .impot import calcul_impot_batch
+from .parametres import PARAMETRES_DEFAUT, ParametresAnnuels
+from .salaire import calcul_brut_net_mensuel_batch
+
+TAILLE_BLOC_PARALLELE = 262_144  # Lignes par tâche confiée à un worker
+# Jamais de fork d'un processus multithreadé (serveur Streamlit) : les workers
+# partent d'un serveur de fork vierge, ou d'un interpréteur neuf à défaut
+METHODE_DEMARRAGE = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+_FONCTIONS = {
+    "brut_net": calcul_brut_net_mensuel_batch,
+    "impot": calcul_impot_batch,
+}
+
+
+def _disposition(types: dict[str, np.dtype], n: int) -> tuple[list, int]:
+    """Place des colonnes de longueur `n` bout à bout (alignées sur 8 octets)."""
+
+    disposition, decalage = [], 0
+    for nom, dtype in types.items():
+        dtype = np.dtype(dtype)
+        disposition.append((nom, dtype.str, decalage))
+        decalage += -(-n * dtype.itemsize // 8) * 8
+    return disposition, max(decalage, 1)
+
+
+def _vues(tampon, disposition: list, n: int) -> dict[str, np.ndarray]:
+    return {
+        nom: np.ndarray((n,), dtype=dtype, buffer=tampon, offset=decalage)
+        for nom, dtype, decalage in disposition
+    }
+
+
+def _ecrire_colonnes(tampon, disposition: list, colonnes: dict[str, np.ndarray]) -> None:
+    n = len(next(iter(colonnes.values())))
+    for nom, vue in _vues(tampon, disposition, n).items():
+        vue[:] = colonnes[nom]
+
+
+def _types_sortie(nom_fonction: str, types_entree: dict[str, np.dtype]) -> dict[str, np.dtype]:
+    """Déduit les colonnes produites en appelant la fonction sur des entrées vides."""
+
+    vides = {nom: np.empty(0, dtype=dtype) for nom, dtype in types_entree.items()}
+    return {nom: col.dtype for nom, col in _FONCTIONS[nom_fonction](**vides).items()}
+
+
+def _prechauffer() -> None:
+    """Initialise un worker : imports et premiers appels hors du chemin critique."""
+
+    calcul_brut_net_mensuel_batch(np.zeros(1))
+    calcul_impot_batch(np.zeros(1), np.zeros(1), np.ones(1))
+
+
+def _attacher(nom: str) -> shared_memory.SharedMemory:
+    """Ouvre dans un worker un segment créé (et détruit) par le processus parent."""
+
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=nom, track=False)
+    # Les workers (forkserver ou spawn) partagent le resource_tracker du parent :
+    # l'enregistrement du segment y est déjà, seul `unlink` du parent le retire
+    return shared_memory.SharedMemory(name=nom)
+
+
+def _liberer(segment: shared_memory.SharedMemory) -> None:
+    segment.close()
+    segment.unlink()
+
+
+def _calculer_bloc(
+    nom_fonction: str,
+    nom_entree: str,
+    disposition_entree: list,
+    segments_sortie: list[tuple[str, str, str]],
+    n: int,
+    debut: int,
+    fin: int,
+    parametres: ParametresAnnuels,
+) -> None:
+    """Tâche d'un worker : calcule les lignes `[debut, fin)` en mémoire partagée."""
+
+    entree = _attacher(nom_entree)
+    sorties = {nom: _attacher(segment) for nom, _, segment in segments_sortie}
+    try:
+        _calculer_tranche(
+            nom_fonction,
+            _vues(entree.buf, disposition_entree, n),
+            {
+                nom: np.ndarray((n,), dtype=dtype, buffer=sorties[nom].buf)
+                for nom, dtype, _ in segments_sortie
+            },
+            debut,
+            fin,
+            parametres,
+        )
+    finally:
+        entree.close()
+        for segment in sorties.values():
+            segment.close()
+
+
+def _calculer_tranche(
+    nom_fonction: str,
+    entrees: dict[str, np.ndarray],
+    sorties: dict[str, np.ndarray],
+    debut: int,
+    fin: int,
+    parametres: ParametresAnnuels,
+) -> None:
+    resultat = _FONCTIONS[nom_fonction](
+        **{nom: col[debut:fin] for nom, col in entrees.items()}, parametres=parametres
+    )
+    for nom, col in sorties.items():
+        col[debut:fin] = resultat[nom]
+
+
+class ExecuteurParallele:
+    """Pool préchauffé exécutant les calculs par lots sur plusieurs cœurs.
+
+    S'utilise comme gestionnaire de contexte ; `mode` vaut `"processus"`
+    (défaut) ou `"threads"`.
+    """
+
+    def __init__(
+        self,
+        nb_workers: Optional[int] = None,
+        *,
+        mode: str = "processus",
+        taille_bloc: int = TAILLE_BLOC_PARALLELE,
+    ):
+        if mode not in ("processus", "threads"):
+            raise ValueError(f"Mode d'exécution inconnu : {mode!r}")
+        self.nb_workers = nb_workers or os.cpu_count() or 1
+        self.mode = mode
+        self.taille_bloc = taille_bloc
+        if mode == "processus":
+            self._pool = ProcessPoolExecutor(
+                self.nb_workers,
+                mp_context=multiprocessing.get_context(METHODE_DEMARRAGE),
+                initializer=_prechauffer,
+            )
+            # Démarre tous les workers dès maintenant plutôt qu'au premier calcul
+            for tache in [self._pool.submit(os.getpid) for _ in range(self.nb_workers)]:
+                tache.result()
+        else:
+            self._pool = ThreadPoolExecutor(self.nb_workers)
+
+    def __enter__(self) -> "ExecuteurParallele":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fermer()
+
+    def fermer(self) -> None:
+        self._pool.shutdown()
+
+    def brut_net(
+        self,
+        brut_mensuel,
+        *,
+        parametres: ParametresAnnuels = PARAMETRES_DEFAUT,
+        **options,
+    ) -> dict[str, np.ndarray]:
+        """Équivalent parallèle de `calcul_brut_net_mensuel_batch`."""
+
+        return self._executer(
+            "brut_net",
+            {"brut_mensuel": (brut_mensuel, float)}
+            | {nom: (valeur, bool) for nom, valeur in options.items()},
+            parametres,
+        )
+
+    def impot(
+        self,
+        revenu_salarial,
+        chiffre_affaire_autoentrepreneur,
+        nombre_parts,
+        reduction_forfaitaire=False,
+        aide_familiale=0,
+        frais_garde=0,
+        est_couple=False,
+        parametres: ParametresAnnuels = PARAMETRES_DEFAUT,
+    ) -> dict[str, np.ndarray]:
+        """Équivalent parallèle de `calcul_impot_batch`."""
+
+        return self._executer(
+            "impot",
+            {
+                "revenu_salarial": (revenu_salarial, float),
+                "chiffre_affaire_autoentrepreneur": (chiffre_affaire_autoentrepreneur, float),
+                "nombre_parts": (nombre_parts, float),
+                "reduction_forfaitaire": (reduction_forfaitaire, bool),
+                "aide_familiale": (aide_familiale, float),
+                "frais_garde": (frais_garde, float),
+                "est_couple": (est_couple, bool),
+            },
+            parametres,
+        )
+
+    def _executer(
+        self, nom_fonction: str, arguments: dict, parametres: ParametresAnnuels
+    ) -> dict[str, np.ndarray]:
+        noms = list(arguments)
+        colonnes = np.broadcast_arrays(
+            *(np.asarray(valeur, dtype=dtype) for valeur, dtype in arguments.values())
+        )
+        forme = colonnes[0].shape
+        n = colonnes[0].size
+        entrees = {nom: np.ravel(col) for nom, col in zip(noms, colonnes)}
+        types_sortie = _types_sortie(
+            nom_fonction, {nom: col.dtype for nom, col in entrees.items()}
+        )
+        bornes = [
+            (debut, min(debut + self.taille_bloc, n))
+            for debut in range(0, n, self.taille_bloc)
+        ]
+
+        if self.mode == "threads" or n == 0:
+            sorties = {nom: np.empty(n, dtype=dtype) for nom, dtype in types_sortie.items()}
+            list(
+                self._pool.map(
+                    lambda borne: _calculer_tranche(
+                        nom_fonction, entrees, sorties, *borne, parametres
+                    ),
+                    bornes,
+                )
+            )
+        else:
+            sorties = self._executer_processus(
+                nom_fonction, entrees, types_sortie, n, bornes, parametres
+            )
+        return {nom: col.reshape(forme) for nom, col in sorties.items()}
+
+    def _executer_processus(
+        self,
+        nom_fonction: str,
+        entrees: dict[str, np.ndarray],
+        types_sortie: dict[str, np.dtype],
+        n: int,
+        bornes: list[tuple[int, int]],
+        parametres: ParametresAnnuels,
+    ) -> dict[str, np.ndarray]:
+        """Répartit les blocs entre les processus ; renvoie les colonnes de sortie."""
+
+        disposition_entree, taille_entree = _disposition(
+            {nom: col.dtype for nom, col in entrees.items()}, n
+        )
+        segments = {}
+        taches = []
+        try:
+            segment_entree = segments[None] = shared_memory.SharedMemory(
+                create=True, size=taille_entree
+            )
+            for nom, dtype in types_sortie.items():
+                segments[nom] = shared_memory.SharedMemory(
+                    create=True, size=max(n * np.dtype(dtype).itemsize, 1)
+                )
+            _ecrire_colonnes(segment_entree.buf, disposition_entree, entrees)
+            segments_sortie = [
+                (nom, np.dtype(dtype).str, segments[nom].name)
+                for nom, dtype in types_sortie.items()
+            ]
+            taches = [
+                self._pool.submit(
+                    _calculer_bloc,
+                    nom_fonction,
+                    segment_entree.name,
+                    disposition_entree,
+                    segments_sortie,
+                    n,
+                    debut,
+                    fin,
+                    parametres,
+                )
+                for debut, fin in bornes
+            ]
+            for tache in taches:
+                tache.result()
+            _liberer(segments.pop(None))
+            # Copie colonne par colonne : chaque segment est libéré dès sa copie,
+            # le pic mémoire ne dépasse les segments que d'une colonne
+            sorties = {}
+            for nom, dtype in types_sortie.items():
+                segment = segments.pop(nom)
+                sorties[nom] = np.ndarray((n,), dtype=dtype, buffer=segment.buf).copy()
+                _liberer(segment)
+            return sorties
+        finally:
+            # Sur échec d'un bloc, aucun segment n'est détruit tant qu'un autre
+            # worker peut encore y écrire
+            for tache in taches:
+                tache.cancel()
+            wait(taches)
+            for segment in segments.values():
+                _liberer(segment)
+
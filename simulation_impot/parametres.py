@@ -0,0 +1,209 @@
+"""Jeux de paramètres annuels : plafonds, taux de cotisations et barèmes.
+
+Chaque année est décrite par un fichier `donnees/parametres_<année>.json`,
+chargé une seule fois dans un registre. Un jeu chargé est immuable et déjà
+compilé : barèmes de l'impôt, vecteur des plafonds et matrice des taux par
+ligne de cotisation, directement utilisables par les moteurs vectorisés.
+"""
+
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .bareme import BaremeCompile
+
+DOSSIER_DONNEES = Path(__file__).with_name("donnees")
+ANNEE_PAR_DEFAUT = 2025
+
+# Lignes de cotisation proportionnelles, dans l'ordre de calcul :
+# (champ de ResultatSalaire, assiette, option, taux si l'option est fausse, taux si elle est vraie).
+# Sans option, le taux est le même dans les deux cas ; `None` désigne un taux nul.
+LIGNES_COTISATIONS = (
+    # Part salariale
+    ("vieillesse_plafonnee", "T1", None, "taux_vieil_plaf_sal", "taux_vieil_plaf_sal"),
+    ("vieillesse_deplafonnee", "brut", None, "taux_vieil_deplaf_sal", "taux_vieil_deplaf_sal"),
+    ("maladie_salarie", "brut", "alsace_moselle", None, "taux_maladie_sal_am"),
+    ("agirc_arrco_T1", "T1", None, "taux_aa_t1_sal", "taux_aa_t1_sal"),
+    ("agirc_arrco_T2", "T2", None, "taux_aa_t2_sal", "taux_aa_t2_sal"),
+    ("ceg_T1", "T1", None, "taux_ceg_t1_sal", "taux_ceg_t1_sal"),
+    ("ceg_T2", "T2", None, "taux_ceg_t2_sal", "taux_ceg_t2_sal"),
+    ("cet", "T1_T2_au_dela_pmss", None, "taux_cet_sal", "taux_cet_sal"),
+    ("apec", "apec", "cadre", None, "taux_apec_sal"),
+    ("csg_deductible", "csg", None, "taux_csg_ded", "taux_csg_ded"),
+    ("csg_non_deductible", "csg", None, "taux_csg_nded", "taux_csg_nded"),
+    ("crds", "csg", None, "taux_crds", "taux_crds"),
+    # Part employeur
+    ("maladie_employeur", "brut", "sup_2p5_smic", "taux_maladie_emp_inf_2p5", "taux_maladie_emp_sup_2p5"),
+    ("vieillesse_plaf_emp", "T1", None, "taux_vieil_plaf_emp", "taux_vieil_plaf_emp"),
+    ("vieillesse_deplaf_emp", "brut", None, "taux_vieil_deplaf_emp", "taux_vieil_deplaf_emp"),
+    ("aa_T1_emp", "T1", None, "taux_aa_t1_emp", "taux_aa_t1_emp"),
+    ("aa_T2_emp", "T2", None, "taux_aa_t2_emp", "taux_aa_t2_emp"),
+    ("ceg_T1_emp", "T1", None, "taux_ceg_t1_emp", "taux_ceg_t1_emp"),
+    ("ceg_T2_emp", "T2", None, "taux_ceg_t2_emp", "taux_ceg_t2_emp"),
+    ("cet_emp", "T1_T2_au_dela_pmss", None, "taux_cet_emp", "taux_cet_emp"),
+    ("apec_emp", "apec", "cadre", None, "taux_apec_emp"),
+    ("allocations_familiales", "brut", "sup_3p5_smic", "taux_af_emp_inf_3p5", "taux_af_emp_sup_3p5"),
+    ("chomage", "brut", "chomage_apres_mai_2025", "taux_chomage_emp_avant_mai", "taux_chomage_emp_apres_mai"),
+    ("ags", "brut", None, "taux_ags_emp", "taux_ags_emp"),
+    ("fnal", "brut", "effectif_50plus", "taux_fnal_moins_50", "taux_fnal_50_plus"),
+    ("csa", "brut", None, "taux_csa_emp", "taux_csa_emp"),
+)
+# Options dont dépend au moins une ligne ; l'option k est le bit k d'une combinaison
+OPTIONS_LIGNES = tuple(dict.fromkeys(option for _, _, option, _, _ in LIGNES_COTISATIONS if option))
+
+
+@dataclass(frozen=True, eq=False)
+class ParametresAnnuels:
+    """Paramètres d'une année de calcul (brut → net cadre et impôt sur le revenu)."""
+
+    annee: int
+
+    # Plafonds de la Sécurité sociale
+    pmss: float                 # Plafond Mensuel Sécurité sociale (PASS mensuel)
+    pass_annuel: float          # PASS annuel
+    aa_t2_max: float            # Limite supérieure Agirc-Arrco Tranche 2 (8 PMSS)
+    apec_plafond: float         # Assiette max APEC (4 PMSS)
+
+    # Régime général - part SALARIÉE
+    taux_vieil_plaf_sal: float     # Sur T1
+    taux_vieil_deplaf_sal: float   # Sur totalité
+    taux_maladie_sal_am: float     # Maladie salariée Alsace-Moselle
+
+    # AGIRC-ARRCO (taux d'appel) - part SALARIÉE
+    taux_aa_t1_sal: float
+    taux_aa_t2_sal: float
+    taux_ceg_t1_sal: float
+    taux_ceg_t2_sal: float
+    taux_cet_sal: float            # Si brut > PMSS, assiette T1+T2
+    taux_apec_sal: float           # Sur 0→4 PMSS (cadres)
+
+    # CSG/CRDS
+    assiette_csg_abatt: float      # Part du brut soumise à CSG/CRDS
+    taux_csg_ded: float
+    taux_csg_nded: float
+    taux_crds: float
+
+    # Part EMPLOYEUR
+    taux_vieil_plaf_emp: float
+    taux_vieil_deplaf_emp: float
+    taux_aa_t1_emp: float
+    taux_aa_t2_emp: float
+    taux_ceg_t1_emp: float
+    taux_ceg_t2_emp: float
+    taux_cet_emp: float
+    taux_apec_emp: float
+    taux_maladie_emp_inf_2p5: float   # Si rémunération ≤ 2,5 SMIC
+    taux_maladie_emp_sup_2p5: float   # Si rémunération > 2,5 SMIC
+    taux_af_emp_inf_3p5: float        # Si rémunération ≤ 3,5 SMIC
+    taux_af_emp_sup_3p5: float        # Si rémunération > 3,5 SMIC
+    taux_chomage_emp_apres_mai: float # À compter du 01/05/2025 (hors modulation)
+    taux_chomage_emp_avant_mai: float
+    taux_ags_emp: float
+    taux_fnal_moins_50: float
+    taux_fnal_50_plus: float
+    taux_csa_emp: float               # Contribution solidarité autonomie
+
+    # Impôt sur le revenu
+    coefficient_reduction_forfaitaire: float  # Salaires retenus après abattement de 10 %
+    taux_revenu_autoentrepreneur: float       # Part imposable du chiffre d'affaires
+    taux_abattement_autoentrepreneur: float
+    decote_seul: float
+    decote_couple: float
+    taux_decote: float
+    taux_reduction_frais_garde: float
+    bareme_impot: BaremeCompile
+    bareme_visualisation: BaremeCompile       # Barème affiché sur la page de visualisation
+
+    # Formes compilées pour les moteurs vectorisés
+    plafonds: np.ndarray        # [PMSS, plafond APEC, plafond Agirc-Arrco T2]
+    taux_lignes: np.ndarray     # (2, len(LIGNES_COTISATIONS)) : taux option fausse / vraie
+    taux_combinaisons: np.ndarray  # (2 ** len(OPTIONS_LIGNES), len(LIGNES_COTISATIONS))
+
+    @classmethod
+    def depuis_dict(cls, donnees: dict) -> "ParametresAnnuels":
+        """Construit et compile un jeu de paramètres à partir d'un fichier décodé."""
+
+        valeurs = dict(donnees)
+        pmss = float(valeurs["pmss"])
+        valeurs["aa_t2_max"] = valeurs.pop("plafond_agirc_arrco_t2_en_pmss") * pmss
+        valeurs["apec_plafond"] = valeurs.pop("plafond_apec_en_pmss") * pmss
+        for nom in ("tranches_impot", "tranches_visualisation"):
+            tranches = [
+                (bas, float("inf") if haut is None else haut, taux)
+                for bas, haut, taux in valeurs.pop(nom)
+            ]
+            valeurs["bareme" + nom.removeprefix("tranches")] = BaremeCompile.depuis_tranches(tranches)
+
+        plafonds = np.array([pmss, valeurs["apec_plafond"], valeurs["aa_t2_max"]])
+        taux_lignes = np.array(
+            [
+                [0.0 if faux is None else float(valeurs[faux]) for _, _, _, faux, _ in LIGNES_COTISATIONS],
+                [0.0 if vrai is None else float(valeurs[vrai]) for _, _, _, _, vrai in LIGNES_COTISATIONS],
+            ]
+        )
+        # Taux de chaque ligne pour chaque combinaison d'options
+        bits = np.arange(2 ** len(OPTIONS_LIGNES))[:, np.newaxis] >> np.arange(len(OPTIONS_LIGNES)) & 1
+        options_vraies = np.column_stack(
+            [
+                np.ones(len(bits), dtype=bool) if option is None else bits[:, OPTIONS_LIGNES.index(option)] == 1
+                for _, _, option, _, _ in LIGNES_COTISATIONS
+            ]
+        )
+        taux_combinaisons = np.where(options_vraies, taux_lignes[1], taux_lignes[0])
+        for tableau in (plafonds, taux_lignes, taux_combinaisons):
+            tableau.setflags(write=False)
+        return cls(
+            **valeurs,
+            plafonds=plafonds,
+            taux_lignes=taux_lignes,
+            taux_combinaisons=taux_combinaisons,
+        )
+
+    def __repr__(self) -> str:
+        return f"ParametresAnnuels(annee={self.annee})"
+
+
+def charger_parametres(chemin) -> ParametresAnnuels:
+    """Lit un fichier JSON de paramètres (hors registre, pour des jeux personnalisés)."""
+
+    with open(chemin, encoding="utf-8") as fichier:
+        return ParametresAnnuels.depuis_dict(json.load(fichier))
+
+
+_REGISTRE: dict[int, ParametresAnnuels] = {}
+_VERROU_REGISTRE = threading.Lock()
+
+
+def _registre() -> dict[int, ParametresAnnuels]:
+    with _VERROU_REGISTRE:
+        if not _REGISTRE:
+            for chemin in sorted(DOSSIER_DONNEES.glob("parametres_*.json")):
+                parametres = charger_parametres(chemin)
+                _REGISTRE[parametres.annee] = parametres
+        return _REGISTRE
+
+
+def annees_disponibles() -> list[int]:
+    return sorted(_registre())
+
+
+def parametres_annee(annee: int) -> ParametresAnnuels:
+    """Jeu de paramètres de `annee`, chargé une fois puis partagé."""
+
+    try:
+        return _registre()[annee]
+    except KeyError:
+        raise ValueError(
+            f"Aucun paramètre pour l'année {annee} "
+            f"(disponibles : {', '.join(map(str, annees_disponibles()))})"
+        ) from None
+
+
+PARAMETRES_DEFAUT = parametres_annee(ANNEE_PAR_DEFAUT)
+
+# Barèmes de l'année par défaut, pour les appelants sans jeu de paramètres explicite
+BAREME_IMPOT = PARAMETRES_DEFAUT.bareme_impot
+BAREME_VISUALISATION = PARAMETRES_DEFAUT.bareme_visualisation
@@ -0,0 +1,393 @@
+"""Rapports HTML et PDF de simulation d'impôt, à l'unité ou par campagnes entières.
+
+Le gabarit du rapport est découpé une fois pour toutes en fragments
+`str.format` (en-tête, ligne de détail, ligne de tranche, pied) : un rendu ne
+fait plus que remplir ces fragments et les joindre. Pour une campagne, les
+foyers d'un fichier CSV ou Parquet sont lus par blocs, découpés en lots rendus
+par un pool de processus et écrits au fil de l'eau dans une archive zip ; le
+nombre de lots en vol est borné, si bien que la mémoire ne dépend pas de la
+taille du fichier. Avec `--format pdf`, les rapports sont produits par
+`rapports_pdf` ; chaque worker prépare la mise en page à son démarrage.
+Exemple :
+
+    python -m simulation_impot.rapports foyers.csv rapports.zip --processus 4
+"""
+
+import argparse
+import functools
+import html
+import multiprocessing
+import re
+import sys
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+from .impot import calcul_impot
+from .parallele import METHODE_DEMARRAGE
+from .parametres import (
+    ANNEE_PAR_DEFAUT,
+    PARAMETRES_DEFAUT,
+    ParametresAnnuels,
+    annees_disponibles,
+    parametres_annee,
+)
+
+TAILLE_LOT_RAPPORTS = 500  # Rapports rendus par tâche confiée à un worker
+LOTS_EN_VOL_PAR_WORKER = 2  # Lots soumis d'avance par worker (borne la mémoire)
+FORMATS_RAPPORT = ("html", "pdf")
+
+_GABARIT_RAPPORT = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Rapport Simulation Impôt</title>
+</head>
+<body>
+    <h1>Rapport de Simulation d'Impôt</h1>
+    <p><strong>Date de génération :</strong> {date}</p>
+    <hr>
+    <h2>Résumé</h2>
+    <p><strong>Impôt Final (€):</strong> {impot_final:.2f}</p>
+    <p><strong>Revenu Net Mensuel (€):</strong> {revenu_net_mensuel:.2f}</p>
+    <h2>Détails</h2>
+    <ul>
+    <!-- details -->
+    </ul>
+    <h2>Détails des Tranches</h2>
+    <ul>
+    <!-- tranches -->
+    </ul>
+</body>
+</html>
+"""
+
+
+@dataclass(frozen=True)
+class GabaritRapport:
+    """Gabarit compilé : fragments du rapport prêts à être remplis."""
+
+    entete: Callable[..., str]
+    milieu: str
+    pied: str
+    detail: Callable[..., str]
+    tranche: Callable[..., str]
+
+    @classmethod
+    def compiler(cls, source: str = _GABARIT_RAPPORT) -> "GabaritRapport":
+        entete, reste = source.split("<!-- details -->")
+        milieu, pied = reste.split("<!-- tranches -->")
+        return cls(
+            entete=entete.format,
+            milieu=milieu,
+            pied=pied,
+            detail="<li><strong>{}:</strong> {:.2f} €</li>".format,
+            tranche="<li>{}</li>".format,
+        )
+
+    def rendre(self, resultat: dict, date_generation: str) -> bytes:
+        """Rapport HTML (UTF-8) d'un résultat de `calcul_impot`."""
+
+        echapper = functools.partial(html.escape, quote=False)  # Textes hors attributs
+        morceaux = [
+            self.entete(
+                date=echapper(date_generation),
+                impot_final=resultat["impot_final"],
+                revenu_net_mensuel=resultat["revenu_net_mensuel"],
+            )
+        ]
+        morceaux.extend(
+            self.detail(echapper(cle), valeur) for cle, valeur in resultat["details"].items()
+        )
+        morceaux.append(self.milieu)
+        morceaux.extend(self.tranche(echapper(ligne)) for ligne in resultat["details_tranches"])
+        morceaux.append(self.pied)
+        return "".join(morceaux).encode("utf-8")
+
+
+# Compilé à l'import : une fois dans le processus principal et une fois par worker
+GABARIT = GabaritRapport.compiler()
+
+
+def rendre_rapport_html(resultat: dict, date_generation: Optional[str] = None) -> bytes:
+    """Rapport HTML d'une simulation ; la date par défaut est l'heure courante."""
+
+    if date_generation is None:
+        date_generation = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return GABARIT.rendre(resultat, date_generation)
+
+
+def _nom_fichier(identifiant, format_rapport: str) -> str:
+    return "rapport_" + re.sub(r"[^\w.-]+", "_", str(identifiant)) + "." + format_rapport
+
+
+def _moteur_rendu(format_rapport: str) -> Callable[[dict, str], bytes]:
+    if format_rapport == "pdf":
+        from .rapports_pdf import rapport_impot_pdf
+
+        return rapport_impot_pdf
+    return GABARIT.rendre
+
+
+def _preparer_worker(format_rapport: str) -> None:
+    """Initialise un worker : imports et mise en page hors du chemin critique."""
+
+    _moteur_rendu(format_rapport)(calcul_impot(0, 0, 1), "")
+
+
+def _rendre_lot(
+    identifiants: list,
+    colonnes: dict[str, np.ndarray],
+    date_generation: str,
+    parametres: ParametresAnnuels,
+    format_rapport: str = "html",
+) -> list[tuple[str, bytes]]:
+    """Tâche d'un worker : calcule et rend les rapports d'un lot de foyers."""
+
+    rendre = _moteur_rendu(format_rapport)
+    rapports = []
+    for i, identifiant in enumerate(identifiants):
+        resultat = calcul_impot(
+            **{nom: valeurs[i].item() for nom, valeurs in colonnes.items()},
+            parametres=parametres,
+        )
+        rapports.append(
+            (_nom_fichier(identifiant, format_rapport), rendre(resultat, date_generation))
+        )
+    return rapports
+
+
+def lots_foyers(blocs: Iterable, taille_lot: int = TAILLE_LOT_RAPPORTS):
+    """Découpe des blocs de foyers (DataFrame) en lots `(identifiants, colonnes, rejets)`.
+
+    Les colonnes sont celles du traitement par lots (`revenu_salarial` et
+    données du foyer). Les lignes invalides sont écartées ; leur nombre est
+    porté par le premier lot de chaque bloc. Les rapports sont nommés d'après
+    la colonne `identifiant`, à défaut d'après le numéro de ligne.
+    """
+
+    from .entrees import MONTANTS_FOYER, OPTIONS_FOYER, colonne_booleenne, colonne_numerique
+
+    debut = 0
+    for bloc in blocs:
+        n = len(bloc)
+        colonnes = {}
+        colonnes["revenu_salarial"], invalides = colonne_numerique(bloc, "revenu_salarial", None)
+        invalides |= colonnes["revenu_salarial"] < 0
+        for nom, defaut in MONTANTS_FOYER.items():
+            colonnes[nom], invalides_colonne = colonne_numerique(bloc, nom, defaut)
+            plancher = colonnes[nom] <= 0 if nom == "nombre_parts" else colonnes[nom] < 0
+            invalides |= invalides_colonne | plancher
+        for nom, defaut in OPTIONS_FOYER.items():
+            colonnes[nom], invalides_colonne = colonne_booleenne(bloc, nom, defaut)
+            invalides |= invalides_colonne
+
+        if "identifiant" in bloc:
+            identifiants = bloc["identifiant"].astype(str).to_numpy(dtype=object)
+        else:
+            identifiants = np.arange(debut, debut + n)
+        valides = ~invalides
+        identifiants = identifiants[valides].tolist()
+        colonnes = {nom: valeurs[valides] for nom, valeurs in colonnes.items()}
+        rejets = n - len(identifiants)
+        for depart in range(0, max(len(identifiants), 1), taille_lot):
+            tranche = slice(depart, depart + taille_lot)
+            yield (
+                identifiants[tranche],
+                {nom: valeurs[tranche] for nom, valeurs in colonnes.items()},
+                rejets if depart == 0 else 0,
+            )
+        debut += n
+
+
+def generer_rapports(
+    lots: Iterable,
+    chemin_zip,
+    *,
+    processus: int = 1,
+    format_rapport: str = "html",
+    parametres: ParametresAnnuels = PARAMETRES_DEFAUT,
+    date_generation: Optional[str] = None,
+    progression: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """Rend chaque lot de `lots_foyers` et l'écrit dans l'archive `chemin_zip`.
+
+    Avec `processus > 1`, les lots sont rendus par un pool de processus ; au
+    plus `LOTS_EN_VOL_PAR_WORKER` lots par worker sont en attente et les
+    rapports sont écrits dans l'ordre des lots. `progression` reçoit après
+    chaque lot les compteurs renvoyés en fin de campagne. `format_rapport`
+    vaut `"html"` ou `"pdf"` ; les PDF, déjà compressés, sont stockés tels quels.
+
+    Deux foyers dont les identifiants donnent le même nom de fichier (doublon,
+    ou `"a/b"` et `"a b"`) ne s'écrasent pas : le second est suffixé `_2`, le
+    suivant `_3`, etc., et compté dans `renommes`.
+    """
+
+    if format_rapport not in FORMATS_RAPPORT:
+        raise ValueError(f"Format de rapport inconnu : {format_rapport!r}")
+    if date_generation is None:
+        date_generation = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    debut = time.perf_counter()
+    stats = {
+        "rapports": 0,
+        "rejets": 0,
+        "renommes": 0,
+        "octets": 0,
+        "duree_s": 0.0,
+        "rapports_par_s": 0.0,
+    }
+    occurrences = {}  # Nom déjà écrit dans l'archive -> dernier suffixe utilisé
+
+    def nom_unique(nom: str) -> str:
+        if nom not in occurrences:
+            occurrences[nom] = 1
+            return nom
+        racine, extension = nom.rsplit(".", 1)
+        candidat = nom
+        while candidat in occurrences:
+            occurrences[nom] += 1
+            candidat = f"{racine}_{occurrences[nom]}.{extension}"
+        occurrences[candidat] = 1
+        stats["renommes"] += 1
+        return candidat
+
+    def mesurer() -> None:
+        stats["duree_s"] = time.perf_counter() - debut
+        stats["rapports_par_s"] = stats["rapports"] / stats["duree_s"] if stats["duree_s"] else 0.0
+
+    def ecrire(archive: zipfile.ZipFile, rapports: list[tuple[str, bytes]]) -> None:
+        for nom, contenu in rapports:
+            archive.writestr(nom_unique(nom), contenu)
+            stats["octets"] += len(contenu)
+        stats["rapports"] += len(rapports)
+        if progression is not None:
+            mesurer()
+            progression(dict(stats))
+
+    pool = (
+        ProcessPoolExecutor(
+            processus,
+            mp_context=multiprocessing.get_context(METHODE_DEMARRAGE),
+            initializer=_preparer_worker,
+            initargs=(format_rapport,),
+        )
+        if processus > 1
+        else None
+    )
+    compression = zipfile.ZIP_STORED if format_rapport == "pdf" else zipfile.ZIP_DEFLATED
+    en_vol: deque[Future] = deque()
+    try:
+        with zipfile.ZipFile(chemin_zip, "w", compression=compression) as archive:
+            for identifiants, colonnes, rejets in lots:
+                stats["rejets"] += rejets
+                if not identifiants:
+                    continue
+                if pool is None:
+                    ecrire(
+                        archive,
+                        _rendre_lot(
+                            identifiants, colonnes, date_generation, parametres, format_rapport
+                        ),
+                    )
+                    continue
+                en_vol.append(
+                    pool.submit(
+                        _rendre_lot,
+                        identifiants,
+                        colonnes,
+                        date_generation,
+                        parametres,
+                        format_rapport,
+                    )
+                )
+                if len(en_vol) >= LOTS_EN_VOL_PAR_WORKER * processus:
+                    ecrire(archive, en_vol.popleft().result())
+            while en_vol:
+                ecrire(archive, en_vol.popleft().result())
+    finally:
+        if pool is not None:
+            for tache in en_vol:
+                tache.cancel()
+            pool.shutdown()
+    mesurer()
+    return stats
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from .fichiers import TAILLE_BLOC_DEFAUT, lire_blocs
+
+    parser = argparse.ArgumentParser(
+        prog="python -m simulation_impot.rapports",
+        description=(
+            "Génère dans une archive zip un rapport par foyer (HTML ou PDF, voir --format)"
+            " d'un fichier CSV ou Parquet."
+        ),
+    )
+    parser.add_argument("entree", type=Path, help="Fichier de foyers (.csv ou .parquet)")
+    parser.add_argument("sortie", type=Path, help="Archive zip des rapports")
+    parser.add_argument(
+        "--processus",
+        type=int,
+        default=1,
+        help="Nombre de processus de rendu (défaut : 1, sans parallélisme)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS_RAPPORT,
+        default="html",
+        help="Format des rapports (défaut : html)",
+    )
+    parser.add_argument(
+        "--taille-lot",
+        type=int,
+        default=TAILLE_LOT_RAPPORTS,
+        help=f"Rapports par tâche de rendu (défaut : {TAILLE_LOT_RAPPORTS})",
+    )
+    parser.add_argument(
+        "--separateur", default=",", help="Séparateur des fichiers CSV (défaut : ,)"
+    )
+    parser.add_argument(
+        "--annee",
+        type=int,
+        default=ANNEE_PAR_DEFAUT,
+        choices=annees_disponibles(),
+        help=f"Année des règles de calcul (défaut : {ANNEE_PAR_DEFAUT})",
+    )
+    args = parser.parse_args(argv)
+    if args.taille_lot <= 0:
+        parser.error("--taille-lot doit être strictement positif")
+
+    def afficher(stats: dict) -> None:
+        print(
+            f"\r{stats['rapports']} rapports ({stats['rapports_par_s']:.0f}/s)",
+            end="",
+            file=sys.stderr,
+            flush=True,
+        )
+
+    stats = generer_rapports(
+        lots_foyers(lire_blocs(args.entree, TAILLE_BLOC_DEFAUT, args.separateur), args.taille_lot),
+        args.sortie,
+        processus=args.processus,
+        format_rapport=args.format,
+        parametres=parametres_annee(args.annee),
+        progression=afficher,
+    )
+    print(
+        f"\r{stats['rapports']} rapports générés ({stats['renommes']} renommés),"
+        f" {stats['rejets']} foyers rejetés"
+        f" en {stats['duree_s']:.2f} s ({stats['rapports_par_s']:.0f}/s)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
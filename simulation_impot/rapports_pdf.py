@@ -0,0 +1,181 @@
+"""Rapports PDF (fpdf) : décomposition brut → net et simulation d'impôt.
+
+Les rapports sont construits à partir des mêmes objets que l'interface :
+`ResultatSalaire` pour le brut → net, dictionnaire de `calcul_impot` pour
+l'impôt. La mise en page (libellés déjà encodés, largeurs, tailles de police)
+est préparée une fois par processus ; chaque rapport ne fait plus que placer
+ses montants. Les polices de base de fpdf utilisent l'encodage WinAnsi : les
+textes sont convertis en cp1252, ce qui conserve les accents et le signe €.
+"""
+
+from dataclasses import asdict, dataclass, field, is_dataclass
+from datetime import datetime
+from typing import Optional
+
+from fpdf import FPDF
+
+# (champ de ResultatSalaire, libellé) ; les taux dépendent de l'année et ne sont pas repris
+SYNTHESE_SALAIRE = (
+    ("brut_mensuel", "Salaire brut mensuel"),
+    ("total_cot_sal_hors_csg", "Cotisations salariales (hors CSG/CRDS)"),
+    ("total_csg_crds", "CSG/CRDS"),
+    ("net_imposable", "Net imposable"),
+    ("net_a_payer", "Net à payer"),
+    ("total_charges_employeur", "Charges employeur"),
+    ("cout_total_employeur", "Coût total employeur"),
+)
+POSTES_SALARIE = (
+    ("vieillesse_plafonnee", "Vieillesse plafonnée (T1)"),
+    ("vieillesse_deplafonnee", "Vieillesse déplafonnée"),
+    ("maladie_salarie", "Maladie Alsace-Moselle"),
+    ("agirc_arrco_T1", "AGIRC-ARRCO T1"),
+    ("agirc_arrco_T2", "AGIRC-ARRCO T2"),
+    ("ceg_T1", "CEG T1"),
+    ("ceg_T2", "CEG T2"),
+    ("cet", "CET"),
+    ("apec", "APEC"),
+    ("csg_deductible", "CSG déductible"),
+    ("csg_non_deductible", "CSG non déductible"),
+    ("crds", "CRDS"),
+)
+POSTES_EMPLOYEUR = (
+    ("maladie_employeur", "Maladie"),
+    ("vieillesse_plaf_emp", "Vieillesse plafonnée (T1)"),
+    ("vieillesse_deplaf_emp", "Vieillesse déplafonnée"),
+    ("aa_T1_emp", "AGIRC-ARRCO T1"),
+    ("aa_T2_emp", "AGIRC-ARRCO T2"),
+    ("ceg_T1_emp", "CEG T1"),
+    ("ceg_T2_emp", "CEG T2"),
+    ("cet_emp", "CET"),
+    ("apec_emp", "APEC"),
+    ("allocations_familiales", "Allocations familiales"),
+    ("chomage", "Assurance chômage"),
+    ("ags", "AGS"),
+    ("fnal", "FNAL"),
+    ("csa", "CSA"),
+)
+
+
+def texte_pdf(texte: str) -> str:
+    """Convertit un texte pour les polices de base de fpdf (encodage WinAnsi)."""
+
+    return texte.encode("cp1252", "replace").decode("latin-1")
+
+
+def _montant(valeur: float) -> str:
+    return texte_pdf(f"{valeur:,.2f} €".replace(",", " ").replace(".", ","))
+
+
+def _libelles_encodes() -> dict:
+    return {
+        champ: texte_pdf(libelle)
+        for champ, libelle in SYNTHESE_SALAIRE + POSTES_SALARIE + POSTES_EMPLOYEUR
+    }
+
+
+@dataclass(frozen=True)
+class MiseEnPagePdf:
+    """Mise en page commune des rapports, avec ses libellés déjà encodés."""
+
+    police: str = "Helvetica"
+    marge: float = 15.0
+    largeur_libelle: float = 125.0
+    largeur_montant: float = 55.0
+    hauteur_ligne: float = 6.5
+    # Champ de ResultatSalaire -> libellé encodé
+    libelles: dict = field(
+        init=False, repr=False, compare=False, default_factory=_libelles_encodes
+    )
+    # Titres et textes fixes encodés à leur premier usage
+    _textes: dict = field(init=False, repr=False, compare=False, default_factory=dict)
+
+    def texte(self, texte: str) -> str:
+        # Les titres et libellés fixes ne sont encodés qu'une fois par processus
+        encode = self._textes.get(texte)
+        if encode is None:
+            encode = self._textes[texte] = texte_pdf(texte)
+        return encode
+
+    def document(self, titre: str, date_generation: str) -> FPDF:
+        pdf = FPDF(format="A4")
+        pdf.set_margins(self.marge, self.marge, self.marge)
+        pdf.set_auto_page_break(True, self.marge)
+        pdf.add_page()
+        pdf.set_font(self.police, "B", 16)
+        pdf.cell(0, 10, self.texte(titre), ln=1)
+        pdf.set_font(self.police, "", 9)
+        pdf.cell(0, 6, self.texte("Date de génération : ") + texte_pdf(date_generation), ln=1)
+        return pdf
+
+    def section(self, pdf: FPDF, titre: str) -> None:
+        pdf.ln(3)
+        pdf.set_font(self.police, "B", 12)
+        pdf.cell(0, 8, self.texte(titre), border="B", ln=1)
+        pdf.set_font(self.police, "", 10)
+
+    def ligne(self, pdf: FPDF, libelle: str, valeur: float, gras: bool = False) -> None:
+        if gras:
+            pdf.set_font(self.police, "B", 10)
+        pdf.cell(self.largeur_libelle, self.hauteur_ligne, libelle)
+        pdf.cell(self.largeur_montant, self.hauteur_ligne, _montant(valeur), align="R", ln=1)
+        if gras:
+            pdf.set_font(self.police, "", 10)
+
+    def paragraphe(self, pdf: FPDF, texte: str) -> None:
+        pdf.multi_cell(0, self.hauteur_ligne - 1, texte_pdf(texte))
+
+    def postes(self, pdf: FPDF, valeurs: dict, postes: tuple) -> None:
+        for champ, _ in postes:
+            self.ligne(pdf, self.libelles[champ], valeurs[champ])
+
+
+# Préparée à l'import : une fois dans le processus principal et une fois par worker
+MISE_EN_PAGE = MiseEnPagePdf()
+
+
+def _date(date_generation: Optional[str]) -> str:
+    return date_generation or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _octets(pdf: FPDF) -> bytes:
+    return pdf.output(dest="S").encode("latin-1")
+
+
+def rapport_brut_net_pdf(resultat, date_generation: Optional[str] = None) -> bytes:
+    """Rapport PDF d'un `ResultatSalaire` (ou du dictionnaire de ses champs)."""
+
+    valeurs = asdict(resultat) if is_dataclass(resultat) else resultat
+    mise_en_page = MISE_EN_PAGE
+    pdf = mise_en_page.document("Décomposition du salaire brut en net", _date(date_generation))
+    mise_en_page.section(pdf, "Synthèse mensuelle")
+    for champ, _ in SYNTHESE_SALAIRE:
+        mise_en_page.ligne(
+            pdf,
+            mise_en_page.libelles[champ],
+            valeurs[champ],
+            gras=champ in ("net_a_payer", "cout_total_employeur"),
+        )
+    mise_en_page.section(pdf, "Cotisations salarié")
+    mise_en_page.postes(pdf, valeurs, POSTES_SALARIE)
+    mise_en_page.section(pdf, "Cotisations employeur")
+    mise_en_page.postes(pdf, valeurs, POSTES_EMPLOYEUR)
+    return _octets(pdf)
+
+
+def rapport_impot_pdf(resultat: dict, date_generation: Optional[str] = None) -> bytes:
+    """Rapport PDF d'un résultat de `calcul_impot` (mêmes rubriques que le rapport HTML)."""
+
+    mise_en_page = MISE_EN_PAGE
+    pdf = mise_en_page.document("Rapport de Simulation d'Impôt", _date(date_generation))
+    mise_en_page.section(pdf, "Résumé")
+    mise_en_page.ligne(pdf, mise_en_page.texte("Impôt final"), resultat["impot_final"], gras=True)
+    mise_en_page.ligne(
+        pdf, mise_en_page.texte("Revenu net mensuel"), resultat["revenu_net_mensuel"], gras=True
+    )
+    mise_en_page.section(pdf, "Détails")
+    for libelle, valeur in resultat["details"].items():
+        mise_en_page.ligne(pdf, mise_en_page.texte(libelle.strip()), valeur)
+    mise_en_page.section(pdf, "Détails des tranches")
+    for ligne in resultat["details_tranches"]:
+        mise_en_page.paragraphe(pdf, ligne)
+    return _octets(pdf)
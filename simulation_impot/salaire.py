@@ -0,0 +1,495 @@
+"""Calcul brut → net mensuel : cotisations salariales et patronales."""
+
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+from .parametres import LIGNES_COTISATIONS, OPTIONS_LIGNES, PARAMETRES_DEFAUT, ParametresAnnuels
+
+
+@dataclass(slots=True)
+class ResultatSalaire:
+    brut_mensuel: float
+    base_T1: float
+    base_T2: float
+    vieillesse_plafonnee: float
+    vieillesse_deplafonnee: float
+    maladie_salarie: float
+    agirc_arrco_T1: float
+    agirc_arrco_T2: float
+    ceg_T1: float
+    ceg_T2: float
+    cet: float
+    apec: float
+    csg_deductible: float
+    csg_non_deductible: float
+    crds: float
+    total_cot_sal_hors_csg: float
+    total_csg_crds: float
+    net_imposable: float
+    net_a_payer: float
+    maladie_employeur: float
+    vieillesse_plaf_emp: float
+    vieillesse_deplaf_emp: float
+    aa_T1_emp: float
+    aa_T2_emp: float
+    ceg_T1_emp: float
+    ceg_T2_emp: float
+    cet_emp: float
+    apec_emp: float
+    allocations_familiales: float
+    chomage: float
+    ags: float
+    fnal: float
+    csa: float
+    total_charges_employeur: float
+    cout_total_employeur: float
+
+
+def calcul_brut_net_mensuel(
+    brut_mensuel: float,
+    *,
+    cadre: bool = True,
+    alsace_moselle: bool = False,
+    sup_2p5_smic: bool = True,
+    sup_3p5_smic: bool = True,
+    effectif_50plus: bool = True,
+    chomage_apres_mai_2025: bool = True,
+    parametres: ParametresAnnuels = PARAMETRES_DEFAUT,
+) -> ResultatSalaire:
+    """Calcule les cotisations et nets mensuels pour un cadre."""
+
+    p = parametres
+
+    base_T1 = min(brut_mensuel, p.pmss)
+    base_T2 = max(0.0, min(brut_mensuel, p.aa_t2_max) - p.pmss)
+
+    # Cotisations salariales
+    vieill_plaf = p.taux_vieil_plaf_sal * base_T1
+    vieill_depl = p.taux_vieil_deplaf_sal * brut_mensuel
+    maladie_sal = (p.taux_maladie_sal_am * brut_mensuel) if alsace_moselle else 0.0
+
+    aa_T1_sal = p.taux_aa_t1_sal * base_T1
+    aa_T2_sal = p.taux_aa_t2_sal * base_T2
+    ceg_T1_sal = p.taux_ceg_t1_sal * base_T1
+    ceg_T2_sal = p.taux_ceg_t2_sal * base_T2
+    cet_sal = (p.taux_cet_sal * (base_T1 + base_T2)) if brut_mensuel > p.pmss else 0.0
+
+    apec_base = min(brut_mensuel, p.apec_plafond) if cadre else 0.0
+    apec_sal = p.taux_apec_sal * apec_base if cadre else 0.0
+
+    assiette_csg = p.assiette_csg_abatt * brut_mensuel
+    csg_ded = p.taux_csg_ded * assiette_csg
+    csg_nded = p.taux_csg_nded * assiette_csg
+    crds = p.taux_crds * assiette_csg
+
+    total_sal_hors_csg = (
+        vieill_plaf
+        + vieill_depl
+        + maladie_sal
+        + aa_T1_sal
+        + aa_T2_sal
+        + ceg_T1_sal
+        + ceg_T2_sal
+        + cet_sal
+        + apec_sal
+    )
+    total_csg_crds = csg_ded + csg_nded + crds
+
+    net_imposable = brut_mensuel - total_sal_hors_csg - csg_ded
+    net_a_payer = brut_mensuel - total_sal_hors_csg - total_csg_crds
+
+    # Cotisations employeur
+    maladie_emp = (
+        p.taux_maladie_emp_sup_2p5 if sup_2p5_smic else p.taux_maladie_emp_inf_2p5
+    ) * brut_mensuel
+    vieill_plaf_emp = p.taux_vieil_plaf_emp * base_T1
+    vieill_deplaf_emp = p.taux_vieil_deplaf_emp * brut_mensuel
+    aa_T1_emp = p.taux_aa_t1_emp * base_T1
+    aa_T2_emp = p.taux_aa_t2_emp * base_T2
+    ceg_T1_emp = p.taux_ceg_t1_emp * base_T1
+    ceg_T2_emp = p.taux_ceg_t2_emp * base_T2
+    cet_emp = (p.taux_cet_emp * (base_T1 + base_T2)) if brut_mensuel > p.pmss else 0.0
+    apec_emp = (p.taux_apec_emp * apec_base) if cadre else 0.0
+    af_emp = (
+        p.taux_af_emp_sup_3p5 if sup_3p5_smic else p.taux_af_emp_inf_3p5
+    ) * brut_mensuel
+    taux_chom = (
+        p.taux_chomage_emp_apres_mai
+        if chomage_apres_mai_2025
+        else p.taux_chomage_emp_avant_mai
+    )
+    chomage_emp = taux_chom * brut_mensuel
+    ags_emp = p.taux_ags_emp * brut_mensuel
+    fnal_emp = (
+        p.taux_fnal_50_plus if effectif_50plus else p.taux_fnal_moins_50
+    ) * brut_mensuel
+    csa_emp = p.taux_csa_emp * brut_mensuel
+
+    total_emp = (
+        maladie_emp
+        + vieill_plaf_emp
+        + vieill_deplaf_emp
+        + aa_T1_emp
+        + aa_T2_emp
+        + ceg_T1_emp
+        + ceg_T2_emp
+        + cet_emp
+        + apec_emp
+        + af_emp
+        + chomage_emp
+        + ags_emp
+        + fnal_emp
+        + csa_emp
+    )
+    cout_total = brut_mensuel + total_emp
+
+    return ResultatSalaire(
+        brut_mensuel=brut_mensuel,
+        base_T1=base_T1,
+        base_T2=base_T2,
+        vieillesse_plafonnee=vieill_plaf,
+        vieillesse_deplafonnee=vieill_depl,
+        maladie_salarie=maladie_sal,
+        agirc_arrco_T1=aa_T1_sal,
+        agirc_arrco_T2=aa_T2_sal,
+        ceg_T1=ceg_T1_sal,
+        ceg_T2=ceg_T2_sal,
+        cet=cet_sal,
+        apec=apec_sal,
+        csg_deductible=csg_ded,
+        csg_non_deductible=csg_nded,
+        crds=crds,
+        total_cot_sal_hors_csg=total_sal_hors_csg,
+        total_csg_crds=total_csg_crds,
+        net_imposable=net_imposable,
+        net_a_payer=net_a_payer,
+        maladie_employeur=maladie_emp,
+        vieillesse_plaf_emp=vieill_plaf_emp,
+        vieillesse_deplaf_emp=vieill_deplaf_emp,
+        aa_T1_emp=aa_T1_emp,
+        aa_T2_emp=aa_T2_emp,
+        ceg_T1_emp=ceg_T1_emp,
+        ceg_T2_emp=ceg_T2_emp,
+        cet_emp=cet_emp,
+        apec_emp=apec_emp,
+        allocations_familiales=af_emp,
+        chomage=chomage_emp,
+        ags=ags_emp,
+        fnal=fnal_emp,
+        csa=csa_emp,
+        total_charges_employeur=total_emp,
+        cout_total_employeur=cout_total,
+    )
+
+
+# Options de calcul et leur valeur par défaut (cadre, entreprise de 50 salariés et plus...)
+OPTIONS_SALAIRE = {
+    "cadre": True,
+    "alsace_moselle": False,
+    "sup_2p5_smic": True,
+    "sup_3p5_smic": True,
+    "effectif_50plus": True,
+    "chomage_apres_mai_2025": True,
+}
+
+TAILLE_BLOC_BATCH = 16_384  # Lignes traitées par passe (temporaires gardés en cache)
+
+
+def calcul_brut_net_mensuel_batch(
+    brut_mensuel,
+    *,
+    cadre=True,
+    alsace_moselle=False,
+    sup_2p5_smic=True,
+    sup_3p5_smic=True,
+    effectif_50plus=True,
+    chomage_apres_mai_2025=True,
+    parametres: ParametresAnnuels = PARAMETRES_DEFAUT,
+) -> dict[str, np.ndarray]:
+    """Version vectorisée de `calcul_brut_net_mensuel` sur des tableaux NumPy.
+
+    Chaque option accepte un booléen ou un tableau diffusable sur `brut_mensuel`.
+    Le résultat contient une colonne par champ de `ResultatSalaire`, calculée
+    dans le même ordre d'opérations que la version scalaire. Toutes les
+    colonnes sont des vues sur un unique bloc mémoire.
+    """
+
+    brut, *options = np.broadcast_arrays(
+        np.asarray(brut_mensuel, dtype=float),
+        np.asarray(cadre, dtype=bool),
+        np.asarray(alsace_moselle, dtype=bool),
+        np.asarray(sup_2p5_smic, dtype=bool),
+        np.asarray(sup_3p5_smic, dtype=bool),
+        np.asarray(effectif_50plus, dtype=bool),
+        np.asarray(chomage_apres_mai_2025, dtype=bool),
+    )
+    forme = brut.shape
+    bloc = matrice_cotisations(
+        np.ravel(brut),
+        {nom: np.ravel(option) for nom, option in zip(OPTIONS_SALAIRE, options)},
+        parametres,
+    )
+    return {champ: colonne.reshape(forme) for champ, colonne in zip(CHAMPS_SALAIRE, bloc)}
+
+
+CHAMPS_SALAIRE = tuple(champ.name for champ in fields(ResultatSalaire))
+
+
+def matrice_cotisations(
+    brut: np.ndarray, options: dict[str, np.ndarray], parametres: ParametresAnnuels
+) -> np.ndarray:
+    """Matrice `(len(CHAMPS_SALAIRE), n)` des montants, une colonne par salarié.
+
+    `brut` et les options sont des tableaux 1D de même longueur.
+    """
+
+    bloc = np.empty((len(CHAMPS_SALAIRE), brut.size))
+    # Assiettes et taux intermédiaires, réutilisés d'un bloc à l'autre
+    tampon = np.empty((4, min(brut.size, TAILLE_BLOC_BATCH)))
+    for debut in range(0, brut.size, TAILLE_BLOC_BATCH):
+        tranche = slice(debut, debut + TAILLE_BLOC_BATCH)
+        _remplir_cotisations_batch(
+            dict(zip(CHAMPS_SALAIRE, bloc[:, tranche])),
+            brut[tranche],
+            {nom: option[tranche] for nom, option in options.items()},
+            parametres,
+            tampon[:, : brut[tranche].size],
+        )
+    return bloc
+
+
+_INDICES_CHAMPS = {champ: i for i, champ in enumerate(CHAMPS_SALAIRE)}
+
+
+class LotSalaires:
+    """Résultats brut → net d'un lot de salariés, adossés à une seule matrice.
+
+    La matrice `(len(CHAMPS_SALAIRE), n)` est celle de `matrice_cotisations` :
+    chaque champ est une ligne contiguë lue comme un attribut
+    (`lot.net_a_payer`), sans copie. `lot[i]` renvoie le `ResultatSalaire` du
+    salarié `i`, `lot.ligne(i)` la vue de ses montants et `lot[a:b]` un
+    sous-lot partageant la même mémoire.
+    """
+
+    __slots__ = ("matrice",)
+
+    def __init__(self, matrice: np.ndarray):
+        if matrice.ndim != 2 or matrice.shape[0] != len(CHAMPS_SALAIRE):
+            raise ValueError(
+                f"Matrice de forme {matrice.shape} : {len(CHAMPS_SALAIRE)} lignes attendues"
+            )
+        self.matrice = matrice
+
+    def __len__(self) -> int:
+        return self.matrice.shape[1]
+
+    def __getattr__(self, nom: str) -> np.ndarray:
+        indice = _INDICES_CHAMPS.get(nom)
+        if indice is None:
+            raise AttributeError(nom)
+        return self.matrice[indice]
+
+    def __getitem__(self, cle):
+        if isinstance(cle, (int, np.integer)):
+            return ResultatSalaire(*self.matrice[:, cle].tolist())
+        return LotSalaires(self.matrice[:, cle])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self) -> str:
+        return f"LotSalaires({len(self)} salariés)"
+
+    def ligne(self, i: int) -> np.ndarray:
+        """Montants du salarié `i` dans l'ordre de `CHAMPS_SALAIRE` (vue)."""
+
+        return self.matrice[:, i]
+
+    def colonnes(self) -> dict[str, np.ndarray]:
+        """Une vue 1D par champ, comme `calcul_brut_net_mensuel_batch`."""
+
+        return dict(zip(CHAMPS_SALAIRE, self.matrice))
+
+    @property
+    def nbytes(self) -> int:
+        return self.matrice.nbytes
+
+
+def calcul_lot_salaires(
+    brut_mensuel, *, parametres: ParametresAnnuels = PARAMETRES_DEFAUT, **options
+) -> LotSalaires:
+    """Calcule brut → net pour un tableau 1D de bruts ; options scalaires ou par salarié."""
+
+    brut_mensuel = np.asarray(brut_mensuel, dtype=float).reshape(-1)
+    inconnues = set(options) - set(OPTIONS_SALAIRE)
+    if inconnues:
+        raise TypeError(f"Options inconnues : {', '.join(sorted(inconnues))}")
+    options = {
+        nom: np.broadcast_to(np.asarray(options.get(nom, defaut), dtype=bool), brut_mensuel.shape)
+        for nom, defaut in OPTIONS_SALAIRE.items()
+    }
+    return LotSalaires(matrice_cotisations(brut_mensuel, options, parametres))
+
+
+def _remplir_cotisations_batch(
+    col: dict[str, np.ndarray],
+    brut: np.ndarray,
+    options: dict[str, np.ndarray],
+    parametres: ParametresAnnuels,
+    tampon: np.ndarray,
+) -> None:
+    """Écrit dans `col` les cotisations d'un bloc de lignes (colonnes 1D).
+
+    Chaque ligne de `LIGNES_COTISATIONS` est un produit taux × assiette. Les
+    options de chaque salarié forment un code de combinaison, et les taux sont
+    lus dans la matrice compilée `parametres.taux_combinaisons` : un scalaire
+    par ligne quand l'option est la même pour tout le bloc, sinon un vecteur
+    obtenu par indexation (sans branchement, contrairement à `np.where`).
+    """
+
+    pmss, apec_plafond, aa_t2_max = parametres.plafonds
+
+    np.copyto(col["brut_mensuel"], brut)
+    brut = col["brut_mensuel"]
+
+    base_T1 = np.minimum(brut, pmss, out=col["base_T1"])
+    # max(0, min(brut, 8 PMSS) - PMSS) en deux passes, exactement comme en scalaire
+    base_T2 = np.clip(brut, pmss, aa_t2_max, out=col["base_T2"])
+    base_T2 -= pmss
+
+    base_T1_T2, base_apec, base_csg, taux_salaries = tampon
+    np.add(base_T1, base_T2, out=base_T1_T2)
+    base_T1_T2 *= brut > pmss
+    assiettes = {
+        "brut": brut,
+        "T1": base_T1,
+        "T2": base_T2,
+        "T1_T2_au_dela_pmss": base_T1_T2,
+        "apec": np.minimum(brut, apec_plafond, out=base_apec),
+        "csg": np.multiply(parametres.assiette_csg_abatt, brut, out=base_csg),
+    }
+
+    # Bits des options constantes sur le bloc, puis codes par salarié si besoin
+    combinaison, variables = 0, {}
+    for bit, option in enumerate(OPTIONS_LIGNES):
+        if options[option].all():
+            combinaison |= 1 << bit
+        elif options[option].any():
+            variables[option] = bit
+    codes = None
+    if variables:
+        codes = np.full(brut.size, combinaison, dtype=np.uint8)
+        for option, bit in variables.items():
+            codes |= options[option].view(np.uint8) << np.uint8(bit)
+    taux_bloc = parametres.taux_combinaisons[combinaison]
+    for i, (champ, assiette, option, _, _) in enumerate(LIGNES_COTISATIONS):
+        taux = (
+            parametres.taux_combinaisons[:, i].take(codes, out=taux_salaries, mode="clip")
+            if option in variables
+            else taux_bloc[i]
+        )
+        np.multiply(taux, assiettes[assiette], out=col[champ])
+
+    total_sal_hors_csg = col["total_cot_sal_hors_csg"]
+    np.add(col["vieillesse_plafonnee"], col["vieillesse_deplafonnee"], out=total_sal_hors_csg)
+    for champ in (
+        "maladie_salarie",
+        "agirc_arrco_T1",
+        "agirc_arrco_T2",
+        "ceg_T1",
+        "ceg_T2",
+        "cet",
+        "apec",
+    ):
+        total_sal_hors_csg += col[champ]
+    total_csg_crds = col["total_csg_crds"]
+    np.add(col["csg_deductible"], col["csg_non_deductible"], out=total_csg_crds)
+    total_csg_crds += col["crds"]
+
+    np.subtract(brut, total_sal_hors_csg, out=col["net_imposable"])
+    col["net_imposable"] -= col["csg_deductible"]
+    np.subtract(brut, total_sal_hors_csg, out=col["net_a_payer"])
+    col["net_a_payer"] -= total_csg_crds
+
+    total_emp = col["total_charges_employeur"]
+    np.add(col["maladie_employeur"], col["vieillesse_plaf_emp"], out=total_emp)
+    for champ in (
+        "vieillesse_deplaf_emp",
+        "aa_T1_emp",
+        "aa_T2_emp",
+        "ceg_T1_emp",
+        "ceg_T2_emp",
+        "cet_emp",
+        "apec_emp",
+        "allocations_familiales",
+        "chomage",
+        "ags",
+        "fnal",
+        "csa",
+    ):
+        total_emp += col[champ]
+    np.add(brut, total_emp, out=col["cout_total_employeur"])
+
+
+# Montants pouvant servir de cible au calcul inverse (affines par morceaux en brut)
+CIBLES_INVERSE = ("net_a_payer", "net_imposable", "cout_total_employeur")
+
+
+def calcul_brut_pour_cible(
+    cible: str, valeur, *, parametres: ParametresAnnuels = PARAMETRES_DEFAUT, **options
+):
+    """Calcul inverse : brut mensuel donnant `valeur` pour le montant `cible`.
+
+    `cible` est l'un de `CIBLES_INVERSE` ; `valeur` et les options de
+    `calcul_brut_net_mensuel` acceptent des scalaires ou des tableaux. Chaque
+    montant est affine en brut entre les seuils PMSS, 4 PMSS et 8 PMSS : les
+    pentes et ordonnées de chaque segment sont obtenues en évaluant le moteur
+    vectorisé en deux points, puis chaque cible est résolue exactement sur le
+    premier segment qui la contient (le plus petit brut possible). Si la cible
+    tombe dans le saut créé par la CET au passage du PMSS, ou sous le montant
+    d'un brut nul, le seuil correspondant est renvoyé. Une valeur négative ou
+    non finie lève une `ValueError`.
+    """
+
+    if cible not in CIBLES_INVERSE:
+        raise ValueError(f"Cible inconnue : {cible!r} (attendu : {', '.join(CIBLES_INVERSE)})")
+
+    valeur = np.asarray(valeur, dtype=float)
+    if not np.isfinite(valeur).all():
+        raise ValueError(f"Montant {cible} non fini : {valeur[~np.isfinite(valeur)].flat[0]}")
+    if (valeur < 0).any():
+        raise ValueError(f"Montant {cible} négatif : {valeur[valeur < 0].flat[0]}")
+    bas = np.concatenate([[0.0], parametres.plafonds])
+    haut = np.concatenate([parametres.plafonds, [np.inf]])
+    # Deux points d'évaluation par segment (le dernier segment est non borné)
+    x_haut = np.where(np.isinf(haut), 2 * parametres.aa_t2_max, haut)
+    x_milieu = (bas + x_haut) / 2
+
+    points = np.concatenate([x_milieu, x_haut]).reshape((-1,) + (1,) * valeur.ndim)
+    montants = calcul_brut_net_mensuel_batch(points, parametres=parametres, **options)[cible]
+    f_milieu, f_haut = montants[: len(bas)], montants[len(bas):]
+
+    forme = (-1,) + (1,) * (montants.ndim - 1)
+    pente = (f_haut - f_milieu) / (x_haut - x_milieu).reshape(forme)
+    ordonnee = f_haut - pente * x_haut.reshape(forme)
+
+    bas, haut = bas.reshape(forme), haut.reshape(forme)
+    candidats = (valeur - ordonnee) / pente
+    # Tolérance relative pour les cibles situées exactement sur un seuil
+    tolerance = 1e-9 * x_haut.reshape(forme)
+    valides = (candidats >= bas - tolerance) & (candidats <= haut + tolerance)
+    candidats = np.clip(candidats, bas, haut)
+    premier = np.argmax(valides, axis=0)
+    brut = np.take_along_axis(candidats, premier[None, ...], axis=0)[0]
+
+    # Cible non atteinte dans un segment : seuil où le montant saute au-dessus d'elle
+    sans_solution = ~valides.any(axis=0)
+    if sans_solution.any():
+        debut_segment = pente * bas + ordonnee
+        saut = np.argmax(debut_segment > valeur, axis=0)
+        seuils = np.take_along_axis(np.broadcast_to(bas, debut_segment.shape), saut[None, ...], axis=0)[0]
+        brut = np.where(sans_solution, seuils, brut)
+
+    return brut.item() if brut.ndim == 0 else brut
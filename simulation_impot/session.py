@@ -0,0 +1,169 @@
+"""Empreinte mémoire des sessions et modèle compact de la simulation enregistrée.
+
+Une session ne garde que des entrées et des résultats chiffrés : le détail
+d'une simulation (dictionnaires, libellés des tranches) est recalculé à la
+demande, en pratique servi par le cache des calculs. `taille_objet` mesure
+ce qu'une session retient réellement ; au-delà d'un budget, les données
+dérivées listées par l'appelant sont évincées, dans l'ordre donné.
+"""
+
+import sys
+import threading
+import time
+import types
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Callable, Mapping, MutableMapping, Sequence
+
+import numpy as np
+
+from .impot import calcul_impot
+
+BUDGET_SESSION_DEFAUT = 64 * 1024  # Octets retenus par session avant éviction des données dérivées
+DUREE_VIE_EMPREINTE_S = 3600.0  # Session oubliée sans exécution depuis ce délai
+
+
+def taille_objet(objet, _vus=None) -> int:
+    """Taille en octets de `objet` et de tout ce qu'il référence (chaque objet compté une fois)."""
+
+    vus = set() if _vus is None else _vus
+    if id(objet) in vus:
+        return 0
+    vus.add(id(objet))
+    taille = sys.getsizeof(objet)
+    if isinstance(objet, (str, bytes, bytearray, int, float, bool, type(None))):
+        return taille
+    if isinstance(objet, (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType)):
+        return taille  # Code partagé par le processus : ni ses attributs ni son module ne sont comptés
+    if isinstance(objet, np.ndarray):
+        # Une vue ne possède pas ses données : `getsizeof` ne les compte pas
+        return taille if objet.base is None else taille + taille_objet(objet.base, vus)
+    if isinstance(objet, Mapping):
+        return taille + sum(
+            taille_objet(cle, vus) + taille_objet(valeur, vus) for cle, valeur in objet.items()
+        )
+    if isinstance(objet, (list, tuple, set, frozenset)):
+        return taille + sum(taille_objet(element, vus) for element in objet)
+    if is_dataclass(objet):
+        return taille + sum(taille_objet(getattr(objet, champ.name), vus) for champ in fields(objet))
+    # Attributs déclarés par `__slots__` (ex. `LotSalaires`), puis ceux du `__dict__`
+    for classe in type(objet).__mro__:
+        emplacements = getattr(classe, "__slots__", ())
+        for nom in (emplacements,) if isinstance(emplacements, str) else emplacements:
+            if nom not in ("__dict__", "__weakref__") and hasattr(objet, nom):
+                taille += taille_objet(getattr(objet, nom), vus)
+    if hasattr(objet, "__dict__"):
+        return taille + taille_objet(vars(objet), vus)
+    return taille
+
+
+def empreinte(etat: Mapping) -> dict[str, int]:
+    """Taille de chaque entrée de `etat`, de la plus lourde à la plus légère."""
+
+    tailles = {cle: taille_objet(valeur) for cle, valeur in etat.items()}
+    return dict(sorted(tailles.items(), key=lambda item: item[1], reverse=True))
+
+
+def appliquer_budget(
+    etat: MutableMapping, budget: int, evictables: Sequence[str]
+) -> list[str]:
+    """Évince les entrées `evictables` (dans l'ordre) tant que `etat` dépasse `budget` octets.
+
+    Renvoie les clés évincées ; les autres entrées ne sont jamais touchées.
+    """
+
+    total = sum(empreinte(etat).values())
+    evincees = []
+    for cle in evictables:
+        if total <= budget:
+            break
+        if cle in etat:
+            total -= taille_objet(etat[cle])
+            del etat[cle]
+            evincees.append(cle)
+    return evincees
+
+
+@dataclass(frozen=True, slots=True)
+class SimulationEnregistree:
+    """Simulation d'impôt gardée en session : entrées du foyer et résultats chiffrés."""
+
+    revenu_salarial: float
+    chiffre_affaire_autoentrepreneur: float
+    nombre_parts: float
+    reduction_forfaitaire: bool
+    aide_familiale: float
+    frais_garde: float
+    est_couple: bool
+    impot_final: float
+    revenu_net_mensuel: float
+
+    @classmethod
+    def calculer(
+        cls,
+        revenu_salarial,
+        chiffre_affaire_autoentrepreneur,
+        nombre_parts,
+        reduction_forfaitaire=False,
+        aide_familiale=0.0,
+        frais_garde=0.0,
+        est_couple=False,
+        *,
+        calcul: Callable[..., dict] = calcul_impot,
+    ) -> "SimulationEnregistree":
+        """Calcule la simulation avec `calcul` (par défaut `calcul_impot`) et n'en garde que les chiffres."""
+
+        entrees = (
+            float(revenu_salarial),
+            float(chiffre_affaire_autoentrepreneur),
+            float(nombre_parts),
+            bool(reduction_forfaitaire),
+            float(aide_familiale),
+            float(frais_garde),
+            bool(est_couple),
+        )
+        resultat = calcul(*entrees)
+        return cls(*entrees, resultat["impot_final"], resultat["revenu_net_mensuel"])
+
+    def entrees(self) -> tuple:
+        """Arguments positionnels de `calcul_impot`."""
+
+        return (
+            self.revenu_salarial,
+            self.chiffre_affaire_autoentrepreneur,
+            self.nombre_parts,
+            self.reduction_forfaitaire,
+            self.aide_familiale,
+            self.frais_garde,
+            self.est_couple,
+        )
+
+    def detail(self, calcul: Callable[..., dict] = calcul_impot) -> dict:
+        """Résultat complet de `calcul_impot`, recalculé (ou servi par un cache) à la demande."""
+
+        return calcul(*self.entrees())
+
+
+class EmpreintesSessions:
+    """Dernière taille connue de chaque session active, partagée par le processus."""
+
+    def __init__(self, duree_vie_s: float = DUREE_VIE_EMPREINTE_S):
+        self.duree_vie_s = duree_vie_s
+        self._verrou = threading.Lock()
+        self._sessions = {}  # Identifiant -> (octets, instant de la dernière exécution)
+
+    def enregistrer(self, identifiant: str, octets: int) -> None:
+        instant = time.monotonic()
+        with self._verrou:
+            self._sessions[identifiant] = (octets, instant)
+            for cle, (_, vu) in list(self._sessions.items()):
+                if instant - vu > self.duree_vie_s:
+                    del self._sessions[cle]
+
+    def statistiques(self) -> dict:
+        with self._verrou:
+            tailles = [octets for octets, _ in self._sessions.values()]
+        return {
+            "sessions": len(tailles),
+            "octets_total": sum(tailles),
+            "octets_max": max(tailles, default=0),
+        }
@@ -0,0 +1,71 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from simulation_impot import calcul_brut_net_mensuel_batch
+from simulation_impot.agregation import AgregateurCotisations, agreger_cotisations
+
+
+def _attendu(cles: dict, valeurs: np.ndarray) -> pd.DataFrame:
+    return (
+        pd.DataFrame(cles | {"montant": valeurs})
+        .groupby(list(cles), sort=True)["montant"]
+        .agg(["size", "sum"])
+        .reset_index()
+    )
+
+
+def test_cles_int64_de_grande_cardinalite():
+    generateur = np.random.default_rng(3)
+    n = 100_000
+    # Peu de valeurs pour la première clé (groupes partagés), puis des identifiants hachés
+    cles = {"centre": generateur.integers(0, 3, n)} | {
+        f"id_{i}": generateur.integers(np.iinfo(np.int64).min, np.iinfo(np.int64).max, n)
+        for i in range(4)
+    }
+    # Deux lignes par combinaison d'identifiants, éventuellement dans deux centres
+    for i in range(4):
+        cles[f"id_{i}"][: n // 2] = cles[f"id_{i}"][n // 2 :]
+    valeurs = generateur.uniform(0.0, 100.0, n)
+
+    agregateur = AgregateurCotisations(list(cles), ("montant",))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        agregateur.ajouter(cles, {"montant": valeurs})
+    resultat = agregateur.resultat()
+
+    attendu = _attendu(cles, valeurs)
+    assert len(agregateur) == len(attendu)
+    for nom in cles:
+        np.testing.assert_array_equal(resultat[nom], attendu[nom])
+    np.testing.assert_array_equal(resultat["effectif"], attendu["size"])
+    np.testing.assert_allclose(resultat["montant"], attendu["sum"])
+
+
+def test_cinq_cles_de_dix_mille_valeurs():
+    generateur = np.random.default_rng(4)
+    n = 50_000
+    cles = {f"cle_{i}": generateur.integers(0, 10_000, n) for i in range(5)}
+    valeurs = np.ones(n)
+
+    agregateur = AgregateurCotisations(list(cles), ("montant",))
+    agregateur.ajouter(cles, {"montant": valeurs})
+
+    assert len(agregateur) == len(_attendu(cles, valeurs))
+    assert agregateur.resultat()["effectif"].sum() == n
+
+
+def test_agreger_cotisations_egal_a_la_somme_par_groupe():
+    generateur = np.random.default_rng(5)
+    brut = generateur.uniform(1_500.0, 12_000.0, 5_000)
+    centres = generateur.integers(0, 7, 5_000)
+    cadre = generateur.random(5_000) < 0.5
+
+    resultat = agreger_cotisations(brut, {"centre": centres}, cadre=cadre, taille_bloc=1_000)
+
+    net = calcul_brut_net_mensuel_batch(brut, cadre=cadre)["net_a_payer"]
+    attendu = _attendu({"centre": centres}, net)
+    np.testing.assert_array_equal(resultat["centre"], attendu["centre"])
+    np.testing.assert_array_equal(resultat["effectif"], attendu["size"])
+    np.testing.assert_allclose(resultat["net_a_payer"], attendu["sum"])
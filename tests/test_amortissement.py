@@ -0,0 +1,36 @@
+from dataclasses import astuple
+
+import numpy as np
+
+from simulation_impot.amortissement import CHAMPS_AMORTISSEMENT, echeancier, echeanciers_batch
+
+# (capital, taux annuel %, durée en années, taux d'assurance %)
+PRETS = [
+    (200_000.0, 3.5, 25, 0.30),
+    (15_000.0, 6.9, 5, 0.0),
+    (350_000.0, 1.2, 30, 0.36),
+    (80_000.0, 0.0, 10, 0.20),  # Prêt à taux zéro
+    (1_000.0, 12.0, 0.5, 0.0),
+]
+
+
+def test_batch_egal_au_generateur():
+    capitaux, taux, durees, assurances = map(np.array, zip(*PRETS))
+
+    batch = echeanciers_batch(capitaux, taux, durees, assurances)
+
+    for i, pret in enumerate(PRETS):
+        lignes = np.array([astuple(ligne) for ligne in echeancier(*pret)])
+        nb_mois = len(lignes)
+        assert batch["nb_mois"][i] == nb_mois
+        for j, champ in enumerate(CHAMPS_AMORTISSEMENT):
+            np.testing.assert_allclose(
+                batch[champ][i, :nb_mois], lignes[:, j], rtol=1e-9, atol=1e-6, err_msg=champ
+            )
+            # Au-delà de la durée du prêt, les matrices sont complétées par des zéros
+            assert not batch[champ][i, nb_mois:].any()
+
+        # La dernière échéance solde exactement le capital restant
+        assert lignes[-1, CHAMPS_AMORTISSEMENT.index("capital_restant")] == 0.0
+        assert batch["capital_restant"][i, nb_mois - 1] == 0.0
+        np.testing.assert_allclose(batch["principal"][i, :nb_mois].sum(), pret[0], rtol=1e-12)
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from simulation_impot import PARAMETRES_DEFAUT, SegmentsTaux, calcul_impot, courbes_taux
+
+BAREME = PARAMETRES_DEFAUT.bareme_impot
+
+
+@pytest.mark.parametrize(
+    "revenu, nombre_parts, aide",
+    [(9_000.0, 1.0, 0.0), (42_000.0, 1.0, 0.0), (95_000.0, 2.5, 1_500.0), (400_000.0, 3.0, 0.0)],
+)
+def test_segments_egaux_a_calcul_impot(revenu, nombre_parts, aide):
+    details = calcul_impot(revenu, 0.0, nombre_parts, aide_familiale=aide)["details"]
+    revenu_apres_aide = details["Revenu imposable annuel après aides"]
+    impot_brut = details["Impôt brut avant décote"]
+
+    point = SegmentsTaux(BAREME, nombre_parts, aide).evaluer(revenu_apres_aide / nombre_parts)
+
+    assert point["impot_total"] == pytest.approx(impot_brut)
+    assert point["taux_effectif"] == pytest.approx(impot_brut / revenu_apres_aide)
+    assert point["taux_nominal"] == pytest.approx(impot_brut / (revenu_apres_aide + aide))
+    assert point["taux_marginal"] == BAREME.taux_marginal(revenu_apres_aide / nombre_parts)
+
+
+def test_courbes_egales_a_calcul_impot_aux_points_traces():
+    nombre_parts = 2.0
+    courbes = courbes_taux(BAREME, 40_000.0, nombre_parts, points_par_segment=7)
+    quotients = courbes["quotients_annuels"]
+    # Les bornes de tranche, tracées deux fois, portent les deux taux marginaux
+    interieurs = ~np.isin(quotients, BAREME.bornes_basses)
+
+    for i, quotient in enumerate(quotients):
+        impot_brut = calcul_impot(quotient * nombre_parts, 0.0, nombre_parts)["details"][
+            "Impôt brut avant décote"
+        ]
+        assert courbes["taux_effectif"][i] == pytest.approx(impot_brut / (quotient * nombre_parts))
+        assert courbes["taux_nominal"][i] == pytest.approx(courbes["taux_effectif"][i])
+        if interieurs[i]:
+            assert courbes["taux_marginal"][i] == BAREME.taux_marginal(quotient)
+    assert courbes["quotients_mensuels"] == pytest.approx(quotients / 12)
@@ -0,0 +1,61 @@
+import pytest
+
+from simulation_impot.benchmarks import (
+    ECART_MEMOIRE_MIN,
+    ECART_TEMPS_MIN_S,
+    FORMAT_MESURES,
+    comparer,
+)
+
+
+def _document(mesures: dict) -> dict:
+    return {
+        "format": FORMAT_MESURES,
+        "mesures": {
+            cle: {"temps_s": temps, "memoire_pic_octets": memoire}
+            for cle, (temps, memoire) in mesures.items()
+        },
+    }
+
+
+def test_comparer_signale_les_regressions_et_ignore_le_bruit():
+    reference = _document(
+        {
+            "lent/1000": (1.0, 10_000_000),
+            "dans_la_tolerance/1000": (1.0, 10_000_000),
+            "rapide/1": (1e-6, 1_000),
+            "gourmand/1000": (0.5, 10_000_000),
+            "absent_des_mesures/1": (1.0, 1_000),
+        }
+    )
+    mesures = _document(
+        {
+            "lent/1000": (1.5, 10_000_000),
+            "dans_la_tolerance/1000": (1.2, 10_500_000),
+            # Bien au-delà de la tolérance relative, mais sous les écarts minimaux
+            "rapide/1": (1e-6 + ECART_TEMPS_MIN_S / 2, 1_000 + ECART_MEMOIRE_MIN // 2),
+            "gourmand/1000": (0.5, 12_000_000),
+            "nouveau/1": (9.0, 1_000),
+        }
+    )
+
+    regressions = comparer(mesures, reference)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("lent/1000 : temps_s 1.5 s")
+    assert "+50%" in regressions[0]
+    assert regressions[1].startswith("gourmand/1000 : memoire_pic_octets")
+    assert "+20%" in regressions[1]
+
+
+def test_comparer_tolerance_reglable():
+    reference = _document({"cas/1": (1.0, 1_000_000)})
+    mesures = _document({"cas/1": (1.2, 1_000_000)})
+
+    assert comparer(mesures, reference) == []
+    assert len(comparer(mesures, reference, tolerance_temps=0.1)) == 1
+
+
+def test_comparer_refuse_un_autre_format():
+    with pytest.raises(ValueError):
+        comparer(_document({}), {"format": FORMAT_MESURES + 1, "mesures": {}})
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from simulation_impot import calcul_impot, calcul_lot_salaires
+from simulation_impot.cache import CacheLRU, cle_canonique, memoiser
+
+
+def test_lot_plus_gros_que_la_borne_est_refuse():
+    cache = CacheLRU(16, octets_max=1024 * 1024)
+    lot = calcul_lot_salaires(np.full(10_000, 3000.0))  # 2,8 Mo
+
+    cache.stocker("lot", lot)
+
+    assert cache.obtenir("lot") is None
+    assert cache.statistiques()["octets"] == 0
+
+
+def test_borne_en_octets_evince_les_moins_recents():
+    cache = CacheLRU(16, octets_max=3 * 1024 * 1024)
+    for i in range(3):
+        cache.stocker(i, calcul_lot_salaires(np.full(4_000, 3000.0 + i)))  # 1,1 Mo chacun
+
+    statistiques = cache.statistiques()
+    assert cache.obtenir(0) is None
+    assert cache.obtenir(2) is not None
+    assert statistiques["evictions"] == 1
+    assert 2 * 1_120_000 <= statistiques["octets"] <= 3 * 1024 * 1024
+
+
+def test_expiration(monkeypatch):
+    instant = [1000.0]
+    monkeypatch.setattr("simulation_impot.cache.time.monotonic", lambda: instant[0])
+    cache = CacheLRU(16, duree_vie_s=60)
+    cache.stocker("a", 1)
+
+    instant[0] += 61
+
+    assert cache.obtenir("a") is None
+    assert cache.statistiques()["expirations"] == 1
+
+
+def test_cles_canoniques_partagees():
+    calcul = memoiser(calcul_impot)
+
+    calcul(6000, 0, 1)
+    calcul(np.float64(6000.0), 0.0, 1.0, False)
+
+    assert calcul.statistiques()["succes"] == 1
+    assert cle_canonique((1, [np.int64(2), True])) == (1.0, (2.0, True))
+
+
+def test_borne_invalide():
+    with pytest.raises(ValueError):
+        CacheLRU(16, octets_max=0)
@@ -0,0 +1,81 @@
+import pandas as pd
+import pytest
+
+from simulation_impot import calcul_brut_net_mensuel
+from simulation_impot.cli import main
+
+ENTREE = """identifiant,brut_mensuel,cadre,nombre_parts,est_couple
+a,3000,oui,1,non
+b,abc,oui,1,non
+c,4000,peut-être,1,non
+d,5000,non,0,non
+e,-10,non,1,non
+f,,non,1,non
+g,6000,1,2,true
+"""
+
+
+def test_fichier_de_rejets(tmp_path, capsys):
+    entree = tmp_path / "paie.csv"
+    entree.write_text(ENTREE, encoding="utf-8")
+    sortie = tmp_path / "resultats.csv"
+    rejets = tmp_path / "rejets.csv"
+
+    assert main([str(entree), str(sortie), "--rejets", str(rejets), "--taille-bloc", "3"]) == 0
+
+    resultats = pd.read_csv(sortie)
+    lignes_rejetees = pd.read_csv(rejets, dtype=str, keep_default_na=False)
+    assert list(resultats["identifiant"]) == ["a", "g"]
+    assert dict(zip(lignes_rejetees["identifiant"], lignes_rejetees["motif_rejet"])) == {
+        "b": "brut_mensuel invalide",
+        "c": "cadre invalide",
+        "d": "nombre_parts invalide",
+        "e": "brut_mensuel invalide",
+        "f": "brut_mensuel invalide",
+    }
+    # Les lignes rejetées sont recopiées telles quelles
+    assert list(lignes_rejetees.loc[lignes_rejetees["identifiant"] == "c", "cadre"]) == ["peut-être"]
+    assert resultats.loc[0, "net_a_payer"] == calcul_brut_net_mensuel(3000.0).net_a_payer
+    assert "2 lignes calculées, 5 rejetées" in capsys.readouterr().err
+
+
+def test_rejets_sans_fichier(tmp_path):
+    entree = tmp_path / "foyers.csv"
+    entree.write_text("revenu_salarial,nombre_parts\n42000,1\nxyz,1\n", encoding="utf-8")
+    sortie = tmp_path / "resultats.parquet"
+
+    assert main([str(entree), str(sortie)]) == 0
+
+    assert len(pd.read_parquet(sortie)) == 1
+
+
+def test_agregation_normalise_les_options(tmp_path):
+    entree = tmp_path / "paie.csv"
+    entree.write_text(
+        "centre,brut_mensuel,cadre\n"
+        "A,3000,1\nA,3000,true\nA,3000,Oui\nA,3000,0\nA,3000,non\nB,3000,\n",
+        encoding="utf-8",
+    )
+    sortie = tmp_path / "agregats.csv"
+
+    assert main([str(entree), str(sortie), "--agreger", "centre,cadre"]) == 0
+
+    agregats = pd.read_csv(sortie).sort_values(["centre", "cadre"])
+    assert list(zip(agregats["centre"], agregats["cadre"], agregats["effectif"])) == [
+        ("A", False, 2),
+        ("A", True, 3),
+        ("B", True, 1),
+    ]
+
+
+@pytest.mark.parametrize("extension", ["csv", "parquet"])
+def test_sortie_creee_si_toutes_les_lignes_sont_rejetees(tmp_path, extension):
+    entree = tmp_path / "paie.csv"
+    entree.write_text("identifiant,brut_mensuel\na,abc\nb,-5\nc,\n", encoding="utf-8")
+    sortie = tmp_path / f"resultats.{extension}"
+
+    assert main([str(entree), str(sortie), "--taille-bloc", "2"]) == 0
+
+    resultats = pd.read_csv(sortie) if extension == "csv" else pd.read_parquet(sortie)
+    assert len(resultats) == 0
+    assert {"identifiant", "net_a_payer", "impot_final"} <= set(resultats.columns)
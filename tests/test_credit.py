@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from simulation_impot import capacite_emprunt, grille_capacite_emprunt
+
+TAUX = [0.0, 0.1, 1.35, 3.5, 10.0]
+DUREES = [5, 15, 20, 25, 30]
+
+
+@pytest.mark.parametrize(
+    "revenu, mensualite_existante, taux_endettement_max",
+    [(4_023.0, 0.0, 0.35), (6_500.0, 450.0, 0.33), (1_000.0, 500.0, 0.35)],
+)
+def test_cellules_egales_a_capacite_emprunt(revenu, mensualite_existante, taux_endettement_max):
+    grille = grille_capacite_emprunt(
+        revenu, TAUX, DUREES, mensualite_existante, taux_endettement_max
+    )
+
+    assert grille["capital_max"].shape == (len(TAUX), len(DUREES))
+    for i, taux in enumerate(TAUX):
+        for j, duree in enumerate(DUREES):
+            capacite_mensuelle, capital_max = capacite_emprunt(
+                revenu, taux, duree, mensualite_existante, taux_endettement_max
+            )
+            assert grille["capacite_mensuelle"] == capacite_mensuelle
+            assert grille["capital_max"][i, j] == pytest.approx(capital_max, rel=1e-12)
+
+
+def test_grille_par_defaut():
+    grille = grille_capacite_emprunt(4_023.0)
+
+    np.testing.assert_array_equal(grille["taux_emprunt"][[0, -1]], [0.1, 10.0])
+    np.testing.assert_array_equal(grille["durees_annees"][[0, -1]], [5, 30])
+    # Le capital croît avec la durée et décroît avec le taux
+    assert (np.diff(grille["capital_max"], axis=1) > 0).all()
+    assert (np.diff(grille["capital_max"], axis=0) < 0).all()
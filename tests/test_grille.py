@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from simulation_impot import calcul_brut_net_mensuel, calcul_impot
+from simulation_impot.grille import grille_net_apres_impot
+
+BRUTS = [1_800.0, 3_864.0, 6_000.0, 15_500.0, 32_000.0]
+PARTS = [1.0, 1.5, 2.0, 3.5]
+OPTIONS = {"cadre": False, "alsace_moselle": True}
+FOYER = {"aide_familiale": 800.0, "frais_garde": 1_200.0}
+
+
+def _scalaire(brut: float, parts: float, est_couple: bool) -> tuple[float, float, float]:
+    """Net à payer, impôt et net après impôt mensuel par les fonctions scalaires."""
+
+    salaire = calcul_brut_net_mensuel(brut, **OPTIONS)
+    impot = calcul_impot(salaire.net_imposable * 12, 0.0, parts, est_couple=est_couple, **FOYER)
+    impot_final = impot["impot_final"]
+    return salaire.net_a_payer, impot_final, salaire.net_a_payer - impot_final / 12
+
+
+@pytest.mark.parametrize("est_couple", [False, True])
+def test_cellules_egales_au_calcul_scalaire(est_couple):
+    grille = grille_net_apres_impot(BRUTS, PARTS, est_couple, **FOYER, **OPTIONS)
+
+    for i, brut in enumerate(BRUTS):
+        for j, parts in enumerate(PARTS):
+            net_a_payer, impot_final, net_apres_impot = _scalaire(brut, parts, est_couple)
+            assert grille["net_a_payer"][i] == net_a_payer
+            assert grille["impot_final"][i, j] == pytest.approx(impot_final)
+            assert grille["net_apres_impot_mensuel"][i, j] == pytest.approx(net_apres_impot)
+            # Taux marginal combiné : différence finie sur un euro de brut
+            gain = _scalaire(brut + 1.0, parts, est_couple)[2] - net_apres_impot
+            assert grille["taux_marginal_combine"][i, j] == pytest.approx(1 - gain)
+
+
+def test_axe_couple():
+    grille = grille_net_apres_impot(BRUTS, PARTS, [False, True])
+
+    assert grille["impot_final"].shape == (len(BRUTS), len(PARTS), 2)
+    for indice, est_couple in enumerate((False, True)):
+        np.testing.assert_array_equal(
+            grille["impot_final"][..., indice],
+            grille_net_apres_impot(BRUTS, PARTS, est_couple)["impot_final"],
+        )
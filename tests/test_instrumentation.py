@@ -0,0 +1,85 @@
+import re
+
+import pytest
+
+from simulation_impot.instrumentation import NOM_METRIQUE, RegistreLatences
+
+LIGNE = re.compile(rf'^{NOM_METRIQUE}_(bucket|sum|count)\{{page="(.*?)",etape="(.*?)"(?:,le="(.*?)")?\}} (\S+)$')
+
+
+def _series(texte: str) -> dict:
+    """(page, étape) -> {"bucket": [(le, cumul), ...], "sum": ..., "count": ...}."""
+
+    series = {}
+    for ligne in texte.splitlines():
+        if ligne.startswith("#"):
+            continue
+        type_, page, etape, le, valeur = LIGNE.match(ligne).groups()
+        serie = series.setdefault((page, etape), {"bucket": []})
+        if type_ == "bucket":
+            serie["bucket"].append((le, int(valeur)))
+        else:
+            serie[type_] = float(valeur)
+    return series
+
+
+def test_intervalles_cumules_et_compte():
+    registre = RegistreLatences(bornes=(0.01, 0.1, 1.0), actif=True)
+    durees = {
+        ("simulation", "calcul"): [0.002, 0.01, 0.05, 0.05, 0.7, 3.0],
+        ("simulation", "total"): [0.2],
+        ("credit", "graphique"): [0.1, 1.0, 1.5],
+    }
+    for (page, etape), valeurs in durees.items():
+        for duree in valeurs:
+            registre.enregistrer(page, etape, duree)
+
+    series = _series(registre.texte_prometheus())
+
+    assert series.keys() == durees.keys()
+    for cle, valeurs in durees.items():
+        serie = series[cle]
+        assert [le for le, _ in serie["bucket"]] == ["0.01", "0.1", "1.0", "+Inf"]
+        cumuls = [cumul for _, cumul in serie["bucket"]]
+        # Chaque intervalle compte les durées inférieures ou égales à sa borne
+        attendus = [sum(duree <= borne for duree in valeurs) for borne in registre.bornes]
+        assert cumuls == attendus + [len(valeurs)]
+        assert cumuls == sorted(cumuls)
+        assert serie["count"] == len(valeurs) == cumuls[-1]
+        assert serie["sum"] == pytest.approx(sum(valeurs))
+
+
+def test_page_chronometree_enregistre_chaque_etape_une_fois():
+    registre = RegistreLatences(actif=True)
+    for _ in range(3):
+        with registre.page("simulation"):
+            registre.etape("saisie")
+            registre.etape("calcul")
+            registre.etape("calcul")  # Cumulée avec la marque précédente
+
+    series = _series(registre.texte_prometheus())
+
+    assert set(series) == {("simulation", etape) for etape in ("saisie", "calcul", "total")}
+    for serie in series.values():
+        assert serie["count"] == serie["bucket"][-1][1] == 3
+
+
+def test_registre_inactif_n_enregistre_rien():
+    registre = RegistreLatences()
+    with registre.page("simulation"):
+        registre.etape("calcul")
+
+    assert not _series(registre.texte_prometheus())
+
+
+def test_etiquettes_echappees_et_fichier(tmp_path):
+    registre = RegistreLatences(actif=True)
+    registre.enregistrer('page "spéciale"', "étape\\1", 0.003)
+    chemin = tmp_path / "metriques.prom"
+
+    registre.ecrire(chemin)
+
+    texte = chemin.read_text(encoding="utf-8")
+    assert texte == registre.texte_prometheus()
+    assert 'page="page \\"spéciale\\"",etape="étape\\\\1"' in texte
+    assert list(tmp_path.iterdir()) == [chemin]
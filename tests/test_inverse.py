@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from simulation_impot import (
+    CIBLES_INVERSE,
+    PARAMETRES_DEFAUT,
+    calcul_brut_net_mensuel,
+    calcul_brut_net_mensuel_batch,
+    calcul_brut_pour_cible,
+)
+
+PMSS = float(PARAMETRES_DEFAUT.plafonds[0])
+
+
+@pytest.mark.parametrize("cible", CIBLES_INVERSE)
+@pytest.mark.parametrize("options", [{}, {"cadre": False, "alsace_moselle": True}])
+def test_aller_retour(cible, options):
+    brut = np.random.default_rng(7).uniform(0.0, 40_000.0, 2000)
+    montants = calcul_brut_net_mensuel_batch(brut, **options)[cible]
+
+    retrouves = calcul_brut_pour_cible(cible, montants, **options)
+
+    np.testing.assert_allclose(
+        calcul_brut_net_mensuel_batch(retrouves, **options)[cible], montants, rtol=0, atol=1e-6
+    )
+    # Le brut est unique hors du chevauchement créé par la CET juste au-dessus du PMSS
+    hors_chevauchement = (brut < PMSS) | (brut > PMSS + 10.0)
+    np.testing.assert_allclose(retrouves[hors_chevauchement], brut[hors_chevauchement], atol=1e-6)
+
+
+@pytest.mark.parametrize("cible", CIBLES_INVERSE)
+def test_aller_retour_scalaire(cible):
+    montant = getattr(calcul_brut_net_mensuel(6000.0), cible)
+
+    assert calcul_brut_pour_cible(cible, montant) == pytest.approx(6000.0, abs=1e-6)
+
+
+def test_saut_cet_au_pmss():
+    avant = calcul_brut_net_mensuel(PMSS)
+    apres = calcul_brut_net_mensuel(np.nextafter(PMSS, np.inf))
+    assert apres.cout_total_employeur > avant.cout_total_employeur + 5
+    assert apres.net_a_payer < avant.net_a_payer - 5
+
+    # Coût inatteignable (dans le saut) : le seuil est renvoyé
+    milieu = (avant.cout_total_employeur + apres.cout_total_employeur) / 2
+    assert calcul_brut_pour_cible("cout_total_employeur", milieu) == PMSS
+    # Net atteint de part et d'autre du PMSS : le plus petit brut est renvoyé
+    brut = calcul_brut_pour_cible("net_a_payer", apres.net_a_payer)
+    assert brut < PMSS
+    assert calcul_brut_net_mensuel(brut).net_a_payer == pytest.approx(apres.net_a_payer, abs=1e-6)
+
+
+@pytest.mark.parametrize("valeur", [np.nan, np.inf, -1.0, [3000.0, np.nan]])
+def test_cible_invalide(valeur):
+    with pytest.raises(ValueError):
+        calcul_brut_pour_cible("net_a_payer", valeur)
+
+
+def test_cible_inconnue():
+    with pytest.raises(ValueError):
+        calcul_brut_pour_cible("brut", 3000.0)
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from simulation_impot import calcul_impot_batch
+from simulation_impot.monte_carlo import (
+    MOIS_PAR_AN,
+    centiles_scenarios,
+    simuler_scenarios,
+    tirer_chiffres_affaires,
+)
+
+HISTORIQUE = [1_200.0, 0.0, 3_400.0, 2_500.0, 900.0, 4_100.0, 2_000.0]
+
+
+def _centiles(graine: int, **tirage) -> dict[str, np.ndarray]:
+    chiffres_affaires = tirer_chiffres_affaires(20_000, graine=graine, **tirage)
+    return centiles_scenarios(simuler_scenarios(30_000.0, chiffres_affaires, 2.0, True))
+
+
+@pytest.mark.parametrize(
+    "tirage",
+    [{"moyenne": 30_000.0, "ecart_type": 9_000.0}, {"historique_mensuel": HISTORIQUE}],
+)
+def test_centiles_reproductibles_avec_la_graine(tirage):
+    premier = _centiles(2025, **tirage)
+    second = _centiles(2025, **tirage)
+    autre = _centiles(2026, **tirage)
+
+    assert premier.keys() == second.keys()
+    for cle in premier:
+        np.testing.assert_array_equal(premier[cle], second[cle])
+    assert not np.array_equal(premier["impot_final"], autre["impot_final"])
+    # Les centiles sont croissants et encadrent la moyenne
+    assert (np.diff(premier["impot_final"]) >= 0).all()
+    assert premier["impot_final"][0] <= premier["moyenne_impot_final"] <= premier["impot_final"][-1]
+
+
+def test_tirage_lognormal_respecte_moyenne_et_ecart_type():
+    chiffres_affaires = tirer_chiffres_affaires(400_000, moyenne=30_000.0, ecart_type=9_000.0, graine=1)
+
+    assert (chiffres_affaires > 0).all()
+    assert chiffres_affaires.mean() == pytest.approx(30_000.0, rel=0.01)
+    assert chiffres_affaires.std() == pytest.approx(9_000.0, rel=0.02)
+
+
+def test_tirage_historique_somme_douze_mois_avec_remise():
+    chiffres_affaires = tirer_chiffres_affaires(200_000, historique_mensuel=HISTORIQUE, graine=3)
+
+    assert chiffres_affaires.min() >= 0.0
+    assert chiffres_affaires.max() <= MOIS_PAR_AN * max(HISTORIQUE)
+    assert chiffres_affaires.mean() == pytest.approx(MOIS_PAR_AN * np.mean(HISTORIQUE), rel=0.01)
+    # Mois indépendants : la variance annuelle vaut douze fois la variance mensuelle
+    assert chiffres_affaires.var() == pytest.approx(MOIS_PAR_AN * np.var(HISTORIQUE), rel=0.02)
+
+
+def test_scenarios_egaux_au_calcul_batch():
+    chiffres_affaires = tirer_chiffres_affaires(50, moyenne=20_000.0, ecart_type=5_000.0, graine=7)
+
+    resultat = simuler_scenarios(42_000.0, chiffres_affaires, 1.5, aide_familiale=600.0)
+    attendu = calcul_impot_batch(42_000.0, chiffres_affaires, 1.5, aide_familiale=600.0)
+
+    np.testing.assert_array_equal(resultat["chiffre_affaire_autoentrepreneur"], chiffres_affaires)
+    for cle, colonne in attendu.items():
+        np.testing.assert_array_equal(resultat[cle], colonne, err_msg=cle)
+
+
+@pytest.mark.parametrize(
+    "tirage",
+    [{}, {"moyenne": -1.0}, {"historique_mensuel": []}, {"historique_mensuel": [100.0, -5.0]}],
+)
+def test_tirage_invalide(tirage):
+    with pytest.raises(ValueError):
+        tirer_chiffres_affaires(10, **tirage)
@@ -0,0 +1,40 @@
+import dataclasses
+import os
+
+import numpy as np
+import pytest
+
+from simulation_impot import PARAMETRES_DEFAUT, calcul_brut_net_mensuel_batch, calcul_impot_batch
+from simulation_impot.parallele import ExecuteurParallele
+
+
+@pytest.mark.parametrize("mode", ["processus", "threads"])
+def test_executeur_egal_au_calcul_direct(mode):
+    generateur = np.random.default_rng(11)
+    brut = generateur.uniform(0.0, 20_000.0, 10_000)
+    cadre = generateur.random(10_000) < 0.5
+
+    with ExecuteurParallele(2, mode=mode, taille_bloc=1_500) as executeur:
+        salaire = executeur.brut_net(brut, cadre=cadre)
+        impot = executeur.impot(salaire["net_imposable"] * 12, 0.0, 2.0, est_couple=True)
+
+    attendu_salaire = calcul_brut_net_mensuel_batch(brut, cadre=cadre)
+    attendu_impot = calcul_impot_batch(attendu_salaire["net_imposable"] * 12, 0.0, 2.0, est_couple=True)
+    for attendu, obtenu in ((attendu_salaire, salaire), (attendu_impot, impot)):
+        assert attendu.keys() == obtenu.keys()
+        for nom in attendu:
+            np.testing.assert_array_equal(obtenu[nom], attendu[nom])
+
+
+def test_colonnes_independantes_et_segments_liberes_sur_echec():
+    segments_avant = set(os.listdir("/dev/shm"))
+    brut = np.linspace(0.0, 20_000.0, 10_000)
+
+    with ExecuteurParallele(2, taille_bloc=1_500) as executeur:
+        salaire = executeur.brut_net(brut)
+        with pytest.raises(TypeError):
+            executeur.brut_net(brut, parametres=dataclasses.replace(PARAMETRES_DEFAUT, plafonds=None))
+
+    for col in salaire.values():
+        assert col.base is None or col.base.flags.owndata
+    assert set(os.listdir("/dev/shm")) <= segments_avant
@@ -0,0 +1,30 @@
+import zipfile
+
+import pandas as pd
+
+from simulation_impot.rapports import generer_rapports, lots_foyers
+
+
+def test_noms_de_rapports_uniques(tmp_path):
+    foyers = pd.DataFrame(
+        {
+            "identifiant": ["a/b", "a b", "a_b", "x", "x", "a_b_2"],
+            "revenu_salarial": ["42000"] * 6,
+        }
+    )
+    chemin = tmp_path / "rapports.zip"
+
+    stats = generer_rapports(lots_foyers([foyers], taille_lot=2), chemin)
+
+    with zipfile.ZipFile(chemin) as archive:
+        noms = archive.namelist()
+    assert noms == [
+        "rapport_a_b.html",
+        "rapport_a_b_2.html",
+        "rapport_a_b_3.html",
+        "rapport_x.html",
+        "rapport_x_2.html",
+        "rapport_a_b_2_2.html",
+    ]
+    assert stats["rapports"] == 6
+    assert stats["renommes"] == 4
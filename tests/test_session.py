@@ -0,0 +1,34 @@
+import numpy as np
+
+from simulation_impot import calcul_lot_salaires
+from simulation_impot.session import SimulationEnregistree, appliquer_budget, empreinte, taille_objet
+
+
+def test_taille_lot_salaires_compte_sa_matrice():
+    lot = calcul_lot_salaires(np.linspace(1500.0, 9000.0, 100_000))
+
+    assert lot.nbytes <= taille_objet(lot) < lot.nbytes + 1024
+    # Un sous-lot est une vue : il retient toute la matrice d'origine
+    assert taille_objet(lot[10:20]) >= lot.nbytes
+
+
+def test_appliquer_budget_evince_un_lot_volumineux():
+    etat = {
+        "simulation": SimulationEnregistree.calculer(42000, 0, 1),
+        "lot": calcul_lot_salaires(np.full(10_000, 3000.0)),
+    }
+
+    evincees = appliquer_budget(etat, 64 * 1024, ("lot",))
+
+    assert evincees == ["lot"]
+    assert list(etat) == ["simulation"]
+    assert sum(empreinte(etat).values()) <= 64 * 1024
+
+
+def test_simulation_enregistree_recalcule_le_detail():
+    simulation = SimulationEnregistree.calculer(42000, 5000, 2, True, 300, 1200, True)
+
+    detail = simulation.detail()
+
+    assert detail["impot_final"] == simulation.impot_final
+    assert detail["revenu_net_mensuel"] == simulation.revenu_net_mensuel